@@ -1,4 +1,13 @@
-from llm_engineering import application, domain, infrastructure
+import importlib
+
 from llm_engineering.settings import settings
 
 __all__ = ["settings", "application", "domain", "infrastructure"]
+
+
+def __getattr__(name: str):
+    # Sub-packages are imported on first access to keep `import llm_engineering` cheap.
+    if name in ("application", "domain", "infrastructure"):
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,24 @@
 import time
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from tempfile import mkdtemp
 
-import chromedriver_autoinstaller
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
 from llm_engineering.domain.documents import NoSQLBaseDocument
 
-# Check if the current version of chromedriver exists
-# and if it doesn't exist, download it automatically,
-# then add chromedriver to path
-chromedriver_autoinstaller.install()
+
+@lru_cache(maxsize=1)
+def install_chromedriver() -> None:
+    """
+    Checks if the current version of chromedriver exists and if it doesn't exist, downloads it automatically,
+    then adds chromedriver to path. It runs once per process, when the first Selenium crawler is created.
+    """
+
+    import chromedriver_autoinstaller
+
+    chromedriver_autoinstaller.install()
 
 
 class BaseCrawler(ABC):
@@ -23,6 +30,8 @@ class BaseCrawler(ABC):
 
 class BaseSeleniumCrawler(BaseCrawler, ABC):
     def __init__(self, scroll_limit: int = 5) -> None:
+        install_chromedriver()
+
         options = webdriver.ChromeOptions()
 
         options.add_argument("--no-sandbox")
@@ -1,3 +1,5 @@
+from .embedding_cache import EmbeddingCache
+from .embedding_workers import EmbeddingWorkerPool
 from .embeddings import CrossEncoderModelSingleton, EmbeddingModelSingleton
 
-__all__ = ["EmbeddingModelSingleton", "CrossEncoderModelSingleton"]
+__all__ = ["EmbeddingCache", "EmbeddingWorkerPool", "EmbeddingModelSingleton", "CrossEncoderModelSingleton"]
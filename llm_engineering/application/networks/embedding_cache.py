@@ -0,0 +1,182 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application import utils
+from llm_engineering.settings import settings
+
+from .base import SingletonMeta
+
+# The fraction of `max_entries` evicted at once, so the cache is counted and trimmed once per this many inserts.
+EVICTION_FRACTION = 0.1
+
+
+class EmbeddingCache(metaclass=SingletonMeta):
+    """
+    A persistent, content-addressed cache of embeddings backed by SQLite.
+
+    Entries are keyed by (model_id, md5(content)), the same content hash used to derive the chunk ids, where the
+    model_id also identifies the backend that ran the model (see `EmbeddingModelSingleton.cache_key`),
+    so re-running the feature pipeline over unchanged documents never hits the embedding model.
+    The least recently used entries are evicted once the cache grows past `max_entries`, down to
+    `(1 - EVICTION_FRACTION) * max_entries` entries.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        path = path if path is not None else settings.EMBEDDING_CACHE_PATH
+        max_entries = max_entries if max_entries is not None else settings.EMBEDDING_CACHE_MAX_ENTRIES
+
+        self._path = Path(path)
+        self._max_entries = max_entries
+
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model_id, content_hash)
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)")
+        self._connection.commit()
+
+        # A running upper bound of the number of entries (the replaced entries are counted again), so the table
+        # is only counted when it may have outgrown `max_entries`.
+        (self._num_entries,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self._hits + self._misses
+
+        return self._hits / total if total > 0 else 0.0
+
+    def __len__(self) -> int:
+        with self._lock:
+            (size,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+        return size
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.md5(content.encode()).hexdigest()
+
+    def get_many(self, model_id: str, contents: list[str]) -> dict[str, NDArray[np.float32]]:
+        """
+        Looks up the embeddings of the given contents.
+
+        Args:
+            model_id (str): The identifier of the model and backend that generated the embeddings.
+            contents (list[str]): The texts to look up.
+
+        Returns:
+            dict[str, NDArray[np.float32]]: The cached embeddings, keyed by content. Misses are omitted.
+        """
+
+        hashes = {self.hash_content(content): content for content in contents}
+
+        found = {}
+        with self._lock:
+            for hashes_batch in utils.misc.batch(list(hashes), size=500):
+                placeholders = ", ".join("?" for _ in hashes_batch)
+                rows = self._connection.execute(
+                    "SELECT content_hash, embedding FROM embeddings "
+                    f"WHERE model_id = ? AND content_hash IN ({placeholders})",
+                    (model_id, *hashes_batch),
+                ).fetchall()
+                for content_hash, embedding in rows:
+                    found[hashes[content_hash]] = np.frombuffer(embedding, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE model_id = ? AND content_hash = ?",
+                    [(now, model_id, self.hash_content(content)) for content in found],
+                )
+                self._connection.commit()
+
+            self._hits += len(found)
+            self._misses += len(hashes) - len(found)
+
+        return found
+
+    def set_many(self, model_id: str, embeddings: dict[str, NDArray[np.float32] | list[float]]) -> None:
+        """
+        Stores the embeddings of the given contents and evicts the least recently used entries if needed.
+
+        Args:
+            model_id (str): The identifier of the model and backend that generated the embeddings.
+            embeddings (dict[str, NDArray[np.float32] | list[float]]): The embeddings to store, keyed by content.
+        """
+
+        if not embeddings:
+            return
+
+        now = time.time()
+        rows = [
+            (model_id, self.hash_content(content), np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for content, embedding in embeddings.items()
+        ]
+
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._num_entries += len(rows)
+            if self._num_entries > self._max_entries:
+                self._evict()
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+
+            self._num_entries = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _evict(self) -> None:
+        (size,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        self._num_entries = size
+        if size <= self._max_entries:
+            return
+
+        num_evicted = size - int(self._max_entries * (1 - EVICTION_FRACTION))
+
+        self._connection.execute(
+            """
+            DELETE FROM embeddings WHERE rowid IN (
+                SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (num_evicted,),
+        )
+        self._num_entries -= num_evicted
+
+        logger.info(f"Evicted {num_evicted} entries from the embedding cache.", path=str(self._path))
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.settings import settings
+
+from .base import SingletonMeta
+from .embeddings import EmbeddingModelSingleton
+
+_worker_model: EmbeddingModelSingleton | None = None
+
+
+def _init_worker(model_id: str, num_threads: int) -> None:
+    global _worker_model
+
+    import torch
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+
+    _worker_model = EmbeddingModelSingleton(model_id=model_id, device="cpu")
+
+
+def _encode_shard(texts: list[str]) -> NDArray[np.float32]:
+    assert _worker_model is not None, "The embedding worker was not initialized."
+
+    return _worker_model(texts, to_list=False, batch_size=len(texts))
+
+
+class EmbeddingWorkerPool(metaclass=SingletonMeta):
+    """
+    A pool of processes, each holding its own copy of the embedding model pinned to a fixed number of threads.
+
+    Small models such as MiniLM stop scaling after a few intra-op threads, so on many-core CPU hosts
+    running several single-digit-thread copies side by side keeps all the cores busy.
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        threads_per_worker: int | None = None,
+        model_id: str | None = None,
+    ) -> None:
+        num_workers = num_workers if num_workers is not None else settings.EMBEDDING_NUM_WORKERS
+        threads_per_worker = (
+            threads_per_worker if threads_per_worker is not None else settings.EMBEDDING_THREADS_PER_WORKER
+        )
+        model_id = model_id if model_id is not None else settings.TEXT_EMBEDDING_MODEL_ID
+        assert num_workers > 0, f"'num_workers' should be greater than 0. Got {num_workers}."
+
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+        self._num_workers = num_workers
+        self._max_in_flight = 2 * num_workers
+
+        # PyTorch is not fork-safe once its thread pools are initialized, hence the "spawn" start method.
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_id, threads_per_worker),
+        )
+
+        logger.info(
+            "Embedding worker pool started.",
+            num_workers=num_workers,
+            threads_per_worker=threads_per_worker,
+            model_id=model_id,
+        )
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    def map(self, shards: Iterable[list[str]]) -> Iterator[NDArray[np.float32]]:
+        """
+        Streams the shards to the workers, keeping a bounded number of them in flight, and yields
+        their embeddings in the same order as the input shards.
+
+        Args:
+            shards (Iterable[list[str]]): The batches of texts to embed.
+
+        Yields:
+            NDArray[np.float32]: The embeddings of every shard, one row per text.
+        """
+
+        pending: deque[Future] = deque()
+        for shard in shards:
+            pending.append(self._executor.submit(_encode_shard, shard))
+
+            if len(pending) >= self._max_in_flight:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        SingletonMeta._instances.pop(self.__class__, None)
@@ -1,17 +1,22 @@
 from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 from loguru import logger
 from numpy.typing import NDArray
-from sentence_transformers.SentenceTransformer import SentenceTransformer
-from sentence_transformers.cross_encoder import CrossEncoder
-from transformers import AutoTokenizer
 
 from llm_engineering.settings import settings
 
 from .base import SingletonMeta
+from .onnx import OnnxCrossEncoder, OnnxSentenceEncoder
+
+if TYPE_CHECKING:
+    from sentence_transformers.SentenceTransformer import SentenceTransformer
+    from sentence_transformers.cross_encoder import CrossEncoder
+    from transformers import AutoTokenizer
+
+RAG_MODEL_BACKENDS = ("torch", "onnx")
 
 
 class EmbeddingModelSingleton(metaclass=SingletonMeta):
@@ -21,19 +26,26 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
     def __init__(
         self,
-        model_id: str = settings.TEXT_EMBEDDING_MODEL_ID,
-        device: str = settings.RAG_MODEL_DEVICE,
+        model_id: str | None = None,
+        device: str | None = None,
         cache_dir: Optional[Path] = None,
+        backend: str | None = None,
     ) -> None:
+        model_id = model_id if model_id is not None else settings.TEXT_EMBEDDING_MODEL_ID
+        device = device if device is not None else settings.RAG_MODEL_DEVICE
+        backend = backend if backend is not None else settings.RAG_MODEL_BACKEND
+        assert backend in RAG_MODEL_BACKENDS, f"'backend' should be one of {RAG_MODEL_BACKENDS}. Got {backend}."
+
         self._model_id = model_id
         self._device = device
+        self._cache_dir = cache_dir
+        self._backend = backend
 
-        self._model = SentenceTransformer(
-            self._model_id,
-            device=self._device,
-            cache_folder=str(cache_dir) if cache_dir else None,
+        # With the ONNX backend, the PyTorch model is only loaded by the parity checks.
+        self._model = self._load_torch_model() if backend == "torch" else None
+        self._onnx_model = (
+            OnnxSentenceEncoder.from_pretrained(self._model_id, cache_dir=cache_dir) if backend == "onnx" else None
         )
-        self._model.eval()
 
     @property
     def model_id(self) -> str:
@@ -46,6 +58,31 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
         return self._model_id
 
+    @property
+    def backend(self) -> str:
+        """
+        Returns the inference backend used to run the model, either "torch" or "onnx".
+
+        Returns:
+            str: The inference backend used to run the model.
+        """
+
+        return self._backend
+
+    @property
+    def cache_key(self) -> str:
+        """
+        Returns the key of the embeddings generated by the model in the embedding cache. It includes the backend,
+        as the int8-quantized ONNX export doesn't produce the same vectors as the PyTorch model.
+
+        Returns:
+            str: The key of the embeddings generated by the model in the embedding cache.
+        """
+
+        backend = "onnx-int8" if self._backend == "onnx" else self._backend
+
+        return f"{self._model_id}:{backend}"
+
     @cached_property
     def embedding_size(self) -> int:
         """
@@ -55,7 +92,7 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
             int: The size of the embeddings generated by the pre-trained transformer model.
         """
 
-        dummy_embedding = self._model.encode("")
+        dummy_embedding = self._encoder.encode("")
 
         return dummy_embedding.shape[0]
 
@@ -68,10 +105,10 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
             int: The maximum length of input text to tokenize.
         """
 
-        return self._model.max_seq_length
+        return self._encoder.max_seq_length
 
     @property
-    def tokenizer(self) -> AutoTokenizer:
+    def tokenizer(self) -> "AutoTokenizer":
         """
         Returns the tokenizer used to tokenize input text.
 
@@ -79,10 +116,10 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
             AutoTokenizer: The tokenizer used to tokenize input text.
         """
 
-        return self._model.tokenizer
+        return self._encoder.tokenizer
 
     def __call__(
-        self, input_text: str | list[str], to_list: bool = True
+        self, input_text: str | list[str], to_list: bool = True, batch_size: int = 32
     ) -> NDArray[np.float32] | list[float] | list[list[float]]:
         """
         Generates embeddings for the input text using the pre-trained transformer model.
@@ -90,13 +127,14 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
         Args:
             input_text (str): The input text to generate embeddings for.
             to_list (bool): Whether to return the embeddings as a list or numpy array. Defaults to True.
+            batch_size (int): The number of texts encoded in a single forward pass. Defaults to 32.
 
         Returns:
             Union[np.ndarray, list]: The embeddings generated for the input text.
         """
 
         try:
-            embeddings = self._model.encode(input_text)
+            embeddings = self._encoder.encode(input_text, batch_size=batch_size)
         except Exception:
             logger.error(f"Error generating embeddings for {self._model_id=} and {input_text=}")
 
@@ -107,30 +145,107 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
 
         return embeddings
 
+    def check_backend_parity(self, input_text: list[str]) -> float:
+        """
+        Compares the embeddings of the ONNX backend against the PyTorch reference model.
+
+        Args:
+            input_text (list[str]): The texts used for the comparison.
+
+        Returns:
+            float: The minimum cosine similarity between the embeddings of the two backends.
+        """
+
+        torch_model = self._model or self._load_torch_model()
+        onnx_model = self._onnx_model or OnnxSentenceEncoder.from_sentence_transformer(self._model_id, torch_model)
+
+        torch_embeddings = torch_model.encode(input_text, normalize_embeddings=True)
+        onnx_embeddings = onnx_model.encode(input_text)
+        onnx_embeddings = onnx_embeddings / np.linalg.norm(onnx_embeddings, axis=1, keepdims=True)
+
+        return float(np.min(np.sum(torch_embeddings * onnx_embeddings, axis=1)))
+
+    @property
+    def _encoder(self) -> "SentenceTransformer | OnnxSentenceEncoder":
+        return self._onnx_model or self._model
+
+    def _load_torch_model(self) -> "SentenceTransformer":
+        # Imported here so that importing this module doesn't pull in PyTorch before a model is actually needed.
+        from sentence_transformers.SentenceTransformer import SentenceTransformer
+
+        model = SentenceTransformer(
+            self._model_id,
+            device=self._device,
+            cache_folder=str(self._cache_dir) if self._cache_dir else None,
+        )
+        model.eval()
+
+        return model
+
 
 class CrossEncoderModelSingleton(metaclass=SingletonMeta):
     def __init__(
         self,
-        model_id: str = settings.RERANKING_CROSS_ENCODER_MODEL_ID,
-        device: str = settings.RAG_MODEL_DEVICE,
+        model_id: str | None = None,
+        device: str | None = None,
+        backend: str | None = None,
     ) -> None:
         """
         A singleton class that provides a pre-trained cross-encoder model for scoring pairs of input text.
         """
 
+        model_id = model_id if model_id is not None else settings.RERANKING_CROSS_ENCODER_MODEL_ID
+        device = device if device is not None else settings.RAG_MODEL_DEVICE
+        backend = backend if backend is not None else settings.RAG_MODEL_BACKEND
+
+        assert backend in RAG_MODEL_BACKENDS, f"'backend' should be one of {RAG_MODEL_BACKENDS}. Got {backend}."
+
         self._model_id = model_id
         self._device = device
+        self._backend = backend
 
-        self._model = CrossEncoder(
-            model_name=self._model_id,
-            device=self._device,
-        )
-        self._model.model.eval()
+        # With the ONNX backend, the PyTorch model is only loaded by the parity checks.
+        self._model = self._load_torch_model() if backend == "torch" else None
+        self._onnx_model = OnnxCrossEncoder.from_pretrained(self._model_id) if backend == "onnx" else None
+
+    @property
+    def backend(self) -> str:
+        return self._backend
 
     def __call__(self, pairs: list[tuple[str, str]], to_list: bool = True) -> NDArray[np.float32] | list[float]:
-        scores = self._model.predict(pairs)
+        scores = (self._onnx_model or self._model).predict(pairs)
 
         if to_list:
             scores = scores.tolist()
 
         return scores
+
+    def check_backend_parity(self, pairs: list[tuple[str, str]]) -> float:
+        """
+        Compares the ranking produced by the ONNX backend against the PyTorch reference model.
+
+        Args:
+            pairs (list[tuple[str, str]]): The (query, document) pairs used for the comparison.
+
+        Returns:
+            float: The fraction of ranks on which the two backends agree.
+        """
+
+        torch_model = self._model or self._load_torch_model()
+        onnx_model = self._onnx_model or OnnxCrossEncoder.from_cross_encoder(self._model_id, torch_model)
+
+        torch_ranking = np.argsort(-torch_model.predict(pairs))
+        onnx_ranking = np.argsort(-onnx_model.predict(pairs))
+
+        return float(np.mean(torch_ranking == onnx_ranking))
+
+    def _load_torch_model(self) -> "CrossEncoder":
+        from sentence_transformers.cross_encoder import CrossEncoder
+
+        model = CrossEncoder(
+            model_name=self._model_id,
+            device=self._device,
+        )
+        model.model.eval()
+
+        return model
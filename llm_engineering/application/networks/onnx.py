@@ -0,0 +1,273 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application import utils
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.settings import settings
+
+ONNX_TASKS = ("feature-extraction", "text-classification")
+
+
+def export_quantized_onnx_model(model_id: str, task: str, models_dir: str | Path | None = None) -> Path:
+    """
+    Exports a Hugging Face model to ONNX and applies dynamic int8 quantization to it.
+    The result is cached on disk, so the export runs only once per model.
+
+    Args:
+        model_id (str): The identifier of the Hugging Face model to export.
+        task (str): Either "feature-extraction" (embedding models) or "text-classification" (cross-encoders).
+        models_dir (str | Path | None): The directory where the exported models are cached.
+            Defaults to `settings.RAG_ONNX_MODELS_DIR`.
+
+    Returns:
+        Path: The path of the quantized ONNX model.
+    """
+
+    assert task in ONNX_TASKS, f"'task' should be one of {ONNX_TASKS}. Got {task}."
+
+    models_dir = models_dir if models_dir is not None else settings.RAG_ONNX_MODELS_DIR
+
+    export_dir = Path(models_dir) / model_id.replace("/", "--")
+    quantized_model_path = export_dir / "model_quantized.onnx"
+    if quantized_model_path.exists():
+        return quantized_model_path
+
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "The ONNX backend requires the 'optimum[onnxruntime]' package. "
+            "Install it with `poetry install --extras onnx`."
+        ) from e
+
+    logger.info(f"Exporting {model_id} to ONNX with dynamic int8 quantization.", export_dir=str(export_dir))
+
+    model_class = ORTModelForFeatureExtraction if task == "feature-extraction" else ORTModelForSequenceClassification
+    model = model_class.from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(
+        save_dir=export_dir,
+        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+    )
+
+    return quantized_model_path
+
+
+class OnnxSession:
+    """
+    A thin wrapper over an ONNX Runtime CPU inference session that feeds it tokenizer outputs.
+    """
+
+    def __init__(self, model_path: Path) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "The ONNX backend requires the 'onnxruntime' package. Install it with `poetry install --extras onnx`."
+            ) from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self._session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = [model_input.name for model_input in self._session.get_inputs()]
+
+    def run(self, encoded_inputs: dict[str, NDArray]) -> NDArray[np.float32]:
+        inputs = {name: encoded_inputs[name].astype(np.int64) for name in self._input_names if name in encoded_inputs}
+
+        return self._session.run(None, inputs)[0]
+
+
+class OnnxSentenceEncoder:
+    """
+    Runs a quantized ONNX export of a SentenceTransformer model, reproducing its pooling and normalization.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        tokenizer,
+        max_seq_length: int,
+        pooling_mode: str = "mean",
+        normalize: bool = True,
+    ) -> None:
+        assert pooling_mode in ("mean", "cls", "max"), f"Unsupported pooling mode: {pooling_mode}."
+
+        self._tokenizer = tokenizer
+        self._max_seq_length = max_seq_length
+        self._pooling_mode = pooling_mode
+        self._normalize = normalize
+
+        self._session = OnnxSession(export_quantized_onnx_model(model_id, task="feature-extraction"))
+
+    @classmethod
+    def from_pretrained(cls, model_id: str, cache_dir: str | Path | None = None) -> "OnnxSentenceEncoder":
+        """
+        Builds the encoder from the configuration files of a SentenceTransformer model, without loading
+        its PyTorch weights.
+        """
+
+        from transformers import AutoTokenizer
+
+        pooling_mode = "mean"
+        normalize = False
+        for module in _load_model_file(model_id, "modules.json", cache_dir) or []:
+            if module["type"].endswith(".Pooling"):
+                pooling_config = _load_model_file(model_id, f"{module['path']}/config.json", cache_dir) or {}
+                if pooling_config.get("pooling_mode_cls_token"):
+                    pooling_mode = "cls"
+                elif pooling_config.get("pooling_mode_max_tokens"):
+                    pooling_mode = "max"
+            elif module["type"].endswith(".Normalize"):
+                normalize = True
+
+        tokenizer = AutoTokenizer.from_pretrained(model_id, cache_dir=cache_dir)
+        sentence_bert_config = _load_model_file(model_id, "sentence_bert_config.json", cache_dir) or {}
+
+        return cls(
+            model_id=model_id,
+            tokenizer=tokenizer,
+            max_seq_length=sentence_bert_config.get("max_seq_length") or tokenizer.model_max_length,
+            pooling_mode=pooling_mode,
+            normalize=normalize,
+        )
+
+    @classmethod
+    def from_sentence_transformer(cls, model_id: str, model) -> "OnnxSentenceEncoder":
+        from sentence_transformers.models import Normalize, Pooling
+
+        pooling_mode = "mean"
+        normalize = False
+        for module in model:
+            if isinstance(module, Pooling):
+                pooling_mode = module.get_pooling_mode_str()
+            elif isinstance(module, Normalize):
+                normalize = True
+
+        return cls(
+            model_id=model_id,
+            tokenizer=model.tokenizer,
+            max_seq_length=model.max_seq_length,
+            pooling_mode=pooling_mode,
+            normalize=normalize,
+        )
+
+    @property
+    def tokenizer(self):
+        return self._tokenizer
+
+    @property
+    def max_seq_length(self) -> int:
+        return self._max_seq_length
+
+    def encode(self, sentences: str | list[str], batch_size: int = 32) -> NDArray[np.float32]:
+        is_single_sentence = isinstance(sentences, str)
+        if is_single_sentence:
+            sentences = [sentences]
+
+        embeddings = [self._encode_batch(batch) for batch in utils.misc.batch(sentences, batch_size)]
+        embeddings = np.concatenate(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+
+        return embeddings[0] if is_single_sentence else embeddings
+
+    def _encode_batch(self, sentences: list[str]) -> NDArray[np.float32]:
+        encoded_inputs = self._tokenizer(
+            sentences, padding=True, truncation=True, max_length=self._max_seq_length, return_tensors="np"
+        )
+        token_embeddings = self._session.run(encoded_inputs)
+
+        attention_mask = encoded_inputs["attention_mask"][..., None].astype(np.float32)
+        if self._pooling_mode == "cls":
+            embeddings = token_embeddings[:, 0]
+        elif self._pooling_mode == "max":
+            embeddings = np.where(attention_mask > 0, token_embeddings, -1e9).max(axis=1)
+        else:
+            num_tokens = np.clip(attention_mask.sum(axis=1), 1e-9, None)
+            embeddings = (token_embeddings * attention_mask).sum(axis=1) / num_tokens
+
+        if self._normalize:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings.astype(np.float32, copy=False)
+
+
+class OnnxCrossEncoder:
+    """
+    Runs a quantized ONNX export of a CrossEncoder model, reproducing its default activation function.
+    """
+
+    def __init__(self, model_id: str, tokenizer, max_length: int | None, num_labels: int) -> None:
+        self._tokenizer = tokenizer
+        self._max_length = max_length
+        self._num_labels = num_labels
+
+        self._session = OnnxSession(export_quantized_onnx_model(model_id, task="text-classification"))
+
+    @classmethod
+    def from_pretrained(cls, model_id: str) -> "OnnxCrossEncoder":
+        """Builds the cross-encoder from the tokenizer and the configuration of the model, without its weights."""
+
+        from transformers import AutoConfig, AutoTokenizer
+
+        return cls(
+            model_id=model_id,
+            tokenizer=AutoTokenizer.from_pretrained(model_id),
+            max_length=None,  # Like CrossEncoder, the inputs are truncated to the limit of the tokenizer.
+            num_labels=AutoConfig.from_pretrained(model_id).num_labels,
+        )
+
+    @classmethod
+    def from_cross_encoder(cls, model_id: str, model) -> "OnnxCrossEncoder":
+        return cls(
+            model_id=model_id,
+            tokenizer=model.tokenizer,
+            max_length=model.max_length,
+            num_labels=model.config.num_labels,
+        )
+
+    def predict(self, pairs: list[tuple[str, str]], batch_size: int = 32) -> NDArray[np.float32]:
+        scores = [self._predict_batch(batch) for batch in utils.misc.batch(pairs, batch_size)]
+
+        return np.concatenate(scores) if scores else np.empty((0,), dtype=np.float32)
+
+    def _predict_batch(self, pairs: list[tuple[str, str]]) -> NDArray[np.float32]:
+        encoded_inputs = self._tokenizer(
+            [pair[0] for pair in pairs],
+            [pair[1] for pair in pairs],
+            padding=True,
+            truncation="longest_first",
+            max_length=self._max_length,
+            return_tensors="np",
+        )
+        logits = self._session.run(encoded_inputs)
+
+        if self._num_labels == 1:
+            return (1 / (1 + np.exp(-logits[:, 0]))).astype(np.float32)
+
+        return logits.astype(np.float32, copy=False)
+
+
+def _load_model_file(model_id: str, filename: str, cache_dir: str | Path | None = None) -> dict | list | None:
+    """Reads a JSON file of a Hugging Face model, from its local directory or from the Hub. None if it has none."""
+
+    if Path(model_id).is_dir():
+        path = Path(model_id) / filename
+
+        return json.loads(path.read_text()) if path.is_file() else None
+
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.utils import EntryNotFoundError
+
+    try:
+        path = hf_hub_download(model_id, filename, cache_dir=cache_dir)
+    except EntryNotFoundError:
+        return None
+
+    return json.loads(Path(path).read_text())
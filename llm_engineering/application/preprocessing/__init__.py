@@ -1,3 +1,12 @@
 from .dispatchers import ChunkingDispatcher, CleaningDispatcher, EmbeddingDispatcher
+from .incremental import IncrementalIngestion
+from .streaming import StreamingPipeline, StreamingStage
 
-__all__ = ["CleaningDispatcher", "ChunkingDispatcher", "EmbeddingDispatcher"]
+__all__ = [
+    "CleaningDispatcher",
+    "ChunkingDispatcher",
+    "EmbeddingDispatcher",
+    "IncrementalIngestion",
+    "StreamingPipeline",
+    "StreamingStage",
+]
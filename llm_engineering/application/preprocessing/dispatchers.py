@@ -1,7 +1,12 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from loguru import logger
 
 from llm_engineering.domain.base import NoSQLBaseDocument, VectorBaseDocument
 from llm_engineering.domain.types import DataCategory
+from llm_engineering.settings import settings
 
 from .chunking_data_handlers import (
     ArticleChunkingHandler,
@@ -54,6 +59,32 @@ class CleaningDispatcher:
 
         return clean_model
 
+    @classmethod
+    def dispatch_batch(
+        cls, data_models: list[NoSQLBaseDocument], num_workers: int | None = None
+    ) -> list[VectorBaseDocument]:
+        """
+        Cleans the documents on a pool of processes, as the cleaning is CPU-bound and holds the GIL.
+
+        Args:
+            data_models (list[NoSQLBaseDocument]): The raw documents to clean.
+            num_workers (int | None): The number of processes. Defaults to `settings.CLEANING_NUM_WORKERS`,
+                or to the number of CPU cores if it isn't set either.
+
+        Returns:
+            list[VectorBaseDocument]: The cleaned documents, in the same order as the input.
+        """
+
+        num_workers = min(num_workers or settings.CLEANING_NUM_WORKERS or os.cpu_count() or 1, len(data_models))
+        if num_workers <= 1:
+            return [cls.dispatch(data_model) for data_model in data_models]
+
+        # "spawn" keeps the workers safe from the threads and native libraries already running in the parent process.
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            chunksize = max(1, len(data_models) // (4 * num_workers))
+
+            return list(executor.map(cls.dispatch, data_models, chunksize=chunksize))
+
 
 class ChunkingHandlerFactory:
     @staticmethod
@@ -115,20 +146,27 @@ class EmbeddingDispatcher:
         if len(data_model) == 0:
             return []
 
-        data_category = data_model[0].get_category()
-        assert all(
-            data_model.get_category() == data_category for data_model in data_model
-        ), "Data models must be of the same category."
-        handler = cls.factory.create_handler(data_category)
+        # Embed the data models of all categories together so the batch scheduler can bucket them by length.
+        handlers = {}
+        for data_category in {data_model.get_category() for data_model in data_model}:
+            handlers[data_category] = cls.factory.create_handler(data_category)
 
-        embedded_chunk_model = handler.embed_batch(data_model)
+        embeddings = EmbeddingDataHandler.embed_contents(
+            [data_model.content for data_model in data_model],
+            use_cache=all(handler.use_cache for handler in handlers.values()),
+        )
+        embedded_chunk_model = [
+            handlers[data_model.get_category()].map_model(data_model, embedding)
+            for data_model, embedding in zip(data_model, embeddings, strict=True)
+        ]
 
         if not is_list:
             embedded_chunk_model = embedded_chunk_model[0]
 
         logger.info(
             "Data embedded successfully.",
-            data_category=data_category,
+            data_categories=list(handlers.keys()),
+            num=len(embedded_chunk_model) if is_list else 1,
         )
 
         return embedded_chunk_model
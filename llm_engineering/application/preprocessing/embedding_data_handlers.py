@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, cast
+from typing import ClassVar, Generic, TypeVar
 
-from llm_engineering.application.networks import EmbeddingModelSingleton
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application.networks import EmbeddingCache, EmbeddingModelSingleton
 from llm_engineering.domain.chunks import ArticleChunk, Chunk, PostChunk, RepositoryChunk
 from llm_engineering.domain.embedded_chunks import (
     EmbeddedArticleChunk,
@@ -10,12 +14,13 @@ from llm_engineering.domain.embedded_chunks import (
     EmbeddedRepositoryChunk,
 )
 from llm_engineering.domain.queries import EmbeddedQuery, Query
+from llm_engineering.settings import settings
+
+from .embedding_scheduler import EmbeddingBatchScheduler
 
 ChunkT = TypeVar("ChunkT", bound=Chunk)
 EmbeddedChunkT = TypeVar("EmbeddedChunkT", bound=EmbeddedChunk)
 
-embedding_model = EmbeddingModelSingleton()
-
 
 class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
     """
@@ -23,27 +28,72 @@ class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
     All data transformations logic for the embedding step is done here
     """
 
+    use_cache: ClassVar[bool] = True
+
     def embed(self, data_model: ChunkT) -> EmbeddedChunkT:
         return self.embed_batch([data_model])[0]
 
     def embed_batch(self, data_model: list[ChunkT]) -> list[EmbeddedChunkT]:
         embedding_model_input = [data_model.content for data_model in data_model]
-        embeddings = embedding_model(embedding_model_input, to_list=True)
+        embeddings = self.embed_contents(embedding_model_input, use_cache=self.use_cache)
 
         embedded_chunk = [
-            self.map_model(data_model, cast(list[float], embedding))
-            for data_model, embedding in zip(data_model, embeddings, strict=False)
+            self.map_model(data_model, embedding) for data_model, embedding in zip(data_model, embeddings, strict=False)
         ]
 
         return embedded_chunk
 
+    @staticmethod
+    def embed_contents(contents: list[str], use_cache: bool = True) -> NDArray[np.float32]:
+        """
+        Embeds the given texts, only sending the ones missing from the embedding cache to the model.
+
+        The embeddings are returned as a single matrix, one row per text, so the embedded models can hold
+        row views into it instead of per-float Python lists.
+
+        Args:
+            contents (list[str]): The texts to embed.
+            use_cache (bool): Whether to look up and store the embeddings in the embedding cache. Defaults to True.
+        """
+
+        scheduler = EmbeddingBatchScheduler()
+        if not use_cache or not settings.EMBEDDING_CACHE_ENABLED:
+            return scheduler.embed(contents)
+
+        cache = EmbeddingCache()
+        cached_embeddings = cache.get_many(EmbeddingModelSingleton().cache_key, contents)
+
+        missing_contents = list(dict.fromkeys(content for content in contents if content not in cached_embeddings))
+        if len(missing_contents) > 0:
+            missing_embeddings = scheduler.embed(missing_contents)
+            computed_embeddings = dict(zip(missing_contents, missing_embeddings, strict=True))
+            cache.set_many(EmbeddingModelSingleton().cache_key, computed_embeddings)
+        else:
+            computed_embeddings = {}
+
+        logger.info(
+            "Embedding cache lookup finished.",
+            num_hits=len(cached_embeddings),
+            num_misses=len(missing_contents),
+            total_hit_rate=cache.hit_rate,
+        )
+
+        embeddings = np.empty((len(contents), EmbeddingModelSingleton().embedding_size), dtype=np.float32)
+        for i, content in enumerate(contents):
+            embeddings[i] = cached_embeddings[content] if content in cached_embeddings else computed_embeddings[content]
+
+        return embeddings
+
     @abstractmethod
-    def map_model(self, data_model: ChunkT, embedding: list[float]) -> EmbeddedChunkT:
+    def map_model(self, data_model: ChunkT, embedding: NDArray[np.float32]) -> EmbeddedChunkT:
         pass
 
 
 class QueryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: Query, embedding: list[float]) -> EmbeddedQuery:
+    # Queries are rarely repeated, so caching them would only add a cache round trip to every RAG request.
+    use_cache = False
+
+    def map_model(self, data_model: Query, embedding: NDArray[np.float32]) -> EmbeddedQuery:
         return EmbeddedQuery(
             id=data_model.id,
             author_id=data_model.author_id,
@@ -51,15 +101,16 @@ class QueryEmbeddingHandler(EmbeddingDataHandler):
             content=data_model.content,
             embedding=embedding,
             metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
+                "embedding_model_id": EmbeddingModelSingleton().model_id,
+                "embedding_backend": EmbeddingModelSingleton().backend,
+                "embedding_size": EmbeddingModelSingleton().embedding_size,
+                "max_input_length": EmbeddingModelSingleton().max_input_length,
             },
         )
 
 
 class PostEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: PostChunk, embedding: list[float]) -> EmbeddedPostChunk:
+    def map_model(self, data_model: PostChunk, embedding: NDArray[np.float32]) -> EmbeddedPostChunk:
         return EmbeddedPostChunk(
             id=data_model.id,
             content=data_model.content,
@@ -69,15 +120,16 @@ class PostEmbeddingHandler(EmbeddingDataHandler):
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
             metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
+                "embedding_model_id": EmbeddingModelSingleton().model_id,
+                "embedding_backend": EmbeddingModelSingleton().backend,
+                "embedding_size": EmbeddingModelSingleton().embedding_size,
+                "max_input_length": EmbeddingModelSingleton().max_input_length,
             },
         )
 
 
 class ArticleEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: ArticleChunk, embedding: list[float]) -> EmbeddedArticleChunk:
+    def map_model(self, data_model: ArticleChunk, embedding: NDArray[np.float32]) -> EmbeddedArticleChunk:
         return EmbeddedArticleChunk(
             id=data_model.id,
             content=data_model.content,
@@ -88,15 +140,16 @@ class ArticleEmbeddingHandler(EmbeddingDataHandler):
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
             metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
+                "embedding_model_id": EmbeddingModelSingleton().model_id,
+                "embedding_backend": EmbeddingModelSingleton().backend,
+                "embedding_size": EmbeddingModelSingleton().embedding_size,
+                "max_input_length": EmbeddingModelSingleton().max_input_length,
             },
         )
 
 
 class RepositoryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: RepositoryChunk, embedding: list[float]) -> EmbeddedRepositoryChunk:
+    def map_model(self, data_model: RepositoryChunk, embedding: NDArray[np.float32]) -> EmbeddedRepositoryChunk:
         return EmbeddedRepositoryChunk(
             id=data_model.id,
             content=data_model.content,
@@ -108,8 +161,9 @@ class RepositoryEmbeddingHandler(EmbeddingDataHandler):
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
             metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
+                "embedding_model_id": EmbeddingModelSingleton().model_id,
+                "embedding_backend": EmbeddingModelSingleton().backend,
+                "embedding_size": EmbeddingModelSingleton().embedding_size,
+                "max_input_length": EmbeddingModelSingleton().max_input_length,
             },
         )
@@ -0,0 +1,118 @@
+from typing import Iterator
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+from llm_engineering.application.networks import EmbeddingModelSingleton, EmbeddingWorkerPool
+from llm_engineering.settings import settings
+
+
+class EmbeddingBatchScheduler:
+    """
+    Groups texts of similar token length into batches bounded by a padded token budget.
+
+    Sorting by length keeps the padding inside each batch minimal, while the budget lets short texts (e.g., posts)
+    share large batches and keeps long texts (e.g., repositories) from padding huge batches to their length.
+    """
+
+    def __init__(
+        self,
+        token_budget: int | None = None,
+        max_batch_size: int | None = None,
+    ) -> None:
+        token_budget = token_budget if token_budget is not None else settings.EMBEDDING_BATCH_TOKEN_BUDGET
+        max_batch_size = max_batch_size if max_batch_size is not None else settings.EMBEDDING_MAX_BATCH_SIZE
+
+        assert token_budget > 0, f"'token_budget' should be greater than 0. Got {token_budget}."
+        assert max_batch_size > 0, f"'max_batch_size' should be greater than 0. Got {max_batch_size}."
+
+        self._token_budget = token_budget
+        self._max_batch_size = max_batch_size
+        self._embedding_model = EmbeddingModelSingleton()
+
+    def compute_num_tokens(self, texts: list[str]) -> list[int]:
+        encoded = self._embedding_model.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self._embedding_model.max_input_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+
+        return [len(input_ids) for input_ids in encoded["input_ids"]]
+
+    def schedule(self, num_tokens: list[int]) -> list[list[int]]:
+        """
+        Splits the texts into batches whose padded size (batch size x longest text) fits the token budget.
+
+        Args:
+            num_tokens (list[int]): The number of tokens of every text.
+
+        Returns:
+            list[list[int]]: The indices of the texts within each batch.
+        """
+
+        sorted_indices = sorted(range(len(num_tokens)), key=lambda i: num_tokens[i], reverse=True)
+
+        batches = []
+        current_batch = []
+        current_max_num_tokens = 0
+        for i in sorted_indices:
+            max_num_tokens = max(current_max_num_tokens, num_tokens[i], 1)
+            fits_budget = (len(current_batch) + 1) * max_num_tokens <= self._token_budget
+            if current_batch and (not fits_budget or len(current_batch) >= self._max_batch_size):
+                batches.append(current_batch)
+                current_batch = []
+                max_num_tokens = max(num_tokens[i], 1)
+
+            current_batch.append(i)
+            current_max_num_tokens = max_num_tokens
+
+        if current_batch:
+            batches.append(current_batch)
+
+        return batches
+
+    def embed(self, texts: list[str]) -> NDArray[np.float32]:
+        """
+        Embeds the texts calling the embedding model once per batch and scatters the results back in input order.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            NDArray[np.float32]: The embeddings, one row per text, in the same order as the input.
+        """
+
+        embeddings = np.empty((len(texts), self._embedding_model.embedding_size), dtype=np.float32)
+        if len(texts) == 0:
+            return embeddings
+
+        batches = self.schedule(self.compute_num_tokens(texts))
+        batches_embeddings = self._embed_batches([[texts[i] for i in batch_indices] for batch_indices in batches])
+        for batch_indices, batch_embeddings in zip(batches, batches_embeddings, strict=True):
+            if len(batch_embeddings) != len(batch_indices):
+                raise RuntimeError(
+                    f"The embedding model returned {len(batch_embeddings)} embeddings "
+                    f"for a batch of {len(batch_indices)} texts."
+                )
+
+            embeddings[batch_indices] = batch_embeddings
+
+        logger.info(
+            "Texts embedded successfully.",
+            num_texts=len(texts),
+            num_batches=len(batches),
+            token_budget=self._token_budget,
+        )
+
+        return embeddings
+
+    def _embed_batches(self, batches: list[list[str]]) -> Iterator[NDArray[np.float32]]:
+        use_worker_pool = settings.EMBEDDING_NUM_WORKERS > 1 and settings.RAG_MODEL_DEVICE == "cpu"
+        if use_worker_pool and len(batches) > 1:
+            yield from EmbeddingWorkerPool().map(batches)
+        else:
+            for batch in batches:
+                yield self._embedding_model(batch, to_list=False, batch_size=len(batch))
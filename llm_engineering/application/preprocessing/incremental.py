@@ -0,0 +1,176 @@
+import threading
+from collections import Counter, defaultdict
+from typing import Generator, Iterable
+
+from loguru import logger
+from pydantic import UUID4
+from qdrant_client.models import FieldCondition, Filter, HasIdCondition, MatchAny
+
+from llm_engineering.domain.base import VectorBaseDocument
+from llm_engineering.domain.cleaned_documents import CleanedDocument
+from llm_engineering.domain.documents import Document, DocumentIngestionState
+from llm_engineering.domain.embedded_chunks import EmbeddedChunk
+from llm_engineering.domain.types import DataCategory
+
+
+class IncrementalIngestion:
+    """
+    Limits the feature engineering pipeline to the raw documents that changed since they were last loaded.
+
+    Every loaded document is recorded as a `DocumentIngestionState` holding the fingerprint of its content. As the
+    chunk ids are content hashes, re-chunking a modified document leaves its old chunks behind, so they are deleted
+    when the new state is committed. The documents deleted from the data warehouse are purged the same way.
+
+    Usage:
+        1. `select_changed` filters the raw documents of an author and purges the removed ones.
+           It can run concurrently for different document classes.
+        2. `track_chunks` records the ids of the chunks loaded into the vector DB.
+        3. `commit` deletes the stale chunks and saves the new states, once everything was loaded.
+    """
+
+    def __init__(self) -> None:
+        self._pending_states: dict[str, DocumentIngestionState] = {}
+        self._chunk_ids: dict[DataCategory, list[str]] = defaultdict(list)
+        self._num_chunks: Counter[str] = Counter()
+        self.num_unchanged = 0
+        self.num_removed = 0
+        self._lock = threading.Lock()
+
+    def select_changed(
+        self, document_class: type[Document], author_id: UUID4, documents: Iterable[Document]
+    ) -> Generator[Document, None, None]:
+        """
+        Streams the new or modified documents and purges the removed ones once the input is exhausted.
+
+        Args:
+            document_class (type[Document]): The class of the documents.
+            author_id (UUID4): The author of the documents.
+            documents (Iterable[Document]): All the raw documents of the author in the collection of `document_class`.
+
+        Yields:
+            Document: The new or modified documents.
+        """
+
+        stored_states = {
+            str(state.id): state
+            for state in DocumentIngestionState.bulk_find(
+                author_id=str(author_id), category=document_class.get_collection_name()
+            )
+        }
+
+        num_changed = 0
+        num_unchanged = 0
+        for document in documents:
+            state = stored_states.pop(str(document.id), None)
+            if state is not None and state.fingerprint == DocumentIngestionState.compute_fingerprint(document):
+                num_unchanged += 1
+
+                continue
+
+            self.track_documents([document])
+            num_changed += 1
+
+            yield document
+
+        # The states left over belong to documents that are no longer in the data warehouse.
+        removed_states = list(stored_states.values())
+        if len(removed_states) > 0:
+            self._purge(removed_states)
+
+        with self._lock:
+            self.num_unchanged += num_unchanged
+            self.num_removed += len(removed_states)
+
+        logger.info(
+            "Detected the documents that changed since the last ingestion.",
+            collection=document_class.get_collection_name(),
+            author_id=str(author_id),
+            num_changed=num_changed,
+            num_unchanged=num_unchanged,
+            num_removed=len(removed_states),
+        )
+
+    def track_documents(self, documents: Iterable[Document]) -> None:
+        for document in documents:
+            state = DocumentIngestionState.from_document(document)
+            with self._lock:
+                self._pending_states[str(document.id)] = state
+
+    def track_chunks(self, chunks: list[VectorBaseDocument]) -> list[VectorBaseDocument]:
+        """Records the ids of the chunks and passes them through, so it can be used as a streaming stage."""
+
+        for chunk in chunks:
+            self._chunk_ids[chunk.get_category()].append(str(chunk.id))
+            self._num_chunks[str(chunk.document_id)] += 1
+
+        return chunks
+
+    def commit(self) -> dict:
+        """
+        Deletes the chunks the tracked documents no longer produce and saves their states.
+
+        Returns:
+            dict: The number of processed, unchanged and removed documents and of deleted stale chunks.
+        """
+
+        states = list(self._pending_states.values())
+
+        num_stale_chunks = 0
+        for category, category_states in _group_by_category(states).items():
+            document_ids = [str(state.id) for state in category_states]
+            must_not = []
+            if len(self._chunk_ids[category]) > 0:
+                must_not.append(HasIdCondition(has_id=self._chunk_ids[category]))
+            stale_chunks_filter = Filter(
+                must=[FieldCondition(key="document_id", match=MatchAny(any=document_ids))], must_not=must_not
+            )
+            num_stale_chunks += _get_document_class(EmbeddedChunk, category).bulk_delete(stale_chunks_filter)
+
+        for state in states:
+            state.num_chunks = self._num_chunks[str(state.id)]
+        if not DocumentIngestionState.bulk_upsert(states):
+            raise RuntimeError("Failed to save the ingestion states of the processed documents.")
+
+        report = {
+            "num_processed_documents": len(states),
+            "num_unchanged_documents": self.num_unchanged,
+            "num_removed_documents": self.num_removed,
+            "num_stale_chunks_deleted": num_stale_chunks,
+        }
+        logger.info("Committed the incremental ingestion.", **report)
+
+        self._pending_states = {}
+        self._chunk_ids = defaultdict(list)
+        self._num_chunks = Counter()
+
+        return report
+
+    def _purge(self, states: list[DocumentIngestionState]) -> None:
+        for category, category_states in _group_by_category(states).items():
+            document_ids = [str(state.id) for state in category_states]
+
+            # The cleaned documents keep the ids of the raw ones, while the chunks reference them by 'document_id'.
+            _get_document_class(CleanedDocument, category).bulk_delete(
+                Filter(must=[HasIdCondition(has_id=document_ids)])
+            )
+            _get_document_class(EmbeddedChunk, category).bulk_delete(
+                Filter(must=[FieldCondition(key="document_id", match=MatchAny(any=document_ids))])
+            )
+
+        DocumentIngestionState.bulk_delete(_id={"$in": [str(state.id) for state in states]})
+
+
+def _group_by_category(states: list[DocumentIngestionState]) -> dict[DataCategory, list[DocumentIngestionState]]:
+    grouped_states = defaultdict(list)
+    for state in states:
+        grouped_states[DataCategory(state.category)].append(state)
+
+    return grouped_states
+
+
+def _get_document_class(base_class: type[VectorBaseDocument], category: DataCategory) -> type[VectorBaseDocument]:
+    for subclass in base_class.__subclasses__():
+        if subclass.get_category() == category:
+            return subclass
+
+    raise ValueError(f"No subclass of {base_class.__name__} found for category: {category}")
@@ -1,26 +1,100 @@
 import re
+from functools import lru_cache
+from itertools import chain, pairwise
+from typing import TYPE_CHECKING, Generator
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, SentenceTransformersTokenTextSplitter
-
+from llm_engineering.application import utils
 from llm_engineering.application.networks import EmbeddingModelSingleton
 
-embedding_model = EmbeddingModelSingleton()
+if TYPE_CHECKING:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 
 def chunk_text(text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> list[str]:
-    character_splitter = RecursiveCharacterTextSplitter(separators=["\n\n"], chunk_size=chunk_size, chunk_overlap=0)
+    character_splitter = get_character_splitter(chunk_size=chunk_size)
     text_split_by_characters = character_splitter.split_text(text)
 
-    token_splitter = SentenceTransformersTokenTextSplitter(
-        chunk_overlap=chunk_overlap,
+    embedding_model = EmbeddingModelSingleton()
+    token_splitter = get_token_splitter(
+        model_id=embedding_model.model_id,
         tokens_per_chunk=embedding_model.max_input_length,
-        model_name=embedding_model.model_id,
+        chunk_overlap=chunk_overlap,
     )
-    chunks_by_tokens = []
-    for section in text_split_by_characters:
-        chunks_by_tokens.extend(token_splitter.split_text(section))
 
-    return chunks_by_tokens
+    # Tokenize all the sections of the document in a single call instead of once per section.
+    return token_splitter.split_texts(text_split_by_characters)
+
+
+class TokenTextSplitter:
+    """
+    A batched equivalent of langchain's SentenceTransformersTokenTextSplitter.
+
+    It splits every text into windows of `tokens_per_chunk` tokens overlapping by `chunk_overlap` tokens,
+    but tokenizes and decodes all the texts at once and reuses an already loaded tokenizer instead of
+    loading a new SentenceTransformer model on every instantiation.
+    """
+
+    # Avoids the tokenizer's warning about sequences longer than the model's limit, as they are split afterward.
+    _max_length = 2**32
+
+    def __init__(self, tokenizer, tokens_per_chunk: int, chunk_overlap: int) -> None:
+        assert (
+            0 <= chunk_overlap < tokens_per_chunk
+        ), f"'chunk_overlap' should be in [0, {tokens_per_chunk}). Got {chunk_overlap}."
+
+        self._tokenizer = tokenizer
+        self._tokens_per_chunk = tokens_per_chunk
+        self._chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> list[str]:
+        return self.split_texts([text])
+
+    def split_texts(self, texts: list[str]) -> list[str]:
+        if len(texts) == 0:
+            return []
+
+        encoded = self._tokenizer(
+            texts,
+            add_special_tokens=False,
+            max_length=self._max_length,
+            truncation="do_not_truncate",
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+
+        windows = []
+        stride = self._tokens_per_chunk - self._chunk_overlap
+        for input_ids in encoded["input_ids"]:
+            start_idx = 0
+            while start_idx < len(input_ids):
+                end_idx = min(start_idx + self._tokens_per_chunk, len(input_ids))
+                windows.append(input_ids[start_idx:end_idx])
+                if end_idx == len(input_ids):
+                    break
+
+                start_idx += stride
+
+        return self._tokenizer.batch_decode(windows)
+
+
+@lru_cache(maxsize=None)
+def get_character_splitter(chunk_size: int, chunk_overlap: int = 0) -> "RecursiveCharacterTextSplitter":
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(separators=["\n\n"], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+@lru_cache(maxsize=None)
+def get_token_splitter(model_id: str, tokens_per_chunk: int, chunk_overlap: int) -> TokenTextSplitter:
+    return TokenTextSplitter(get_tokenizer(model_id), tokens_per_chunk=tokens_per_chunk, chunk_overlap=chunk_overlap)
+
+
+def get_tokenizer(model_id: str):
+    embedding_model = EmbeddingModelSingleton()
+    if embedding_model.model_id == model_id:
+        return embedding_model.tokenizer
+
+    return utils.misc.get_tokenizer(model_id)
 
 
 def chunk_document(text: str, min_length: int, max_length: int) -> list[str]:
@@ -30,23 +104,76 @@ def chunk_document(text: str, min_length: int, max_length: int) -> list[str]:
 
 
 def chunk_article(text: str, min_length: int, max_length: int) -> list[str]:
-    sentences = re.split(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s", text)
+    """
+    Groups the sentences of the text into chunks of at most `max_length` characters, dropping the chunks
+    shorter than `min_length`. Sentences longer than `max_length` make up a chunk of their own.
 
-    extracts = []
-    current_chunk = ""
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
+    The sentences are tracked as character offsets into the original text, so every chunk is built with
+    a single slice (or a single join, when the sentences are separated by more than one space).
+    """
 
-        if len(current_chunk) + len(sentence) <= max_length:
-            current_chunk += sentence + " "
+    extracts = []
+    chunk_spans: list[tuple[int, int]] = []
+    chunk_length = 0
+    for start, end in _iter_sentence_spans(text):
+        sentence_length = end - start
+
+        # Every sentence accounts for its trailing separator, as in " ".join(sentences) + " ".
+        if chunk_length + sentence_length <= max_length:
+            chunk_spans.append((start, end))
+            chunk_length += sentence_length + 1
         else:
-            if len(current_chunk) >= min_length:
-                extracts.append(current_chunk.strip())
-            current_chunk = sentence + " "
+            if chunk_length >= min_length:
+                extracts.append(_join_spans(text, chunk_spans))
+            chunk_spans = [(start, end)]
+            chunk_length = sentence_length + 1
 
-    if len(current_chunk) >= min_length:
-        extracts.append(current_chunk.strip())
+    if chunk_length >= min_length:
+        extracts.append(_join_spans(text, chunk_spans))
 
     return extracts
+
+
+# A sentence ends with a whitespace preceded by ".", "?" or "!", unless the punctuation closes an abbreviation
+# such as "e.g." (\w\.\w.) or a title such as "Mr." ([A-Z][a-z]\.).
+_SENTENCE_END = re.compile(r"[.?!]\s")
+_ABBREVIATION = re.compile(r"\w\.\w.")
+_TITLE = re.compile(r"[A-Z][a-z]\.")
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def _iter_sentence_boundaries(text: str) -> Generator[int, None, None]:
+    for match in _SENTENCE_END.finditer(text):
+        boundary = match.end() - 1
+        if boundary >= 4 and _ABBREVIATION.fullmatch(text, boundary - 4, boundary):
+            continue
+        if boundary >= 3 and _TITLE.fullmatch(text, boundary - 3, boundary):
+            continue
+
+        yield boundary
+
+
+def _iter_sentence_spans(text: str) -> Generator[tuple[int, int], None, None]:
+    """Yields the (start, end) offsets of the non-empty, whitespace-stripped sentences of the text."""
+
+    start = 0
+    for boundary in chain(_iter_sentence_boundaries(text), [len(text)]):
+        first_character = _NON_WHITESPACE.search(text, start, boundary)
+        if first_character is not None:
+            # Inner sentences end with their punctuation, so only the last one has trailing whitespace.
+            end = boundary if boundary < len(text) else len(text.rstrip())
+
+            yield first_character.start(), end
+
+        start = boundary + 1
+
+
+def _join_spans(text: str, spans: list[tuple[int, int]]) -> str:
+    if len(spans) == 0:
+        return ""
+
+    is_contiguous = all(next_start == end + 1 and text[end] == " " for (_, end), (next_start, _) in pairwise(spans))
+    if is_contiguous:
+        return text[spans[0][0] : spans[-1][1]]
+
+    return " ".join(text[start:end] for start, end in spans)
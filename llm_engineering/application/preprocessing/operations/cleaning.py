@@ -1,8 +1,8 @@
 import re
 
+# Every run of characters other than word characters and ".,!?" (which includes all whitespace) becomes one space.
+_NON_TEXT_CHARACTERS = re.compile(r"[^\w.,!?]+")
 
-def clean_text(text: str) -> str:
-    text = re.sub(r"[^\w\s.,!?]", " ", text)
-    text = re.sub(r"\s+", " ", text)
 
-    return text.strip()
+def clean_text(text: str) -> str:
+    return _NON_TEXT_CHARACTERS.sub(" ", text).strip()
@@ -0,0 +1,247 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from loguru import logger
+
+from llm_engineering.settings import settings
+
+_END_OF_STREAM = object()
+
+
+class StageStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.num_inputs = 0
+        self.num_outputs = 0
+        self.busy_time = 0.0
+        self.wall_time = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """The number of input items processed per second of wall time."""
+
+        return self.num_inputs / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """The fraction of the wall time the stage spent working instead of waiting on its neighbours."""
+
+        return self.busy_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "num_inputs": self.num_inputs,
+            "num_outputs": self.num_outputs,
+            "busy_time_seconds": round(self.busy_time, 3),
+            "wall_time_seconds": round(self.wall_time, 3),
+            "throughput_per_second": round(self.throughput, 3),
+            "utilization": round(self.utilization, 3),
+        }
+
+
+class StreamingStage:
+    """
+    A stage of a streaming pipeline that maps batches of input items to output items.
+
+    Args:
+        name (str): The name under which the stage is reported.
+        fn (Callable[[list], Iterable]): Processes a batch of items and returns the items passed to the next stage.
+        batch_size (int): The number of input items accumulated before calling `fn`. The last batch may be smaller.
+    """
+
+    def __init__(self, name: str, fn: Callable[[list], Iterable], batch_size: int = 1) -> None:
+        assert batch_size > 0, f"'batch_size' should be greater than 0. Got {batch_size}."
+
+        self.name = name
+        self.fn = fn
+        self.batch_size = batch_size
+        self.stats = StageStats(name)
+
+
+class StreamingPipeline:
+    """
+    Runs a chain of stages concurrently, one thread per stage, connected by bounded queues.
+
+    A stage blocks as soon as the queue towards the next one is full, so a slow stage (e.g., embedding)
+    throttles the stages before it and the number of items held in memory stays bounded by the queue sizes
+    and the batch sizes, independently of the size of the source.
+    """
+
+    def __init__(self, stages: list[StreamingStage], queue_size: int | None = None) -> None:
+        queue_size = queue_size if queue_size is not None else settings.FE_STREAMING_QUEUE_SIZE
+
+        assert len(stages) > 0, "The streaming pipeline requires at least one stage."
+        assert queue_size > 0, f"'queue_size' should be greater than 0. Got {queue_size}."
+
+        self._stages = stages
+        self._queue_size = queue_size
+
+    def run(self, source: Iterable[Any]) -> dict[str, dict]:
+        """
+        Streams the source items through all the stages and waits for them to finish.
+
+        Args:
+            source (Iterable[Any]): The items fed to the first stage. It is consumed lazily.
+
+        Returns:
+            dict[str, dict]: The throughput statistics of the source and of every stage, keyed by their name.
+        """
+
+        source_stats = StageStats("source")
+        for stage in self._stages:
+            stage.stats = StageStats(stage.name)
+
+        queues = [queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages) + 1)]
+        stop_event = threading.Event()
+        errors: list[Exception] = []
+
+        threads = [
+            threading.Thread(
+                target=self._produce,
+                args=(source, self._stages[0].batch_size, queues[0], source_stats, stop_event, errors),
+                name="streaming-source",
+                daemon=True,
+            )
+        ]
+        for stage, input_queue, output_queue in zip(self._stages, queues[:-1], queues[1:], strict=True):
+            threads.append(
+                threading.Thread(
+                    target=self._consume,
+                    args=(stage, input_queue, output_queue, stop_event, errors),
+                    name=f"streaming-{stage.name}",
+                    daemon=True,
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+
+        # Drain the outputs of the last stage so it never blocks on a full queue.
+        while self._get(queues[-1], stop_event) is not _END_OF_STREAM:
+            pass
+
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        report = {source_stats.name: source_stats.to_dict()}
+        for stage in self._stages:
+            report[stage.name] = stage.stats.to_dict()
+
+            logger.info(
+                f"Streaming stage '{stage.name}' finished.",
+                num_inputs=stage.stats.num_inputs,
+                num_outputs=stage.stats.num_outputs,
+                throughput_per_second=round(stage.stats.throughput, 3),
+                utilization=round(stage.stats.utilization, 3),
+            )
+
+        return report
+
+    def _produce(
+        self,
+        source: Iterable[Any],
+        batch_size: int,
+        output_queue: queue.Queue,
+        stats: StageStats,
+        stop_event: threading.Event,
+        errors: list[Exception],
+    ) -> None:
+        start_time = time.perf_counter()
+        try:
+            batch = []
+            for item in source:
+                batch.append(item)
+                stats.num_inputs += 1
+                stats.num_outputs += 1
+
+                if len(batch) >= batch_size:
+                    if not self._put(output_queue, batch, stop_event):
+                        return
+                    batch = []
+
+            if batch and not self._put(output_queue, batch, stop_event):
+                return
+
+            self._put(output_queue, _END_OF_STREAM, stop_event)
+        except Exception as e:
+            logger.exception("The source of the streaming pipeline failed.")
+
+            errors.append(e)
+            stop_event.set()
+        finally:
+            stats.wall_time = time.perf_counter() - start_time
+
+    def _consume(
+        self,
+        stage: StreamingStage,
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        stop_event: threading.Event,
+        errors: list[Exception],
+    ) -> None:
+        start_time = time.perf_counter()
+        try:
+            buffer = []
+            while (items := self._get(input_queue, stop_event)) is not _END_OF_STREAM:
+                buffer.extend(items)
+
+                while len(buffer) >= stage.batch_size:
+                    batch, buffer = buffer[: stage.batch_size], buffer[stage.batch_size :]
+                    if not self._process(stage, batch, output_queue, stop_event):
+                        return
+
+            if stop_event.is_set():
+                return
+
+            if buffer and not self._process(stage, buffer, output_queue, stop_event):
+                return
+
+            self._put(output_queue, _END_OF_STREAM, stop_event)
+        except Exception as e:
+            logger.exception(f"Streaming stage '{stage.name}' failed.")
+
+            errors.append(e)
+            stop_event.set()
+        finally:
+            stage.stats.wall_time = time.perf_counter() - start_time
+
+    def _process(
+        self, stage: StreamingStage, batch: list, output_queue: queue.Queue, stop_event: threading.Event
+    ) -> bool:
+        start_time = time.perf_counter()
+        outputs = list(stage.fn(batch))
+        stage.stats.busy_time += time.perf_counter() - start_time
+        stage.stats.num_inputs += len(batch)
+        stage.stats.num_outputs += len(outputs)
+
+        if len(outputs) == 0:
+            return True
+
+        return self._put(output_queue, outputs, stop_event)
+
+    @staticmethod
+    def _put(output_queue: queue.Queue, item: Any, stop_event: threading.Event) -> bool:
+        while not stop_event.is_set():
+            try:
+                output_queue.put(item, timeout=0.1)
+
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    @staticmethod
+    def _get(input_queue: queue.Queue, stop_event: threading.Event) -> Any:
+        while not stop_event.is_set():
+            try:
+                return input_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+        return _END_OF_STREAM
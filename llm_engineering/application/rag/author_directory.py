@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from uuid import UUID
+
+from loguru import logger
+
+from llm_engineering.application.networks.base import SingletonMeta
+from llm_engineering.domain.documents import UserDocument
+from llm_engineering.settings import settings
+
+from .author_matcher import AuthorNameMatcher
+
+
+class AuthorDirectory(metaclass=SingletonMeta):
+    """
+    An in-memory directory of the authors, resolving the author mentioned in a query without any LLM call
+    or database round trip. It is loaded on first use and reloaded in a background thread once it is older than
+    `refresh_interval`, so the queries never wait for a refresh.
+    """
+
+    def __init__(self, refresh_interval: float | None = None) -> None:
+        self._refresh_interval = (
+            refresh_interval if refresh_interval is not None else settings.AUTHOR_DIRECTORY_REFRESH_SECONDS
+        )
+        self._refresh_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._matcher = AuthorNameMatcher([])
+        self._users: dict[UUID, UserDocument] = {}
+        self._loaded_at: float | None = None
+
+    def match(self, text: str) -> UserDocument | None:
+        """
+        Args:
+            text (str): The text mentioning the author, e.g., the query of the user.
+
+        Returns:
+            UserDocument | None: The only author mentioned in the text, or None if there is none or several of them.
+        """
+
+        if self._loaded_at is None:
+            self._load_once()
+        elif time.monotonic() - self._loaded_at > self._refresh_interval and self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_in_background, name="author-directory-refresh", daemon=True).start()
+
+        return self._matcher.match(text)
+
+    async def amatch(self, text: str) -> UserDocument | None:
+        if self._loaded_at is None:
+            await asyncio.to_thread(self._load_once)
+
+        return self.match(text)
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._load()
+
+    def add(self, user: UserDocument) -> None:
+        """Adds an author found by other means (e.g., by the LLM), so the next queries mentioning it match."""
+
+        if user.id in self._users:
+            return
+
+        with self._update_lock:
+            self._users = {**self._users, user.id: user}
+            self._matcher = AuthorNameMatcher(list(self._users.values()))
+
+    def _load_once(self) -> None:
+        with self._refresh_lock:
+            # Another thread may have loaded the directory while this one was waiting for the lock.
+            if self._loaded_at is None:
+                self._load()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._load()
+        finally:
+            self._refresh_lock.release()
+
+    def _load(self) -> None:
+        try:
+            users = UserDocument.bulk_find()
+        except Exception:
+            logger.exception("Failed to load the author directory. Keeping the previous version.")
+
+            # Retried after the refresh interval instead of on every query.
+            self._loaded_at = time.monotonic()
+
+            return
+
+        matcher = AuthorNameMatcher(users)
+        # The matcher is swapped at once, so concurrent queries always see a complete version of it.
+        with self._update_lock:
+            self._users = {user.id: user for user in users}
+            self._matcher = matcher
+        self._loaded_at = time.monotonic()
+
+        logger.info("Loaded the author directory.", num_authors=len(users))
@@ -0,0 +1,120 @@
+import re
+import unicodedata
+from collections import deque
+from uuid import UUID
+
+from llm_engineering.domain.documents import UserDocument
+
+
+class AuthorNameMatcher:
+    """
+    An Aho-Corasick automaton over the name variants of the authors, finding all the authors mentioned
+    in a text in a single pass over it, independently of the number of authors.
+
+    The names and the texts are normalized (lowercased, without accents and punctuation) and padded with
+    spaces, so only whole words match, e.g., "Paul Iusztin" matches "i am paul iusztin," but not "paul iusztinson".
+    Only the period after a single letter is kept, so initials are told apart from one-letter words.
+    """
+
+    def __init__(self, users: list[UserDocument]) -> None:
+        variant_to_users: dict[str, set[UUID]] = {}
+        self._users: dict[UUID, UserDocument] = {}
+        for user in users:
+            self._users[user.id] = user
+            for variant in self.get_name_variants(user):
+                variant_to_users.setdefault(variant, set()).add(user.id)
+
+        # The variants shared by several authors (e.g., "j doe" for "John Doe" and "Jane Doe") can't identify one.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[tuple[int, UUID]]] = [[]]
+        for variant, user_ids in variant_to_users.items():
+            if len(user_ids) == 1:
+                self._add_pattern(f" {variant} ", next(iter(user_ids)))
+        self._build_failure_links()
+
+    @staticmethod
+    def get_name_variants(user: UserDocument) -> set[str]:
+        first_name, last_name = _normalize_name(user.first_name), _normalize_name(user.last_name)
+        first_names = first_name.split()
+
+        variants = {
+            f"{first_name} {last_name}",
+            f"{last_name} {first_name}",  # Also matches "Last, First", as the punctuation is dropped.
+            _normalize_name(str(user.id)),
+        }
+        if first_name == last_name:  # The authors known by a single name.
+            variants.add(first_name)
+        if len(first_names) > 1:  # Without the middle names.
+            variants.add(f"{first_names[0]} {last_name}")
+        if len(first_names) > 0 and first_name != last_name:
+            # With the first initial, e.g., "P. Iusztin". The period is required, as "a post" or "i wright"
+            # would otherwise match "Anna Post" or "Ian Wright".
+            variants.add(f"{first_names[0][0]}. {last_name}")
+
+        return {variant.strip() for variant in variants if variant.strip()}
+
+    def find_all(self, text: str) -> list[UserDocument]:
+        """Returns the authors mentioned in the text, preferring the longest name where the matches overlap."""
+
+        text = f" {_normalize_name(text)} "
+
+        matches = []
+        state = 0
+        for end, character in enumerate(text):
+            while state > 0 and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+            for length, user_id in self._outputs[state]:
+                matches.append((end - length + 1, end + 1, user_id))
+
+        # Drop the matches contained in longer ones, e.g., "Maria Smith" inside "Anna Maria Smith".
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        user_ids = []
+        covered_until = -1
+        for _start, end, user_id in matches:
+            if end <= covered_until:
+                continue
+            covered_until = max(covered_until, end)
+            if user_id not in user_ids:
+                user_ids.append(user_id)
+
+        return [self._users[user_id] for user_id in user_ids]
+
+    def match(self, text: str) -> UserDocument | None:
+        """Returns the single author mentioned in the text, or None if there is none or several of them."""
+
+        users = self.find_all(text)
+
+        return users[0] if len(users) == 1 else None
+
+    def _add_pattern(self, pattern: str, user_id: UUID) -> None:
+        state = 0
+        for character in pattern:
+            if character not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][character] = len(self._goto) - 1
+            state = self._goto[state][character]
+        self._outputs[state].append((len(pattern), user_id))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self._fail[state]
+                while fail_state > 0 and character not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(character, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+
+def _normalize_name(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(character for character in text if not unicodedata.combining(character))
+
+    return " ".join(re.findall(r"(?<!\w)[^\W\d_]\.|[^\W_]+", text.lower()))
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -20,3 +21,11 @@ class RAGStep(ABC):
     @abstractmethod
     def generate(self, query: Query, *args, **kwargs) -> Any:
         pass
+
+    async def agenerate(self, query: Query, *args, **kwargs) -> Any:
+        """
+        The async counterpart of `generate`. By default, it runs `generate` in a worker thread so it doesn't
+        block the event loop. Steps backed by async clients override it with a natively async implementation.
+        """
+
+        return await asyncio.to_thread(self.generate, query, *args, **kwargs)
@@ -1,4 +1,4 @@
-import concurrent.futures
+import asyncio
 
 import opik
 from loguru import logger
@@ -6,6 +6,7 @@ from qdrant_client.models import FieldCondition, Filter, MatchValue
 
 from llm_engineering.application import utils
 from llm_engineering.application.preprocessing.dispatchers import EmbeddingDispatcher
+from llm_engineering.domain.base import VectorBaseDocument, VectorSearchRequest
 from llm_engineering.domain.embedded_chunks import (
     EmbeddedArticleChunk,
     EmbeddedChunk,
@@ -44,12 +45,8 @@ class ContextRetriever:
             f"Successfully generated {len(n_generated_queries)} search queries.",
         )
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            search_tasks = [executor.submit(self._search, _query_model, k) for _query_model in n_generated_queries]
-
-            n_k_documents = [task.result() for task in concurrent.futures.as_completed(search_tasks)]
-            n_k_documents = utils.misc.flatten(n_k_documents)
-            n_k_documents = list(set(n_k_documents))
+        n_k_documents = self._search(n_generated_queries, k)
+        n_k_documents = list(set(n_k_documents))
 
         logger.info(f"{len(n_k_documents)} documents retrieved successfully")
 
@@ -60,12 +57,76 @@ class ContextRetriever:
 
         return k_documents
 
-    def _search(self, query: Query, k: int = 3) -> list[EmbeddedChunk]:
+    @opik.track(name="ContextRetriever.asearch")
+    async def asearch(
+        self,
+        query: str,
+        k: int = 3,
+        expand_to_n_queries: int = 3,
+    ) -> list:
+        """
+        The async counterpart of `search`, which never blocks the event loop.
+
+        The self-query and query expansion LLM calls are independent, so they are awaited concurrently, and the
+        extracted author is propagated to the expanded queries afterwards. The CPU-bound embedding and reranking
+        run in worker threads, while the vector searches are awaited on the async Qdrant client.
+        """
+
+        query_model = Query.from_str(query)
+
+        query_model, n_generated_queries = await asyncio.gather(
+            self._metadata_extractor.agenerate(query_model.model_copy()),
+            self._query_expander.agenerate(query_model, expand_to_n=expand_to_n_queries),
+        )
+        logger.info(
+            f"Successfully extracted the author_full_name = {query_model.author_full_name} from the query.",
+        )
+        logger.info(
+            f"Successfully generated {len(n_generated_queries)} search queries.",
+        )
+
+        for generated_query in n_generated_queries:
+            generated_query.author_id = query_model.author_id
+            generated_query.author_full_name = query_model.author_full_name
+
+        n_k_documents = await self._asearch(n_generated_queries, k)
+        n_k_documents = list(set(n_k_documents))
+
+        logger.info(f"{len(n_k_documents)} documents retrieved successfully")
+
+        if len(n_k_documents) > 0:
+            k_documents = await self.arerank(query, chunks=n_k_documents, keep_top_k=k)
+        else:
+            k_documents = []
+
+        return k_documents
+
+    def _search(self, queries: list[Query], k: int = 3) -> list[EmbeddedChunk]:
+        """
+        Searches the k // 3 most similar chunks of every data category for every query.
+
+        All the queries are embedded in a single call, and all the (query, data category) searches are sent
+        as one batch search per collection instead of one request each.
+        """
+
+        assert k >= 3, "k should be >= 3"
+
+        embedded_queries: list[EmbeddedQuery] = EmbeddingDispatcher.dispatch(queries)
+        retrieved_chunks = VectorBaseDocument.search_batch(self._create_search_requests(embedded_queries, k))
+
+        return utils.misc.flatten(retrieved_chunks)
+
+    async def _asearch(self, queries: list[Query], k: int = 3) -> list[EmbeddedChunk]:
         assert k >= 3, "k should be >= 3"
 
-        def _search_data_category(
-            data_category_odm: type[EmbeddedChunk], embedded_query: EmbeddedQuery
-        ) -> list[EmbeddedChunk]:
+        embedded_queries: list[EmbeddedQuery] = await asyncio.to_thread(EmbeddingDispatcher.dispatch, queries)
+        retrieved_chunks = await VectorBaseDocument.asearch_batch(self._create_search_requests(embedded_queries, k))
+
+        return utils.misc.flatten(retrieved_chunks)
+
+    def _create_search_requests(self, embedded_queries: list[EmbeddedQuery], k: int) -> list[VectorSearchRequest]:
+        search_requests = []
+        for embedded_query in embedded_queries:
             if embedded_query.author_id:
                 query_filter = Filter(
                     must=[
@@ -80,27 +141,33 @@ class ContextRetriever:
             else:
                 query_filter = None
 
-            return data_category_odm.search(
-                query_vector=embedded_query.embedding,
-                limit=k // 3,
-                query_filter=query_filter,
-            )
+            for data_category_odm in (EmbeddedPostChunk, EmbeddedArticleChunk, EmbeddedRepositoryChunk):
+                search_requests.append(
+                    VectorSearchRequest(
+                        document_class=data_category_odm,
+                        query_vector=embedded_query.embedding,
+                        limit=k // 3,
+                        query_filter=query_filter,
+                    )
+                )
 
-        embedded_query: EmbeddedQuery = EmbeddingDispatcher.dispatch(query)
+        return search_requests
 
-        post_chunks = _search_data_category(EmbeddedPostChunk, embedded_query)
-        articles_chunks = _search_data_category(EmbeddedArticleChunk, embedded_query)
-        repositories_chunks = _search_data_category(EmbeddedRepositoryChunk, embedded_query)
+    def rerank(self, query: str | Query, chunks: list[EmbeddedChunk], keep_top_k: int) -> list[EmbeddedChunk]:
+        if isinstance(query, str):
+            query = Query.from_str(query)
 
-        retrieved_chunks = post_chunks + articles_chunks + repositories_chunks
+        reranked_documents = self._reranker.generate(query=query, chunks=chunks, keep_top_k=keep_top_k)
 
-        return retrieved_chunks
+        logger.info(f"{len(reranked_documents)} documents reranked successfully.")
 
-    def rerank(self, query: str | Query, chunks: list[EmbeddedChunk], keep_top_k: int) -> list[EmbeddedChunk]:
+        return reranked_documents
+
+    async def arerank(self, query: str | Query, chunks: list[EmbeddedChunk], keep_top_k: int) -> list[EmbeddedChunk]:
         if isinstance(query, str):
             query = Query.from_str(query)
 
-        reranked_documents = self._reranker.generate(query=query, chunks=chunks, keep_top_k=keep_top_k)
+        reranked_documents = await self._reranker.agenerate(query=query, chunks=chunks, keep_top_k=keep_top_k)
 
         logger.info(f"{len(reranked_documents)} documents reranked successfully.")
 
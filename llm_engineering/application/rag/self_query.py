@@ -1,3 +1,5 @@
+import asyncio
+
 import opik
 from langchain_openai import ChatOpenAI
 from loguru import logger
@@ -5,8 +7,10 @@ from loguru import logger
 from llm_engineering.application import utils
 from llm_engineering.domain.documents import UserDocument
 from llm_engineering.domain.queries import Query
+from llm_engineering.infrastructure.db.mongo import AsyncMongoDatabaseConnector
 from llm_engineering.settings import settings
 
+from .author_directory import AuthorDirectory
 from .base import RAGStep
 from .prompt_templates import SelfQueryTemplate
 
@@ -17,20 +21,65 @@ class SelfQuery(RAGStep):
         if self._mock:
             return query
 
-        prompt = SelfQueryTemplate().create_template()
-        model = ChatOpenAI(model=settings.OPENAI_MODEL_ID, api_key=settings.OPENAI_API_KEY, temperature=0)
+        if settings.AUTHOR_DIRECTORY_ENABLED:
+            user = AuthorDirectory().match(query.content)
+            if user is not None:
+                return self._assign_author(query, user)
+
+        response = self._create_chain().invoke({"question": query})
+        user_full_name = response.content.strip("\n ")
+
+        if user_full_name == "none":
+            return query
+
+        return self._set_author(query, user_full_name)
+
+    @opik.track(name="SelfQuery.agenerate")
+    async def agenerate(self, query: Query) -> Query:
+        if self._mock:
+            return query
 
-        chain = prompt | model
+        if settings.AUTHOR_DIRECTORY_ENABLED:
+            user = await AuthorDirectory().amatch(query.content)
+            if user is not None:
+                return self._assign_author(query, user)
 
-        response = chain.invoke({"question": query})
+        response = await self._create_chain().ainvoke({"question": query})
         user_full_name = response.content.strip("\n ")
 
         if user_full_name == "none":
             return query
 
+        if not AsyncMongoDatabaseConnector.is_available():
+            # Without the async driver (e.g., installed without Poetry), the blocking lookup runs off the event loop instead.
+            return await asyncio.to_thread(self._set_author, query, user_full_name)
+
+        first_name, last_name = utils.split_user_full_name(user_full_name)
+        user = await UserDocument.aget_or_create(first_name=first_name, last_name=last_name)
+        self._remember_author(user)
+
+        return self._assign_author(query, user)
+
+    def _create_chain(self):
+        prompt = SelfQueryTemplate().create_template()
+        model = ChatOpenAI(model=settings.OPENAI_MODEL_ID, api_key=settings.OPENAI_API_KEY, temperature=0)
+
+        return prompt | model
+
+    def _set_author(self, query: Query, user_full_name: str) -> Query:
         first_name, last_name = utils.split_user_full_name(user_full_name)
         user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
+        self._remember_author(user)
+
+        return self._assign_author(query, user)
+
+    def _remember_author(self, user: UserDocument) -> None:
+        """Adds the authors found by the LLM to the directory, so the next queries mentioning them skip the LLM."""
+
+        if settings.AUTHOR_DIRECTORY_ENABLED:
+            AuthorDirectory().add(user)
 
+    def _assign_author(self, query: Query, user: UserDocument) -> Query:
         query.author_id = user.id
         query.author_full_name = user.full_name
 
@@ -1,7 +1,6 @@
+from functools import lru_cache
 from typing import Generator
 
-from transformers import AutoTokenizer
-
 from llm_engineering.settings import settings
 
 
@@ -15,7 +14,14 @@ def batch(list_: list, size: int) -> Generator[list, None, None]:
     yield from (list_[i : i + size] for i in range(0, len(list_), size))
 
 
+@lru_cache(maxsize=None)
+def get_tokenizer(model_id: str):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_id)
+
+
 def compute_num_tokens(text: str) -> int:
-    tokenizer = AutoTokenizer.from_pretrained(settings.HF_MODEL_ID)
+    tokenizer = get_tokenizer(settings.HF_MODEL_ID)
 
     return len(tokenizer.encode(text, add_special_tokens=False))
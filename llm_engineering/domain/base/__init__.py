@@ -1,4 +1,4 @@
 from .nosql import NoSQLBaseDocument
-from .vector import VectorBaseDocument
+from .vector import VectorBaseDocument, VectorSearchRequest
 
-__all__ = ["NoSQLBaseDocument", "VectorBaseDocument"]
+__all__ = ["NoSQLBaseDocument", "VectorBaseDocument", "VectorSearchRequest"]
@@ -1,20 +1,88 @@
+import asyncio
+import itertools
+import time
 import uuid
 from abc import ABC
-from typing import Generic, Type, TypeVar
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Generator, Generic, Iterable, Type, TypeVar
 
 from loguru import logger
-from pydantic import UUID4, BaseModel, Field
-from pymongo import errors
+from pydantic import UUID4, BaseModel, Field, TypeAdapter
+from pymongo import ASCENDING, IndexModel, InsertOne, ReplaceOne, UpdateOne, errors
+from pymongo.collection import Collection
 
 from llm_engineering.domain.exceptions import ImproperlyConfigured
-from llm_engineering.infrastructure.db.mongo import connection
+from llm_engineering.infrastructure.db.mongo import async_connection, connection
 from llm_engineering.settings import settings
 
-_database = connection.get_database(settings.DATABASE_NAME)
-
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
 
 T = TypeVar("T", bound="NoSQLBaseDocument")
 
+_indexes_lock = Lock()
+_indexed_collections: set[str] = set()
+
+
+class BulkWriteReport:
+    def __init__(self, collection_name: str) -> None:
+        self.collection_name = collection_name
+        self.num_documents = 0
+        self.num_inserted = 0
+        self.num_upserted = 0
+        self.num_matched = 0
+        self.num_modified = 0
+        self.failed_ids: list[str] = []
+        self.batches: list[dict] = []
+        self.elapsed_time = 0.0
+        self._lock = Lock()
+
+    @property
+    def num_batches(self) -> int:
+        return len(self.batches)
+
+    @property
+    def num_failed(self) -> int:
+        return len(self.failed_ids)
+
+    @property
+    def documents_per_second(self) -> float:
+        num_written = self.num_documents - self.num_failed
+
+        return num_written / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    @property
+    def successful(self) -> bool:
+        return self.num_failed == 0
+
+    def add_batch(self, result: dict, failed_ids: list[str]) -> None:
+        with self._lock:
+            self.num_inserted += result["num_inserted"]
+            self.num_upserted += result["num_upserted"]
+            self.num_matched += result["num_matched"]
+            self.num_modified += result["num_modified"]
+            self.failed_ids.extend(failed_ids)
+            self.batches.append(result)
+
+    def to_dict(self) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "num_documents": self.num_documents,
+            "num_batches": self.num_batches,
+            "num_inserted": self.num_inserted,
+            "num_upserted": self.num_upserted,
+            "num_matched": self.num_matched,
+            "num_modified": self.num_modified,
+            "num_failed": self.num_failed,
+            "failed_ids": self.failed_ids,
+            "batches": self.batches,
+            "elapsed_time_seconds": round(self.elapsed_time, 3),
+            "documents_per_second": round(self.documents_per_second, 3),
+        }
+
 
 class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
@@ -65,7 +133,7 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
         return dict_
 
     def save(self: T, **kwargs) -> T | None:
-        collection = _database[self.get_collection_name()]
+        collection = self._get_collection()
         try:
             collection.insert_one(self.to_mongo(**kwargs))
 
@@ -77,7 +145,7 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def get_or_create(cls: Type[T], **filter_options) -> T:
-        collection = _database[cls.get_collection_name()]
+        collection = cls._get_collection()
         try:
             instance = collection.find_one(filter_options)
             if instance:
@@ -94,19 +162,113 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def bulk_insert(cls: Type[T], documents: list[T], **kwargs) -> bool:
-        collection = _database[cls.get_collection_name()]
-        try:
-            collection.insert_many(doc.to_mongo(**kwargs) for doc in documents)
+        """
+        Inserts the documents in unordered batches, so a duplicate key only fails its own document.
 
-            return True
-        except (errors.WriteError, errors.BulkWriteError):
-            logger.error(f"Failed to insert documents of type {cls.__name__}")
+        Returns:
+            bool: Whether all the documents were inserted.
+        """
 
-            return False
+        report = cls.bulk_write(documents, upsert_keys=None, **kwargs)
+
+        return report.successful
+
+    @classmethod
+    def bulk_upsert(cls: Type[T], documents: Iterable[T], upsert_keys: tuple[str, ...] = ("_id",), **kwargs) -> bool:
+        """
+        Replaces the documents stored under the same keys, inserting the missing ones.
+
+        Returns:
+            bool: Whether all the documents were written.
+        """
+
+        report = cls.bulk_write(documents, upsert_keys=upsert_keys, **kwargs)
+
+        return report.successful
+
+    @classmethod
+    def bulk_write(
+        cls: Type[T],
+        documents: Iterable[T],
+        upsert_keys: tuple[str, ...] | None = ("_id",),
+        batch_size: int | None = None,
+        parallelism: int | None = None,
+        **kwargs,
+    ) -> BulkWriteReport:
+        """
+        Writes the documents in unordered batches, sending up to `parallelism` batches concurrently.
+
+        The documents are consumed lazily, so a generator streaming a large dump is written with only
+        `batch_size * parallelism` documents held in memory. As the batches are unordered, a failing document
+        doesn't abort the rest of its batch, and upserts make re-writing the same documents idempotent.
+
+        Args:
+            documents (Iterable[T]): The documents to write.
+            upsert_keys (tuple[str, ...] | None): The fields identifying a stored document. The matching documents
+                are replaced (or updated when the key isn't the id, keeping their id), and the missing ones inserted.
+                If None, the documents are inserted.
+            batch_size (int | None): The number of documents per request.
+                Defaults to `settings.MONGO_BULK_WRITE_BATCH_SIZE`.
+            parallelism (int | None): The number of concurrent requests.
+                Defaults to `settings.MONGO_BULK_WRITE_PARALLELISM`.
+            **kwargs: Forwarded to `to_mongo`.
+
+        Returns:
+            BulkWriteReport: The number of written and failed documents, overall and per batch.
+        """
+
+        batch_size = batch_size if batch_size is not None else settings.MONGO_BULK_WRITE_BATCH_SIZE
+        parallelism = parallelism if parallelism is not None else settings.MONGO_BULK_WRITE_PARALLELISM
+
+        assert batch_size > 0, f"'batch_size' should be greater than 0. Got {batch_size}."
+        assert parallelism > 0, f"'parallelism' should be greater than 0. Got {parallelism}."
+
+        report = BulkWriteReport(collection_name=cls.get_collection_name())
+        collection = cls._get_collection()
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            pending: deque[Future] = deque()
+            for batch in _batched(documents, batch_size):
+                data = [doc.to_mongo(**kwargs) for doc in batch]
+                ids = [str(item["_id"]) for item in data]
+                operations = [_to_write_operation(item, upsert_keys) for item in data]
+                pending.append(executor.submit(_write_batch, collection, operations, ids, report))
+                report.num_documents += len(batch)
+
+                if len(pending) >= parallelism:
+                    pending.popleft().result()
+
+            while pending:
+                pending.popleft().result()
+        report.elapsed_time = time.perf_counter() - start_time
+
+        log = logger.info if report.successful else logger.warning
+        log(
+            f"Wrote documents into '{report.collection_name}'.",
+            num_documents=report.num_documents,
+            num_inserted=report.num_inserted,
+            num_upserted=report.num_upserted,
+            num_modified=report.num_modified,
+            num_failed=report.num_failed,
+            documents_per_second=round(report.documents_per_second, 3),
+        )
+
+        return report
+
+    @classmethod
+    def bulk_delete(cls: Type[T], **filter_options) -> int:
+        collection = cls._get_collection()
+        try:
+            return collection.delete_many(filter_options).deleted_count
+        except errors.OperationFailure:
+            logger.error("Failed to delete documents")
+
+            return 0
 
     @classmethod
     def find(cls: Type[T], **filter_options) -> T | None:
-        collection = _database[cls.get_collection_name()]
+        collection = cls._get_collection()
         try:
             instance = collection.find_one(filter_options)
             if instance:
@@ -120,10 +282,108 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def bulk_find(cls: Type[T], **filter_options) -> list[T]:
-        collection = _database[cls.get_collection_name()]
         try:
-            instances = collection.find(filter_options)
-            return [document for instance in instances if (document := cls.from_mongo(instance)) is not None]
+            return list(cls.iter_find(**filter_options))
+        except errors.OperationFailure:
+            logger.error("Failed to retrieve documents")
+
+            return []
+
+    @classmethod
+    def iter_find(
+        cls: Type[T],
+        projection: list[str] | None = None,
+        batch_size: int | None = None,
+        raw: bool = False,
+        **filter_options,
+    ) -> Generator[T | dict, None, None]:
+        """
+        Streams the documents matching the filter from a cursor, holding a single batch of them in memory at a time.
+
+        Args:
+            projection (list[str] | None): The fields to fetch, besides the id. Defaults to all the fields.
+                Projected documents are built from the fetched fields only, so the other required fields are unset.
+            batch_size (int | None): The number of documents fetched per round trip.
+                Defaults to `settings.MONGO_CURSOR_BATCH_SIZE`.
+            raw (bool): Whether to yield the stored dicts as they are instead of validated documents.
+            **filter_options: The filter of the query.
+
+        Yields:
+            T | dict: The documents matching the filter.
+        """
+
+        batch_size = batch_size if batch_size is not None else settings.MONGO_CURSOR_BATCH_SIZE
+
+        collection = cls._get_collection()
+        with collection.find(filter_options, projection=projection, batch_size=batch_size) as cursor:
+            for instance in cursor:
+                if raw:
+                    yield instance
+                elif projection is not None:
+                    yield cls._from_projected_mongo(instance)
+                else:
+                    yield cls.from_mongo(instance)
+
+    @classmethod
+    def _from_projected_mongo(cls: Type[T], data: dict) -> T:
+        data = dict(data, id=data.pop("_id"))
+        values = {
+            name: _get_field_adapter(cls, name).validate_python(value)
+            for name, value in data.items()
+            if name in cls.model_fields
+        }
+
+        return cls.model_construct(_fields_set=set(values), **values)
+
+    async def asave(self: T, **kwargs) -> T | None:
+        collection = await self._aget_collection()
+        try:
+            await collection.insert_one(self.to_mongo(**kwargs))
+
+            return self
+        except errors.WriteError:
+            logger.exception("Failed to insert document.")
+
+            return None
+
+    @classmethod
+    async def aget_or_create(cls: Type[T], **filter_options) -> T:
+        collection = await cls._aget_collection()
+        try:
+            instance = await collection.find_one(filter_options)
+            if instance:
+                return cls.from_mongo(instance)
+
+            new_instance = cls(**filter_options)
+            new_instance = await new_instance.asave()
+
+            return new_instance
+        except errors.OperationFailure:
+            logger.exception(f"Failed to retrieve document with filter options: {filter_options}")
+
+            raise
+
+    @classmethod
+    async def afind(cls: Type[T], **filter_options) -> T | None:
+        collection = await cls._aget_collection()
+        try:
+            instance = await collection.find_one(filter_options)
+            if instance:
+                return cls.from_mongo(instance)
+
+            return None
+        except errors.OperationFailure:
+            logger.error("Failed to retrieve document")
+
+            return None
+
+    @classmethod
+    async def abulk_find(cls: Type[T], **filter_options) -> list[T]:
+        collection = await cls._aget_collection()
+        try:
+            cursor = collection.find(filter_options, batch_size=settings.MONGO_CURSOR_BATCH_SIZE)
+
+            return [cls.from_mongo(instance) async for instance in cursor]
         except errors.OperationFailure:
             logger.error("Failed to retrieve documents")
 
@@ -137,3 +397,116 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
             )
 
         return cls.Settings.name
+
+    @classmethod
+    def get_indexes(cls: Type[T]) -> list[IndexModel]:
+        """
+        Reads the indexes declared in the Settings class, as a list of field names or tuples of field names
+        for compound indexes, e.g., `indexes = ["link", ("first_name", "last_name")]`.
+        """
+
+        indexes = getattr(getattr(cls, "Settings", None), "indexes", [])
+
+        return [
+            IndexModel([(field, ASCENDING) for field in ((index,) if isinstance(index, str) else index)])
+            for index in indexes
+        ]
+
+    @classmethod
+    def ensure_indexes(cls: Type[T]) -> bool:
+        """
+        Creates the declared indexes that don't exist yet. It runs once per collection and process,
+        on the first access to the collection, so the lookups on the indexed fields never scan the collection.
+        If the creation fails, it is retried on the next access.
+        """
+
+        collection_name = cls.get_collection_name()
+        with _indexes_lock:
+            if collection_name in _indexed_collections:
+                return True
+
+            indexes = cls.get_indexes()
+            if len(indexes) > 0:
+                try:
+                    connection.get_database(settings.DATABASE_NAME)[collection_name].create_indexes(indexes)
+                except errors.OperationFailure:
+                    logger.exception(f"Failed to create the indexes of collection '{collection_name}'.")
+
+                    return False
+
+            _indexed_collections.add(collection_name)
+
+        return True
+
+    @classmethod
+    def _get_collection(cls: Type[T]) -> Collection:
+        cls.ensure_indexes()
+
+        return connection.get_database(settings.DATABASE_NAME)[cls.get_collection_name()]
+
+    @classmethod
+    async def _aget_collection(cls: Type[T]) -> "AsyncIOMotorCollection":
+        if cls.get_collection_name() not in _indexed_collections:
+            # The indexes are created once per process, so the blocking call is kept off the event loop.
+            await asyncio.to_thread(cls.ensure_indexes)
+
+        return async_connection.get_database(settings.DATABASE_NAME)[cls.get_collection_name()]
+
+
+def _batched(items: Iterable[Any], batch_size: int) -> Generator[list[Any], None, None]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def _to_write_operation(data: dict, upsert_keys: tuple[str, ...] | None) -> InsertOne | ReplaceOne | UpdateOne:
+    if upsert_keys is None:
+        return InsertOne(data)
+
+    key_filter = {key: data[key] for key in upsert_keys}
+    if "_id" in upsert_keys:
+        return ReplaceOne(key_filter, data, upsert=True)
+
+    # The id of a stored document is immutable, so it is only set when the document is inserted.
+    data = dict(data)
+    document_id = data.pop("_id")
+
+    return UpdateOne(key_filter, {"$set": data, "$setOnInsert": {"_id": document_id}}, upsert=True)
+
+
+def _write_batch(collection: Collection, operations: list, ids: list[str], report: BulkWriteReport) -> None:
+    start_time = time.perf_counter()
+    failed_ids = []
+    try:
+        result = collection.bulk_write(operations, ordered=False).bulk_api_result
+    except errors.BulkWriteError as e:
+        result = e.details
+        failed_ids = [ids[error["index"]] for error in result.get("writeErrors", [])]
+
+        logger.warning(
+            f"Failed to write {len(failed_ids)} documents in '{collection.name}'.",
+            errors=[error.get("errmsg") for error in result.get("writeErrors", [])[:5]],
+        )
+    except errors.PyMongoError:
+        logger.exception(f"Failed to write a batch of {len(operations)} documents in '{collection.name}'.")
+
+        result = {}
+        failed_ids = list(ids)
+
+    report.add_batch(
+        {
+            "num_operations": len(operations),
+            "num_inserted": result.get("nInserted", 0),
+            "num_upserted": result.get("nUpserted", 0),
+            "num_matched": result.get("nMatched", 0),
+            "num_modified": result.get("nModified", 0),
+            "num_failed": len(failed_ids),
+            "elapsed_time_seconds": round(time.perf_counter() - start_time, 3),
+        },
+        failed_ids,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_field_adapter(document_class: type[NoSQLBaseDocument], field_name: str) -> TypeAdapter:
+    return TypeAdapter(document_class.model_fields[field_name].annotation)
@@ -1,22 +1,140 @@
+import asyncio
+import hashlib
+import json
+import queue
+import threading
+import time
+import types
+import typing
 import uuid
 from abc import ABC
-from typing import Any, Callable, Dict, Generic, Type, TypeVar
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generator, Generic, Type, TypeVar
 from uuid import UUID
 
 import numpy as np
 from loguru import logger
-from pydantic import UUID4, BaseModel, Field
+from pydantic import UUID4, BaseModel, Field, PlainValidator, TypeAdapter
 from qdrant_client.http import exceptions
 from qdrant_client.http.models import Distance, VectorParams
-from qdrant_client.models import CollectionInfo, PointStruct, Record
+from qdrant_client.models import (
+    Batch,
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionInfo,
+    CollectionParamsDiff,
+    Filter,
+    FilterSelector,
+    HnswConfigDiff,
+    PayloadSchemaType,
+    PointStruct,
+    QuantizationSearchParams,
+    Record,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
+    VectorParamsDiff,
+)
 
-from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton
 from llm_engineering.domain.exceptions import ImproperlyConfigured
 from llm_engineering.domain.types import DataCategory
-from llm_engineering.infrastructure.db.qdrant import connection
+from llm_engineering.infrastructure.db.qdrant import async_connection, connection
+from llm_engineering.settings import settings
 
 T = TypeVar("T", bound="VectorBaseDocument")
 
+# Every point stores a hash of its payload and vector under this key, so rewriting unchanged points can be skipped.
+FINGERPRINT_PAYLOAD_KEY = "_fingerprint"
+
+# Scroll pages are resized to keep every request around this latency.
+_SCROLL_TARGET_PAGE_SECONDS = 0.5
+
+
+class BulkIngestReport:
+    def __init__(self, collection_name: str) -> None:
+        self.collection_name = collection_name
+        self.num_points = 0
+        self.num_batches = 0
+        self.num_retries = 0
+        self.num_skipped = 0
+        self.failed_ids: list[str] = []
+        self.elapsed_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def num_failed(self) -> int:
+        return len(self.failed_ids)
+
+    @property
+    def num_written(self) -> int:
+        return self.num_points - self.num_skipped - self.num_failed
+
+    @property
+    def points_per_second(self) -> float:
+        num_ingested = self.num_points - self.num_failed
+
+        return num_ingested / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    @property
+    def successful(self) -> bool:
+        return self.num_failed == 0
+
+    def add_batch(self, num_skipped: int, num_retries: int, failed_ids: list[str]) -> None:
+        with self._lock:
+            self.num_skipped += num_skipped
+            self.num_retries += num_retries
+            self.failed_ids.extend(failed_ids)
+
+    def to_dict(self) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "num_points": self.num_points,
+            "num_batches": self.num_batches,
+            "num_retries": self.num_retries,
+            "num_skipped": self.num_skipped,
+            "num_written": self.num_written,
+            "num_failed": self.num_failed,
+            "failed_ids": self.failed_ids,
+            "elapsed_time_seconds": round(self.elapsed_time, 3),
+            "points_per_second": round(self.points_per_second, 3),
+        }
+
+
+class VectorSearchRequest:
+    """
+    A single vector search against the collection of `document_class`, used to batch many searches together.
+    """
+
+    def __init__(
+        self,
+        document_class: type["VectorBaseDocument"],
+        query_vector: list[float] | np.ndarray,
+        limit: int = 10,
+        query_filter: Filter | None = None,
+    ) -> None:
+        self.document_class = document_class
+        self.query_vector = query_vector
+        self.limit = limit
+        self.query_filter = query_filter
+
+    def to_search_request(self) -> SearchRequest:
+        query_vector = self.query_vector
+        if isinstance(query_vector, np.ndarray):
+            query_vector = query_vector.tolist()
+
+        return SearchRequest(
+            vector=query_vector,
+            filter=self.query_filter,
+            limit=self.limit,
+            params=self.document_class.get_search_params(),
+            with_payload=True,
+            with_vector=False,
+        )
+
 
 class VectorBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
@@ -32,17 +150,71 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def from_record(cls: Type[T], point: Record) -> T:
-        _id = UUID(point.id, version=4)
-        payload = point.payload or {}
+        return cls.from_records([point])[0]
+
+    @classmethod
+    def from_records(cls: Type[T], points: list[Record]) -> list[T]:
+        """
+        Builds the documents of a page of points returned by Qdrant.
+
+        The points are validated with a single call to a validator compiled once per class, with the ids
+        parsed by pydantic-core instead of in Python.
+
+        Points read with a payload projection (e.g., `with_payload=["content"]`) are missing required fields,
+        so they are built like `model_construct` does: only the projected fields are hydrated, and the
+        others are left unset.
+
+        Args:
+            points (list[Record]): The points to convert.
+
+        Returns:
+            list[VectorBaseDocument]: The documents, in the same order as the points.
+        """
+
+        has_embedding = "embedding" in cls.model_fields
+        required_fields = _get_required_fields(cls)
+
+        attributes = []
+        projected_indices = []
+        for i, point in enumerate(points):
+            point_attributes = dict(point.payload or {})
+            point_attributes["id"] = point.id
+            if has_embedding:
+                point_attributes["embedding"] = point.vector or None
+
+            attributes.append(point_attributes)
+            if not required_fields <= point_attributes.keys():
+                projected_indices.append(i)
+
+        if not projected_indices:
+            return _get_batch_validator(cls).validate_python(attributes)
+
+        projected_indices = set(projected_indices)
+        validated = iter(
+            _get_batch_validator(cls).validate_python(
+                [item for i, item in enumerate(attributes) if i not in projected_indices]
+            )
+        )
 
-        attributes = {
-            "id": _id,
-            **payload,
+        return [
+            cls._construct_projected(item) if i in projected_indices else next(validated)
+            for i, item in enumerate(attributes)
+        ]
+
+    @classmethod
+    def _construct_projected(cls: Type[T], attributes: dict) -> T:
+        """
+        Builds a document with `model_construct`, after converting the fields stored in a serialized form
+        (the UUIDs and the embeddings). The missing fields get their default values, if any.
+        """
+
+        values = {
+            name: converter(attributes[name]) if attributes[name] is not None else None
+            for name, converter in _get_field_converters(cls).items()
+            if name in attributes
         }
-        if cls._has_class_attribute("embedding"):
-            attributes["embedding"] = point.vector or None
 
-        return cls(**attributes)
+        return cls.model_construct(_fields_set=set(values), **values)
 
     def to_point(self: T, **kwargs) -> PointStruct:
         exclude_unset = kwargs.pop("exclude_unset", False)
@@ -52,10 +224,38 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
         _id = str(payload.pop("id"))
         vector = payload.pop("embedding", {})
-        if vector and isinstance(vector, np.ndarray):
+        if isinstance(vector, np.ndarray):
             vector = vector.tolist()
+        payload[FINGERPRINT_PAYLOAD_KEY] = compute_fingerprint(payload, vector)
+
+        return PointStruct(id=_id, vector=vector or {}, payload=payload)
+
+    @classmethod
+    def to_batch(cls: Type[T], documents: list[T], **kwargs) -> Batch:
+        """
+        Converts the documents into a single columnar batch, stacking their embeddings into one float32 matrix.
 
-        return PointStruct(id=_id, vector=vector, payload=payload)
+        The matrix is converted to the wire format in one vectorized call, instead of serializing every vector
+        (and creating a Python float for every value) as the documents travel through the pipeline.
+        """
+
+        exclude_unset = kwargs.pop("exclude_unset", False)
+        by_alias = kwargs.pop("by_alias", True)
+
+        ids = []
+        payloads = []
+        for document in documents:
+            payload = document.model_dump(
+                exclude_unset=exclude_unset, by_alias=by_alias, exclude={"embedding"}, **kwargs
+            )
+            ids.append(str(payload.pop("id")))
+            payloads.append(payload)
+
+        vectors = np.stack([document.embedding for document in documents]).astype(np.float32, copy=False)
+        for payload, vector in zip(payloads, vectors, strict=True):
+            payload[FINGERPRINT_PAYLOAD_KEY] = compute_fingerprint(payload, vector)
+
+        return Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads)
 
     def model_dump(self: T, **kwargs) -> dict:
         dict_ = super().model_dump(**kwargs)
@@ -77,9 +277,21 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         return item
 
     @classmethod
-    def bulk_insert(cls: Type[T], documents: list["VectorBaseDocument"]) -> bool:
+    def bulk_insert(cls: Type[T], documents: list["VectorBaseDocument"], delta: bool = False) -> bool:
+        """
+        Upserts the documents in a single request, creating the collection if it doesn't exist.
+
+        Args:
+            documents (list[VectorBaseDocument]): The documents to upsert.
+            delta (bool): Whether to only write the documents that are new or changed, by comparing their
+                fingerprint with the one of the points already stored under the same ids.
+
+        Returns:
+            bool: Whether the documents were inserted.
+        """
+
         try:
-            cls._bulk_insert(documents)
+            num_skipped = cls._bulk_insert(documents, delta=delta)
         except exceptions.UnexpectedResponse:
             logger.info(
                 f"Collection '{cls.get_collection_name()}' does not exist. Trying to create the collection and reinsert the documents."
@@ -88,19 +300,214 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             cls.create_collection()
 
             try:
-                cls._bulk_insert(documents)
+                num_skipped = cls._bulk_insert(documents, delta=delta)
             except exceptions.UnexpectedResponse:
                 logger.error(f"Failed to insert documents in '{cls.get_collection_name()}'.")
 
                 return False
 
+        if num_skipped > 0:
+            logger.info(f"Skipped {num_skipped} unchanged documents in '{cls.get_collection_name()}'.")
+
         return True
 
     @classmethod
-    def _bulk_insert(cls: Type[T], documents: list["VectorBaseDocument"]) -> None:
-        points = [doc.to_point() for doc in documents]
+    def bulk_ingest(
+        cls: Type[T],
+        documents: list["VectorBaseDocument"],
+        batch_size: int | None = None,
+        parallelism: int | None = None,
+        wait: bool | None = None,
+        max_retries: int | None = None,
+        backoff: float = 0.5,
+        delta: bool | None = None,
+    ) -> BulkIngestReport:
+        """
+        Upserts the documents in batches, keeping up to `parallelism` requests in flight.
+
+        A failing batch is retried with exponential backoff. If it still fails, its ids are reported as
+        failed instead of aborting the whole ingestion. The arguments left to None default to the
+        QDRANT_INGEST_* settings, read at call time to keep importing the domain free of side effects.
+
+        Args:
+            documents (list[VectorBaseDocument]): The documents to upsert.
+            batch_size (int | None): The number of points sent per request.
+            parallelism (int | None): The maximum number of concurrent requests.
+            wait (bool | None): Whether every request waits for the points to be applied, or only for them to be
+                received by the server.
+            max_retries (int | None): The number of retries of a failing batch.
+            backoff (float): The delay before the first retry, in seconds. It doubles on every retry.
+            delta (bool | None): Whether to skip the documents already stored with the same fingerprint,
+                so re-ingesting unchanged documents costs one bulk retrieve per batch instead of a rewrite.
+
+        Returns:
+            BulkIngestReport: The throughput of the ingestion, the number of unchanged documents that were skipped,
+                and the ids of the documents that failed.
+        """
+
+        batch_size = batch_size if batch_size is not None else settings.QDRANT_INGEST_BATCH_SIZE
+        parallelism = parallelism if parallelism is not None else settings.QDRANT_INGEST_PARALLELISM
+        wait = wait if wait is not None else settings.QDRANT_INGEST_WAIT
+        max_retries = max_retries if max_retries is not None else settings.QDRANT_INGEST_MAX_RETRIES
+        delta = delta if delta is not None else settings.QDRANT_INGEST_DELTA
+
+        assert batch_size > 0, f"'batch_size' should be greater than 0. Got {batch_size}."
+        assert parallelism > 0, f"'parallelism' should be greater than 0. Got {parallelism}."
+
+        report = BulkIngestReport(collection_name=cls.get_collection_name())
+        if len(documents) == 0:
+            return report
+
+        cls.get_or_create_collection()
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            pending: deque[Future] = deque()
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                pending.append(executor.submit(cls._ingest_batch, batch, wait, max_retries, backoff, delta, report))
+                report.num_points += len(batch)
+                report.num_batches += 1
+
+                if len(pending) >= parallelism:
+                    pending.popleft().result()
+
+            while pending:
+                pending.popleft().result()
+        report.elapsed_time = time.perf_counter() - start_time
+
+        log = logger.info if report.successful else logger.warning
+        log(
+            f"Ingested documents into '{report.collection_name}'.",
+            num_points=report.num_points,
+            num_skipped=report.num_skipped,
+            num_failed=report.num_failed,
+            num_retries=report.num_retries,
+            points_per_second=round(report.points_per_second, 3),
+        )
+
+        return report
+
+    @classmethod
+    def _ingest_batch(
+        cls: Type[T],
+        documents: list["VectorBaseDocument"],
+        wait: bool,
+        max_retries: int,
+        backoff: float,
+        delta: bool,
+        report: BulkIngestReport,
+    ) -> None:
+        # The batches run on the threads of the pool, so the report is updated once per batch, under its lock.
+        for attempt in range(max_retries + 1):
+            try:
+                num_skipped = cls._bulk_insert(documents, wait=wait, delta=delta)
+                report.add_batch(num_skipped=num_skipped, num_retries=attempt, failed_ids=[])
+
+                return
+            except Exception:
+                if attempt == max_retries:
+                    logger.exception(
+                        f"Failed to insert a batch of {len(documents)} documents in '{cls.get_collection_name()}'."
+                    )
+
+                    report.add_batch(
+                        num_skipped=0, num_retries=attempt, failed_ids=[str(document.id) for document in documents]
+                    )
+
+                    return
+
+                time.sleep(backoff * 2**attempt)
+
+    @classmethod
+    def _bulk_insert(
+        cls: Type[T], documents: list["VectorBaseDocument"], wait: bool = True, delta: bool = False
+    ) -> int:
+        """
+        Returns:
+            int: The number of unchanged documents that were skipped in delta mode.
+        """
+
+        has_embeddings = cls._has_class_attribute("embedding") and all(
+            getattr(doc, "embedding", None) is not None for doc in documents
+        )
+        if has_embeddings and len(documents) > 0:
+            points = cls.to_batch(documents)
+        else:
+            points = [doc.to_point() for doc in documents]
+
+        num_skipped = 0
+        if delta and len(documents) > 0:
+            points, num_skipped = cls._drop_unchanged_points(points)
+
+        if num_skipped < len(documents):
+            connection.upsert(collection_name=cls.get_collection_name(), points=points, wait=wait)
+
+        return num_skipped
+
+    @classmethod
+    def _drop_unchanged_points(
+        cls: Type[T], points: Batch | list[PointStruct]
+    ) -> tuple[Batch | list[PointStruct], int]:
+        if isinstance(points, Batch):
+            ids, payloads = points.ids, points.payloads
+        else:
+            ids, payloads = [point.id for point in points], [point.payload for point in points]
+
+        # Only the fingerprints are fetched, so the check costs a fraction of rewriting the points.
+        existing_records = connection.retrieve(
+            collection_name=cls.get_collection_name(),
+            ids=ids,
+            with_payload=[FINGERPRINT_PAYLOAD_KEY],
+            with_vectors=False,
+        )
+        existing_fingerprints = {
+            str(record.id): (record.payload or {}).get(FINGERPRINT_PAYLOAD_KEY) for record in existing_records
+        }
+
+        changed = [
+            i
+            for i, (point_id, payload) in enumerate(zip(ids, payloads, strict=True))
+            if existing_fingerprints.get(str(point_id)) != payload[FINGERPRINT_PAYLOAD_KEY]
+        ]
+        num_skipped = len(ids) - len(changed)
+        if num_skipped == 0:
+            return points, 0
+
+        if isinstance(points, Batch):
+            points = Batch(
+                ids=[points.ids[i] for i in changed],
+                vectors=[points.vectors[i] for i in changed],
+                payloads=[points.payloads[i] for i in changed],
+            )
+        else:
+            points = [points[i] for i in changed]
 
-        connection.upsert(collection_name=cls.get_collection_name(), points=points)
+        return points, num_skipped
+
+    @classmethod
+    def bulk_delete(cls: Type[T], points_filter: Filter) -> int:
+        """
+        Deletes the points matching the filter, e.g., the stale chunks of a re-chunked document.
+
+        Args:
+            points_filter (Filter): Selects the points to delete.
+
+        Returns:
+            int: The number of deleted points.
+        """
+
+        collection_name = cls.get_collection_name()
+        try:
+            num_points = connection.count(collection_name=collection_name, count_filter=points_filter, exact=True).count
+            if num_points > 0:
+                connection.delete(collection_name=collection_name, points_selector=FilterSelector(filter=points_filter))
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to delete documents from '{collection_name}'.")
+
+            return 0
+
+        return num_points
 
     @classmethod
     def bulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
@@ -128,12 +535,158 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             offset=offset,
             **kwargs,
         )
-        documents = [cls.from_record(record) for record in records]
+        documents = cls.from_records(records)
         if next_offset is not None:
             next_offset = UUID(next_offset, version=4)
 
         return documents, next_offset
 
+    @classmethod
+    def iter_all(
+        cls: Type[T],
+        page_size: int | None = None,
+        payload_fields: list[str] | None = None,
+        with_vectors: bool = False,
+        scroll_filter: Filter | None = None,
+        parallelism: int | None = None,
+    ) -> Generator[T, None, None]:
+        """
+        Lazily iterates over all the documents of the collection.
+
+        The page size adapts to the latency of the scroll requests: it doubles while a page comes back quickly
+        and halves when it is slow, between QDRANT_SCROLL_MIN_PAGE_SIZE and QDRANT_SCROLL_MAX_PAGE_SIZE.
+        With `parallelism` > 1, the id space is split into disjoint ranges scanned concurrently, so the
+        documents are no longer yielded in id order. The arguments left to None default to the QDRANT_SCROLL_*
+        settings, read at call time.
+
+        Args:
+            page_size (int | None): The initial number of points fetched per request.
+            payload_fields (list[str] | None): The payload fields to fetch. If None, the whole payload is fetched.
+                Otherwise, only the projected fields of the documents are set.
+            with_vectors (bool): Whether to fetch the vectors.
+            scroll_filter (Filter | None): Only iterates over the points matching this filter.
+            parallelism (int | None): The number of id ranges scanned concurrently.
+
+        Yields:
+            VectorBaseDocument: The documents of the collection.
+        """
+
+        page_size = page_size if page_size is not None else settings.QDRANT_SCROLL_PAGE_SIZE
+        parallelism = parallelism if parallelism is not None else settings.QDRANT_SCROLL_PARALLELISM
+
+        assert page_size > 0, f"'page_size' should be greater than 0. Got {page_size}."
+        assert parallelism > 0, f"'parallelism' should be greater than 0. Got {parallelism}."
+
+        scan_kwargs = {
+            "page_size": page_size,
+            "min_page_size": min(page_size, settings.QDRANT_SCROLL_MIN_PAGE_SIZE),
+            "max_page_size": max(page_size, settings.QDRANT_SCROLL_MAX_PAGE_SIZE),
+            "with_payload": payload_fields if payload_fields is not None else True,
+            "with_vectors": with_vectors,
+            "scroll_filter": scroll_filter,
+        }
+
+        if parallelism == 1:
+            for page in cls._scan_id_range(start=None, end=None, **scan_kwargs):
+                yield from page
+
+            return
+
+        pages: queue.Queue = queue.Queue(maxsize=2 * parallelism)
+        stop_event = threading.Event()
+        errors: list[Exception] = []
+
+        def _scan(start: str | None, end: str | None) -> None:
+            try:
+                for page in cls._scan_id_range(start=start, end=end, **scan_kwargs):
+                    if not _put(pages, page, stop_event):
+                        return
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+            finally:
+                _put(pages, None, stop_event)
+
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            for start, end in _split_id_space(parallelism):
+                executor.submit(_scan, start, end)
+
+            try:
+                num_finished = 0
+                while num_finished < parallelism and not stop_event.is_set():
+                    try:
+                        page = pages.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+
+                    if page is None:
+                        num_finished += 1
+                    else:
+                        yield from page
+            finally:
+                # Also unblocks the scans when the consumer stops iterating early.
+                stop_event.set()
+
+        if errors:
+            raise errors[0]
+
+    @classmethod
+    def _scan_id_range(
+        cls: Type[T],
+        start: str | None,
+        end: str | None,
+        page_size: int,
+        min_page_size: int,
+        max_page_size: int,
+        with_payload: bool | list[str],
+        with_vectors: bool,
+        scroll_filter: Filter | None,
+    ) -> Generator[list[T], None, None]:
+        collection_name = cls.get_collection_name()
+
+        offset = start
+        is_first_page = True
+        while True:
+            start_time = time.perf_counter()
+            try:
+                records, next_offset = connection.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=with_payload,
+                    with_vectors=with_vectors,
+                )
+            except exceptions.UnexpectedResponse as e:
+                # Only a missing collection is treated as empty. A failure after the first page would silently
+                # truncate the scan, so it is raised.
+                if is_first_page and e.status_code == 404:
+                    logger.error(f"Failed to scroll documents in '{collection_name}'.")
+
+                    return
+
+                raise
+            elapsed_time = time.perf_counter() - start_time
+
+            if end is not None:
+                # The canonical string form of the UUIDs sorts like the ids themselves.
+                records = [record for record in records if str(record.id) < end]
+                if next_offset is not None and str(next_offset) >= end:
+                    next_offset = None
+
+            if records:
+                yield cls.from_records(records)
+
+            if next_offset is None:
+                return
+
+            offset = next_offset
+            is_first_page = False
+            if elapsed_time < _SCROLL_TARGET_PAGE_SECONDS / 2:
+                page_size = min(2 * page_size, max_page_size)
+            elif elapsed_time > _SCROLL_TARGET_PAGE_SECONDS:
+                page_size = max(page_size // 2, min_page_size)
+
     @classmethod
     def search(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
         try:
@@ -154,18 +707,166 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             limit=limit,
             with_payload=kwargs.pop("with_payload", True),
             with_vectors=kwargs.pop("with_vectors", False),
+            search_params=kwargs.pop("search_params", cls.get_search_params()),
             **kwargs,
         )
-        documents = [cls.from_record(record) for record in records]
+        documents = cls.from_records(records)
 
         return documents
 
+    @staticmethod
+    def search_batch(requests: list[VectorSearchRequest]) -> list[list["VectorBaseDocument"]]:
+        """
+        Runs many searches, possibly against different collections, in as few round trips as possible:
+        the requests are grouped into one batch search per collection, and the collections are queried concurrently.
+
+        Args:
+            requests (list[VectorSearchRequest]): The searches to run.
+
+        Returns:
+            list[list[VectorBaseDocument]]: The documents found by every request, in the same order as the requests.
+                The requests against a collection that failed to be searched get no documents.
+        """
+
+        results: list[list[VectorBaseDocument]] = [[] for _ in requests]
+
+        def _search_collection(document_class: type[VectorBaseDocument], indices: list[int]) -> None:
+            collection_name = document_class.get_collection_name()
+            try:
+                responses = connection.search_batch(
+                    collection_name=collection_name,
+                    requests=[requests[i].to_search_request() for i in indices],
+                )
+            except exceptions.UnexpectedResponse:
+                logger.error(f"Failed to search documents in '{collection_name}'.")
+
+                return
+
+            for i, records in zip(indices, responses, strict=True):
+                results[i] = document_class.from_records(records)
+
+        grouped_indices = VectorBaseDocument._group_by(
+            list(range(len(requests))), selector=lambda i: requests[i].document_class
+        )
+        if len(grouped_indices) <= 1:
+            for document_class, indices in grouped_indices.items():
+                _search_collection(document_class, indices)
+        else:
+            with ThreadPoolExecutor(max_workers=len(grouped_indices)) as executor:
+                futures = [
+                    executor.submit(_search_collection, document_class, indices)
+                    for document_class, indices in grouped_indices.items()
+                ]
+                for future in futures:
+                    future.result()
+
+        return results
+
+    @classmethod
+    async def abulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
+        try:
+            documents, next_offset = await cls._abulk_find(limit=limit, **kwargs)
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
+
+            documents, next_offset = [], None
+
+        return documents, next_offset
+
+    @classmethod
+    async def _abulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
+        collection_name = cls.get_collection_name()
+
+        offset = kwargs.pop("offset", None)
+        offset = str(offset) if offset else None
+
+        records, next_offset = await async_connection.scroll(
+            collection_name=collection_name,
+            limit=limit,
+            with_payload=kwargs.pop("with_payload", True),
+            with_vectors=kwargs.pop("with_vectors", False),
+            offset=offset,
+            **kwargs,
+        )
+        documents = cls.from_records(records)
+        if next_offset is not None:
+            next_offset = UUID(next_offset, version=4)
+
+        return documents, next_offset
+
+    @classmethod
+    async def asearch(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
+        try:
+            documents = await cls._asearch(query_vector=query_vector, limit=limit, **kwargs)
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
+
+            documents = []
+
+        return documents
+
+    @classmethod
+    async def _asearch(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
+        collection_name = cls.get_collection_name()
+        records = await async_connection.search(
+            collection_name=collection_name,
+            query_vector=query_vector,
+            limit=limit,
+            with_payload=kwargs.pop("with_payload", True),
+            with_vectors=kwargs.pop("with_vectors", False),
+            search_params=kwargs.pop("search_params", cls.get_search_params()),
+            **kwargs,
+        )
+        documents = cls.from_records(records)
+
+        return documents
+
+    @staticmethod
+    async def asearch_batch(requests: list[VectorSearchRequest]) -> list[list["VectorBaseDocument"]]:
+        """
+        The async counterpart of `search_batch`: the batch search of every collection is awaited concurrently
+        on the event loop, instead of blocking a thread per collection.
+
+        Args:
+            requests (list[VectorSearchRequest]): The searches to run.
+
+        Returns:
+            list[list[VectorBaseDocument]]: The documents found by every request, in the same order as the requests.
+                The requests against a collection that failed to be searched get no documents.
+        """
+
+        results: list[list[VectorBaseDocument]] = [[] for _ in requests]
+
+        async def _search_collection(document_class: type[VectorBaseDocument], indices: list[int]) -> None:
+            collection_name = document_class.get_collection_name()
+            try:
+                responses = await async_connection.search_batch(
+                    collection_name=collection_name,
+                    requests=[requests[i].to_search_request() for i in indices],
+                )
+            except exceptions.UnexpectedResponse:
+                logger.error(f"Failed to search documents in '{collection_name}'.")
+
+                return
+
+            for i, records in zip(indices, responses, strict=True):
+                results[i] = document_class.from_records(records)
+
+        grouped_indices = VectorBaseDocument._group_by(
+            list(range(len(requests))), selector=lambda i: requests[i].document_class
+        )
+        await asyncio.gather(
+            *(_search_collection(document_class, indices) for document_class, indices in grouped_indices.items())
+        )
+
+        return results
+
     @classmethod
     def get_or_create_collection(cls: Type[T]) -> CollectionInfo:
         collection_name = cls.get_collection_name()
 
         try:
-            return connection.get_collection(collection_name=collection_name)
+            collection_info = connection.get_collection(collection_name=collection_name)
         except exceptions.UnexpectedResponse:
             use_vector_index = cls.get_use_vector_index()
 
@@ -177,6 +878,13 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
             return connection.get_collection(collection_name=collection_name)
 
+        collection_updated = cls._update_collection_config(collection_info)
+        indexes_created = cls._create_payload_indexes(collection_name, existing_indexes=collection_info.payload_schema)
+        if collection_updated or indexes_created:
+            collection_info = connection.get_collection(collection_name=collection_name)
+
+        return collection_info
+
     @classmethod
     def create_collection(cls: Type[T]) -> bool:
         collection_name = cls.get_collection_name()
@@ -187,11 +895,152 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
     @classmethod
     def _create_collection(cls, collection_name: str, use_vector_index: bool = True) -> bool:
         if use_vector_index is True:
-            vectors_config = VectorParams(size=EmbeddingModelSingleton().embedding_size, distance=Distance.COSINE)
+            from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton
+
+            vectors_config = VectorParams(
+                size=EmbeddingModelSingleton().embedding_size,
+                distance=Distance.COSINE,
+                on_disk=cls._get_config_option("on_disk"),
+                datatype=cls._get_config_option("vector_datatype"),
+            )
+            quantization_config = cls.get_quantization_config()
         else:
             vectors_config = {}
+            quantization_config = None
+
+        collection_created = connection.create_collection(
+            collection_name=collection_name,
+            vectors_config=vectors_config,
+            hnsw_config=cls.get_hnsw_config(),
+            quantization_config=quantization_config,
+            on_disk_payload=cls._get_config_option("on_disk_payload"),
+        )
+        if collection_created:
+            cls._create_payload_indexes(collection_name)
+
+        return collection_created
+
+    @classmethod
+    def _create_payload_indexes(cls: Type[T], collection_name: str, existing_indexes: dict | None = None) -> bool:
+        """
+        Creates the payload indexes declared in the Config class that don't exist yet, so filtered searches
+        (e.g., on author_id) don't degrade to scanning the payloads as the collection grows.
+
+        Returns:
+            bool: Whether any index was created.
+        """
+
+        existing_indexes = existing_indexes or {}
+
+        indexes_created = False
+        for field_name, field_schema in cls.get_payload_indexes().items():
+            if field_name in existing_indexes:
+                continue
+
+            connection.create_payload_index(
+                collection_name=collection_name, field_name=field_name, field_schema=field_schema
+            )
+            indexes_created = True
+
+            logger.info(f"Created payload index on '{field_name}' in '{collection_name}'.", field_schema=field_schema)
 
-        return connection.create_collection(collection_name=collection_name, vectors_config=vectors_config)
+        return indexes_created
+
+    @classmethod
+    def get_payload_indexes(cls: Type[T]) -> dict[str, PayloadSchemaType]:
+        payload_indexes = cls._get_config_option("payload_indexes", {})
+        try:
+            return {field_name: PayloadSchemaType(field_schema) for field_name, field_schema in payload_indexes.items()}
+        except ValueError as e:
+            raise ImproperlyConfigured(f"Invalid payload index type in {cls.__name__}.Config: {e}") from e
+
+    @classmethod
+    def _update_collection_config(cls: Type[T], collection_info: CollectionInfo) -> bool:
+        """
+        Applies the index parameters declared in the Config class that differ from the ones of an existing collection.
+        The vector datatype can't be changed after the collection is created, so it is left untouched.
+
+        Returns:
+            bool: Whether the collection was updated.
+        """
+
+        config = collection_info.config
+        updates = {}
+
+        hnsw_config = cls.get_hnsw_config()
+        if hnsw_config is not None and (
+            (hnsw_config.m is not None and hnsw_config.m != config.hnsw_config.m)
+            or (hnsw_config.ef_construct is not None and hnsw_config.ef_construct != config.hnsw_config.ef_construct)
+        ):
+            updates["hnsw_config"] = hnsw_config
+
+        quantization_config = cls.get_quantization_config()
+        if quantization_config is not None and not isinstance(config.quantization_config, type(quantization_config)):
+            updates["quantization_config"] = quantization_config
+
+        on_disk = cls._get_config_option("on_disk")
+        if on_disk is not None and isinstance(config.params.vectors, VectorParams):
+            if bool(config.params.vectors.on_disk) != on_disk:
+                updates["vectors_config"] = {"": VectorParamsDiff(on_disk=on_disk)}
+
+        on_disk_payload = cls._get_config_option("on_disk_payload")
+        if on_disk_payload is not None and config.params.on_disk_payload != on_disk_payload:
+            updates["collection_params"] = CollectionParamsDiff(on_disk_payload=on_disk_payload)
+
+        if not updates:
+            return False
+
+        collection_name = cls.get_collection_name()
+        logger.info(f"Updating the configuration of collection '{collection_name}'.", updates=list(updates))
+
+        return connection.update_collection(collection_name=collection_name, **updates)
+
+    @classmethod
+    def get_hnsw_config(cls: Type[T]) -> HnswConfigDiff | None:
+        m = cls._get_config_option("hnsw_m")
+        ef_construct = cls._get_config_option("hnsw_ef_construct")
+        if m is None and ef_construct is None:
+            return None
+
+        return HnswConfigDiff(m=m, ef_construct=ef_construct)
+
+    @classmethod
+    def get_quantization_config(cls: Type[T]) -> ScalarQuantization | BinaryQuantization | None:
+        quantization = cls._get_config_option("quantization")
+        always_ram = cls._get_config_option("quantization_always_ram", True)
+        if quantization is None:
+            return None
+        elif quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+            )
+        elif quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+        else:
+            raise ImproperlyConfigured(f"Unsupported quantization '{quantization}'. Use 'scalar' or 'binary'.")
+
+    @classmethod
+    def get_search_params(cls: Type[T]) -> SearchParams | None:
+        hnsw_ef = cls._get_config_option("hnsw_ef")
+        if cls._get_config_option("quantization") is not None:
+            quantization_params = QuantizationSearchParams(
+                rescore=cls._get_config_option("quantization_rescore", True),
+                oversampling=cls._get_config_option("quantization_oversampling"),
+            )
+        else:
+            quantization_params = None
+
+        if hnsw_ef is None and quantization_params is None:
+            return None
+
+        return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization_params)
+
+    @classmethod
+    def _get_config_option(cls: Type[T], name: str, default: Any = None) -> Any:
+        if not hasattr(cls, "Config"):
+            return default
+
+        return getattr(cls.Config, name, default)
 
     @classmethod
     def get_category(cls: Type[T]) -> DataCategory:
@@ -267,3 +1116,96 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
                 return True
 
         return False
+
+
+def compute_fingerprint(payload: dict, vector: np.ndarray | list[float] | None) -> str:
+    """
+    Hashes the payload (without its fingerprint) and the float32 vector of a point.
+    """
+
+    hasher = hashlib.md5()
+    hasher.update(
+        json.dumps(
+            {key: value for key, value in payload.items() if key != FINGERPRINT_PAYLOAD_KEY},
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+    if vector is not None and len(vector) > 0:
+        hasher.update(np.asarray(vector, dtype=np.float32).tobytes())
+
+    return hasher.hexdigest()
+
+
+def _split_id_space(num_ranges: int) -> list[tuple[str | None, str | None]]:
+    """
+    Splits the UUID space into `num_ranges` contiguous ranges of the same size, as (start, end) pairs of ids.
+    The first range has no start and the last one has no end.
+    """
+
+    boundaries = [str(UUID(int=i * 2**128 // num_ranges)) for i in range(1, num_ranges)]
+
+    return list(zip([None, *boundaries], [*boundaries, None], strict=True))
+
+
+def _put(output_queue: queue.Queue, item: Any, stop_event: threading.Event) -> bool:
+    while not stop_event.is_set():
+        try:
+            output_queue.put(item, timeout=0.1)
+
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+@lru_cache
+def _get_batch_validator(document_class: type[VectorBaseDocument]) -> TypeAdapter:
+    return TypeAdapter(list[document_class])
+
+
+@lru_cache
+def _get_required_fields(document_class: type[VectorBaseDocument]) -> frozenset[str]:
+    return frozenset(name for name, field in document_class.model_fields.items() if field.is_required())
+
+
+@lru_cache
+def _get_field_converters(document_class: type[VectorBaseDocument]) -> dict[str, Callable[[Any], Any]]:
+    """
+    Maps every field to the function that converts its stored value to its Python type. The UUIDs (stored as
+    strings) and the fields with a custom validator, such as the embeddings (stored as lists of floats),
+    are converted, while the other fields are kept as they are.
+    """
+
+    return {
+        name: _find_converter(field.annotation, field.metadata) or _identity
+        for name, field in document_class.model_fields.items()
+    }
+
+
+def _find_converter(annotation: Any, metadata: list | tuple = ()) -> Callable[[Any], Any] | None:
+    for item in metadata:
+        if isinstance(item, PlainValidator):
+            return item.func
+
+    if annotation is UUID:
+        return lambda value: value if isinstance(value, UUID) else UUID(value)
+
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        base, *annotated_metadata = typing.get_args(annotation)
+
+        return _find_converter(base, annotated_metadata)
+
+    if origin in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            converter = _find_converter(arg)
+            if converter is not None:
+                return converter
+
+    return None
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -1,16 +1,26 @@
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from loguru import logger
 
-try:
-    from datasets import Dataset, DatasetDict, concatenate_datasets
-except ImportError:
-    logger.warning("Huggingface datasets not installed. Install with `pip install datasets`")
-
-
 from llm_engineering.domain.base import VectorBaseDocument
 from llm_engineering.domain.types import DataCategory
 
+if TYPE_CHECKING:
+    from datasets import Dataset, DatasetDict
+
+
+def _import_datasets():
+    # The datasets library is heavy and only needed when exporting to Hugging Face, hence the lazy import.
+    try:
+        import datasets
+    except ImportError:
+        logger.warning("Huggingface datasets not installed. Install with `pip install datasets`")
+
+        raise
+
+    return datasets
+
 
 class DatasetType(Enum):
     INSTRUCTION = "instruction"
@@ -48,7 +58,7 @@ class InstructDataset(VectorBaseDocument):
     def to_huggingface(self) -> "Dataset":
         data = [sample.model_dump() for sample in self.samples]
 
-        return Dataset.from_dict(
+        return _import_datasets().Dataset.from_dict(
             {"instruction": [d["instruction"] for d in data], "output": [d["answer"] for d in data]}
         )
 
@@ -59,17 +69,19 @@ class TrainTestSplit(VectorBaseDocument):
     test_split_size: float
 
     def to_huggingface(self, flatten: bool = False) -> "DatasetDict":
+        datasets = _import_datasets()
+
         train_datasets = {category.value: dataset.to_huggingface() for category, dataset in self.train.items()}
         test_datasets = {category.value: dataset.to_huggingface() for category, dataset in self.test.items()}
 
         if flatten:
-            train_datasets = concatenate_datasets(list(train_datasets.values()))
-            test_datasets = concatenate_datasets(list(test_datasets.values()))
+            train_datasets = datasets.concatenate_datasets(list(train_datasets.values()))
+            test_datasets = datasets.concatenate_datasets(list(test_datasets.values()))
         else:
-            train_datasets = Dataset.from_dict(train_datasets)
-            test_datasets = Dataset.from_dict(test_datasets)
+            train_datasets = datasets.Dataset.from_dict(train_datasets)
+            test_datasets = datasets.Dataset.from_dict(test_datasets)
 
-        return DatasetDict({"train": train_datasets, "test": test_datasets})
+        return datasets.DatasetDict({"train": train_datasets, "test": test_datasets})
 
 
 class InstructTrainTestSplit(TrainTestSplit):
@@ -95,7 +107,7 @@ class PreferenceDataset(VectorBaseDocument):
     def to_huggingface(self) -> "Dataset":
         data = [sample.model_dump() for sample in self.samples]
 
-        return Dataset.from_dict(
+        return _import_datasets().Dataset.from_dict(
             {
                 "prompt": [d["instruction"] for d in data],
                 "rejected": [d["rejected"] for d in data],
@@ -1,5 +1,8 @@
+import hashlib
+import json
 from abc import ABC
-from typing import Optional
+from datetime import datetime, timezone
+from typing import ClassVar, Optional
 
 from pydantic import UUID4, Field
 
@@ -13,6 +16,7 @@ class UserDocument(NoSQLBaseDocument):
 
     class Settings:
         name = "users"
+        indexes: ClassVar[list[str | tuple[str, ...]]] = [("first_name", "last_name")]
 
     @property
     def full_name(self):
@@ -25,6 +29,17 @@ class Document(NoSQLBaseDocument, ABC):
     author_id: UUID4 = Field(alias="author_id")
     author_full_name: str = Field(alias="author_full_name")
 
+    @classmethod
+    def find_existing_links(cls, links: list[str]) -> set[str]:
+        """Returns the links already stored in the collection, in a single query on the 'link' index."""
+
+        if len(links) == 0:
+            return set()
+
+        documents = cls.iter_find(projection=["link"], raw=True, link={"$in": list(links)})
+
+        return {document["link"] for document in documents}
+
 
 class RepositoryDocument(Document):
     name: str
@@ -32,6 +47,7 @@ class RepositoryDocument(Document):
 
     class Settings:
         name = DataCategory.REPOSITORIES
+        indexes: ClassVar[list[str | tuple[str, ...]]] = ["link", "author_id"]
 
 
 class PostDocument(Document):
@@ -40,6 +56,7 @@ class PostDocument(Document):
 
     class Settings:
         name = DataCategory.POSTS
+        indexes: ClassVar[list[str | tuple[str, ...]]] = ["link", "author_id"]
 
 
 class ArticleDocument(Document):
@@ -47,3 +64,36 @@ class ArticleDocument(Document):
 
     class Settings:
         name = DataCategory.ARTICLES
+        indexes: ClassVar[list[str | tuple[str, ...]]] = ["link", "author_id"]
+
+
+class DocumentIngestionState(NoSQLBaseDocument):
+    """
+    The version of a raw document last loaded into the vector DB, keyed by the id of the raw document.
+    Comparing the fingerprints lets the feature engineering pipeline re-process only the changed documents.
+    """
+
+    category: DataCategory
+    author_id: UUID4
+    fingerprint: str
+    num_chunks: int = 0
+    processed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "document_ingestion_states"
+        indexes: ClassVar[list[str | tuple[str, ...]]] = [("author_id", "category")]
+
+    @classmethod
+    def from_document(cls, document: Document) -> "DocumentIngestionState":
+        return cls(
+            id=document.id,
+            category=DataCategory(document.get_collection_name()),
+            author_id=document.author_id,
+            fingerprint=cls.compute_fingerprint(document),
+        )
+
+    @staticmethod
+    def compute_fingerprint(document: Document) -> str:
+        data = json.dumps(document.to_mongo(), sort_keys=True, default=str)
+
+        return hashlib.md5(data.encode("utf-8")).hexdigest()
@@ -1,15 +1,37 @@
 from abc import ABC
+from typing import ClassVar
 
 from pydantic import UUID4, Field
 
-from llm_engineering.domain.types import DataCategory
+from llm_engineering.domain.types import DataCategory, Embedding
 
 from .base import VectorBaseDocument
 
 
+class EmbeddedChunkIndexConfig:
+    """
+    Index parameters shared by the embedded chunk collections, trading a bit of recall for lower RAM usage
+    and latency: the vectors and payloads live on disk, while int8-quantized copies of the vectors stay in RAM.
+    The searches run on the quantized vectors and rescore an oversampled candidate set with the original ones.
+    """
+
+    use_vector_index = True
+    hnsw_m = 16
+    hnsw_ef_construct = 100
+    hnsw_ef = 64
+    quantization = "scalar"
+    quantization_always_ram = True
+    quantization_rescore = True
+    quantization_oversampling = 2.0
+    on_disk = True
+    on_disk_payload = True
+    vector_datatype = "float32"
+    payload_indexes: ClassVar[dict[str, str]] = {"author_id": "keyword", "document_id": "keyword"}
+
+
 class EmbeddedChunk(VectorBaseDocument, ABC):
     content: str
-    embedding: list[float] | None
+    embedding: Embedding | None
     platform: str
     document_id: UUID4
     author_id: UUID4
@@ -32,26 +54,23 @@ class EmbeddedChunk(VectorBaseDocument, ABC):
 
 
 class EmbeddedPostChunk(EmbeddedChunk):
-    class Config:
+    class Config(EmbeddedChunkIndexConfig):
         name = "embedded_posts"
         category = DataCategory.POSTS
-        use_vector_index = True
 
 
 class EmbeddedArticleChunk(EmbeddedChunk):
     link: str
 
-    class Config:
+    class Config(EmbeddedChunkIndexConfig):
         name = "embedded_articles"
         category = DataCategory.ARTICLES
-        use_vector_index = True
 
 
 class EmbeddedRepositoryChunk(EmbeddedChunk):
     name: str
     link: str
 
-    class Config:
+    class Config(EmbeddedChunkIndexConfig):
         name = "embedded_repositories"
         category = DataCategory.REPOSITORIES
-        use_vector_index = True
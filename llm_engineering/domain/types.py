@@ -1,4 +1,9 @@
 from enum import StrEnum
+from typing import Annotated
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import PlainSerializer, PlainValidator
 
 
 class DataCategory(StrEnum):
@@ -13,3 +18,19 @@ class DataCategory(StrEnum):
     POSTS = "posts"
     ARTICLES = "articles"
     REPOSITORIES = "repositories"
+
+
+def _to_embedding(value: NDArray | list[float]) -> NDArray[np.float32]:
+    """Keeps float32 arrays (and views into batch matrices) as they are, without copying them."""
+
+    if isinstance(value, np.ndarray) and value.dtype == np.float32:
+        return value
+
+    return np.asarray(value, dtype=np.float32)
+
+
+Embedding = Annotated[
+    NDArray[np.float32],
+    PlainValidator(_to_embedding),
+    PlainSerializer(lambda value: value.tolist(), return_type=list[float]),
+]
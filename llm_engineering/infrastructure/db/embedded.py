@@ -0,0 +1,1079 @@
+import asyncio
+import fcntl
+import json
+import re
+import shutil
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Any, Iterator, NamedTuple
+
+import httpx
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+from qdrant_client.http import models as qdrant_models
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Batch,
+    CollectionConfig,
+    CollectionInfo,
+    CollectionParams,
+    CollectionStatus,
+    CountResult,
+    Datatype,
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    HasIdCondition,
+    HnswConfig,
+    IsEmptyCondition,
+    IsNullCondition,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    OptimizersConfig,
+    OptimizersStatusOneOf,
+    PayloadIndexInfo,
+    PayloadSchemaType,
+    PayloadSelectorExclude,
+    PayloadSelectorInclude,
+    PointIdsList,
+    PointStruct,
+    Record,
+    ScoredPoint,
+    SearchParams,
+    SearchRequest,
+    UpdateResult,
+    UpdateStatus,
+    VectorParams,
+    WalConfig,
+)
+
+_SEARCH_BLOCK_SIZE = 16384
+_IVF_MIN_POINTS_PER_LIST = 39
+_IVF_TRAINING_POINTS_PER_LIST = 256
+_IVF_TRAINING_ITERATIONS = 10
+_PAYLOAD_KEY = re.compile(r"^[A-Za-z_][\w]*(\.[A-Za-z_][\w]*)*$")
+_DTYPES = {Datatype.FLOAT32: np.float32, Datatype.FLOAT16: np.float16}
+
+
+class _SearchSnapshot(NamedTuple):
+    """The state of a collection read by a search, captured under the lock so the scoring can run outside of it."""
+
+    vectors: NDArray
+    num_rows: int
+    live: NDArray[np.bool_]
+    ivf_centroids: NDArray[np.float32] | None
+    ivf_assignments: NDArray[np.int32]
+
+
+def _not_found(collection_name: str) -> UnexpectedResponse:
+    content = json.dumps({"status": {"error": f"Not found: Collection `{collection_name}` doesn't exist!"}})
+
+    return UnexpectedResponse(
+        status_code=404, reason_phrase="Not Found", content=content.encode(), headers=httpx.Headers()
+    )
+
+
+def _normalize_id(point_id: Any) -> str:
+    try:
+        return str(uuid.UUID(str(point_id)))
+    except ValueError as e:
+        raise ValueError(f"The embedded vector database only supports UUID point ids. Got {point_id!r}.") from e
+
+
+def _json_path(key: str) -> str:
+    if not _PAYLOAD_KEY.match(key):
+        raise ValueError(f"Unsupported payload key in filter: {key!r}.")
+
+    return f"json_extract(payload, '$.{key}')"
+
+
+def _filter_to_sql(filter_: Filter | None) -> tuple[str, list]:
+    """
+    Translates a Qdrant filter into an SQL condition over the JSON payloads of the sidecar store.
+    Only the conditions on scalar payload fields used by the vector documents are supported.
+    """
+
+    if filter_ is None:
+        return "1", []
+
+    clauses: list[str] = []
+    params: list = []
+
+    def _as_list(conditions: Any) -> list:
+        if conditions is None:
+            return []
+
+        return conditions if isinstance(conditions, list) else [conditions]
+
+    for condition in _as_list(filter_.must):
+        sql, condition_params = _condition_to_sql(condition)
+        clauses.append(sql)
+        params.extend(condition_params)
+
+    should = [_condition_to_sql(condition) for condition in _as_list(filter_.should)]
+    if should:
+        clauses.append("(" + " OR ".join(sql for sql, _ in should) + ")")
+        params.extend(param for _, condition_params in should for param in condition_params)
+
+    for condition in _as_list(filter_.must_not):
+        sql, condition_params = _condition_to_sql(condition)
+        clauses.append(f"NOT {sql}")
+        params.extend(condition_params)
+
+    return ("(" + " AND ".join(clauses) + ")" if clauses else "1"), params
+
+
+def _condition_to_sql(condition: Any) -> tuple[str, list]:
+    if isinstance(condition, Filter):
+        return _filter_to_sql(condition)
+
+    if isinstance(condition, HasIdCondition):
+        ids = [_normalize_id(point_id) for point_id in condition.has_id]
+        if not ids:
+            return "0", []
+
+        return f"(id IN ({', '.join('?' for _ in ids)}))", ids
+
+    if isinstance(condition, IsNullCondition):
+        return f"({_json_path(condition.is_null.key)} IS NULL)", []
+
+    if isinstance(condition, IsEmptyCondition):
+        path = _json_path(condition.is_empty.key)
+
+        return f"({path} IS NULL OR {path} = '[]')", []
+
+    if isinstance(condition, FieldCondition):
+        path = _json_path(condition.key)
+        if isinstance(condition.match, MatchValue):
+            return f"({path} = ?)", [condition.match.value]
+        if isinstance(condition.match, MatchAny):
+            values = list(condition.match.any)
+            if not values:
+                return "0", []
+
+            return f"({path} IN ({', '.join('?' for _ in values)}))", values
+        if isinstance(condition.match, MatchExcept):
+            values = list(condition.match.except_)
+
+            return f"({path} IS NULL OR {path} NOT IN ({', '.join('?' for _ in values)}))", values
+        if condition.match is None and condition.range is not None:
+            clauses, params = [], []
+            for operator, value in (
+                (">", condition.range.gt),
+                (">=", condition.range.gte),
+                ("<", condition.range.lt),
+                ("<=", condition.range.lte),
+            ):
+                if value is not None:
+                    clauses.append(f"{path} {operator} ?")
+                    params.append(value)
+
+            return "(" + " AND ".join(clauses or ["1"]) + ")", params
+
+    raise ValueError(f"Unsupported filter condition for the embedded vector database: {condition!r}.")
+
+
+def _select_payload(payload: dict, with_payload: Any) -> dict | None:
+    if with_payload is True:
+        return payload
+    if with_payload is False or with_payload is None:
+        return None
+    if isinstance(with_payload, PayloadSelectorInclude):
+        return {key: payload[key] for key in with_payload.include if key in payload}
+    if isinstance(with_payload, PayloadSelectorExclude):
+        return {key: value for key, value in payload.items() if key not in with_payload.exclude}
+    if isinstance(with_payload, list):
+        return {key: payload[key] for key in with_payload if key in payload}
+
+    raise ValueError(f"Unsupported payload selector: {with_payload!r}.")
+
+
+class _EmbeddedCollection:
+    """
+    A collection stored as a memory-mapped matrix of vectors (one row per point) and a SQLite sidecar that maps
+    the point ids to their rows and holds their JSON payloads.
+
+    Several clients, in one or several processes, can share a collection: the writes are serialized by a file lock
+    on `write.lock`, and every client reloads its view of the rows when the sidecar was changed by another one.
+    """
+
+    def __init__(self, path: Path, ivf_num_lists: int, ivf_num_probes: int) -> None:
+        self.path = path
+        self.name = path.name
+        self._ivf_num_lists = ivf_num_lists
+        self._ivf_num_probes = ivf_num_probes
+        self._lock = RLock()
+
+        self.meta = self._read_meta()
+
+        self._connection = sqlite3.connect(self.path / "payloads.sqlite3", check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS points (
+                id TEXT PRIMARY KEY,
+                row INTEGER NOT NULL UNIQUE,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+        self._write_lock_file = (self.path / "write.lock").open("a")
+        self._write_depth = 0
+
+        self._dtype = _DTYPES[Datatype(self.meta["datatype"])]
+        self._vectors: np.memmap | None = None
+        self._data_version: int | None = None
+        self._load()
+
+    def _load(self) -> None:
+        """Loads the rows of the points, the capacity of the vectors and the IVF partitioning from the disk."""
+
+        (self._data_version,) = self._connection.execute("PRAGMA data_version").fetchone()
+        self.meta = self._read_meta()
+
+        rows = self._connection.execute("SELECT row, id FROM points").fetchall()
+        self._row_to_id = {row: point_id for row, point_id in rows}
+        self._num_rows = max(self._row_to_id, default=-1) + 1
+        self._live = np.zeros(max(self._num_rows, 1), dtype=bool)
+        self._live[list(self._row_to_id)] = True
+        self._free_rows = [row for row in range(self._num_rows) if not self._live[row]]
+        if self.has_vectors:
+            self._open_vectors(max(self.meta.get("capacity", 0), self._num_rows))
+
+        self._ivf_centroids: NDArray[np.float32] | None = None
+        self._ivf_assignments = np.full(len(self._live), -1, dtype=np.int32)
+        self._ivf_trained_size = 0
+        if self.has_vectors and (self.path / "ivf_centroids.npy").exists():
+            self._ivf_centroids = np.load(self.path / "ivf_centroids.npy")
+            self._ivf_trained_size = int(self.meta.get("ivf_trained_size", 0))
+            self._assign_to_lists(np.flatnonzero(self._live[: self._num_rows]))
+
+    @property
+    def has_vectors(self) -> bool:
+        return self.meta["vector_size"] is not None
+
+    @property
+    def num_points(self) -> int:
+        with self._lock:
+            self._sync()
+
+            return len(self._row_to_id)
+
+    @classmethod
+    def create(cls, path: Path, meta: dict, ivf_num_lists: int, ivf_num_probes: int) -> "_EmbeddedCollection":
+        path.mkdir(parents=True, exist_ok=False)
+        with (path / "meta.json").open("w") as f:
+            json.dump(meta, f)
+
+        return cls(path, ivf_num_lists=ivf_num_lists, ivf_num_probes=ivf_num_probes)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
+            self._connection.close()
+            self._write_lock_file.close()
+
+    def save_meta(self) -> None:
+        # Written to a temporary file first, so the other clients never read a partially written file.
+        tmp_path = self.path / "meta.json.tmp"
+        with tmp_path.open("w") as f:
+            json.dump(self.meta, f)
+        tmp_path.replace(self.path / "meta.json")
+
+    def _read_meta(self) -> dict:
+        with (self.path / "meta.json").open("r") as f:
+            return json.load(f)
+
+    def _sync(self) -> None:
+        """Reloads the collection if another connection committed changes to the sidecar since it was loaded."""
+
+        (data_version,) = self._connection.execute("PRAGMA data_version").fetchone()
+        if data_version != self._data_version:
+            self._load()
+
+    # --- Writes. ---
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Holds the lock of the collection and the file lock shared with the other clients for the duration of a write,
+        on an up-to-date view of the collection.
+        """
+
+        with self._lock:
+            if self._write_depth == 0:
+                fcntl.flock(self._write_lock_file, fcntl.LOCK_EX)
+            self._write_depth += 1
+            try:
+                self._sync()
+                self.meta = self._read_meta()
+
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    fcntl.flock(self._write_lock_file, fcntl.LOCK_UN)
+
+    def upsert(self, ids: list[str], vectors: NDArray[np.float32] | None, payloads: list[dict]) -> None:
+        if self.has_vectors and vectors is None:
+            raise ValueError(f"The points upserted into '{self.name}' have no vectors.")
+
+        with self.writing():
+            existing_rows = dict(
+                self._connection.execute(
+                    f"SELECT id, row FROM points WHERE id IN ({', '.join('?' for _ in ids)})", ids
+                ).fetchall()
+            )
+
+            rows = []
+            for point_id in ids:
+                row = existing_rows.get(point_id)
+                if row is None:
+                    row = self._allocate_row()
+                    existing_rows[point_id] = row
+                rows.append(row)
+
+            rows_array = np.asarray(rows, dtype=np.int64)
+
+            # The rows are claimed in the sidecar before the vectors are written, so a row already taken by another
+            # point fails on the UNIQUE constraint instead of overwriting that point.
+            try:
+                self._connection.executemany(
+                    """
+                    INSERT INTO points (id, row, payload) VALUES (?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET payload = excluded.payload
+                    """,
+                    [
+                        (point_id, row, json.dumps(payload or {}, default=str))
+                        for point_id, row, payload in zip(ids, rows, payloads, strict=True)
+                    ],
+                )
+                if self.has_vectors:
+                    self._ensure_capacity(int(rows_array.max()) + 1)
+                    self._vectors[rows_array] = self._prepare_vectors(vectors)
+            except Exception:
+                self._connection.rollback()
+                self._load()
+
+                raise
+            self._connection.commit()
+
+            for point_id, row in zip(ids, rows, strict=True):
+                self._row_to_id[row] = point_id
+            self._live[rows_array] = True
+            if self._ivf_centroids is not None:
+                self._assign_to_lists(rows_array)
+
+            self.meta["capacity"] = len(self._vectors) if self._vectors is not None else 0
+            self.save_meta()
+
+    def delete(self, where: str, params: list) -> int:
+        with self.writing():
+            rows = [row for (row,) in self._connection.execute(f"SELECT row FROM points WHERE {where}", params)]
+            self._connection.execute(f"DELETE FROM points WHERE {where}", params)
+            self._connection.commit()
+
+            for row in rows:
+                self._row_to_id.pop(row, None)
+                self._live[row] = False
+                self._free_rows.append(row)
+
+            return len(rows)
+
+    def create_payload_index(self, field_name: str, field_schema: PayloadSchemaType) -> None:
+        index_name = "payload_" + re.sub(r"\W", "_", field_name)
+        with self.writing():
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON points ({_json_path(field_name)})")
+            self._connection.commit()
+
+            self.meta["payload_schema"][field_name] = PayloadSchemaType(field_schema).value
+            self.save_meta()
+
+    # --- Reads. ---
+
+    def select(self, where: str, params: list, order_by: str = "", limit: int | None = None) -> list[tuple]:
+        query = f"SELECT id, row, payload FROM points WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def count(self, where: str, params: list) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(f"SELECT COUNT(*) FROM points WHERE {where}", params).fetchone()
+
+        return count
+
+    def get_vectors(self, rows: list[int]) -> NDArray[np.float32]:
+        with self._lock:
+            self._sync()
+
+            return np.asarray(self._vectors[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+
+    def search(
+        self,
+        queries: NDArray[np.float32],
+        limit: int,
+        candidate_rows: NDArray[np.int64] | None = None,
+        exact: bool = False,
+    ) -> list[tuple[NDArray[np.int64], NDArray[np.float32]]]:
+        """
+        Finds the `limit` rows with the highest scores for every query, scanning the matrix in blocks
+        so the memory used by the scores stays bounded, with one BLAS matrix product per block for all the queries.
+
+        Args:
+            queries (NDArray[np.float32]): The query vectors, one per row.
+            limit (int): The number of rows returned per query.
+            candidate_rows (NDArray[np.int64] | None): Restricts the search to these rows (e.g., the rows matching
+                a filter). If None, all the points are searched.
+            exact (bool): Whether to skip the IVF partitioning and scan all the candidates.
+
+        Returns:
+            list[tuple[NDArray[np.int64], NDArray[np.float32]]]: The rows and scores found for every query,
+                sorted by decreasing score.
+        """
+
+        queries = self._prepare_vectors(queries)
+        if limit <= 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in queries]
+
+        # Only the references to the arrays are taken under the lock (the IVF partitioning is trained here if needed),
+        # so concurrent searches score the vectors in parallel, as NumPy releases the GIL in the matrix products.
+        with self._lock:
+            self._sync()
+            use_ivf = not exact and self._use_ivf()
+            snapshot = _SearchSnapshot(
+                vectors=self._vectors,
+                num_rows=self._num_rows,
+                live=self._live[: self._num_rows].copy(),
+                ivf_centroids=self._ivf_centroids,
+                ivf_assignments=self._ivf_assignments[: self._num_rows].copy() if use_ivf else self._ivf_assignments,
+            )
+
+        if candidate_rows is not None:
+            # The rows matching the filter may have been added after the snapshot was taken.
+            candidate_rows = candidate_rows[candidate_rows < snapshot.num_rows]
+
+        if use_ivf:
+            return [
+                self._search_rows(snapshot, query[None, :], limit, self._probe(snapshot, query, candidate_rows))[0]
+                for query in queries
+            ]
+
+        return self._search_rows(snapshot, queries, limit, candidate_rows)
+
+    @classmethod
+    def _search_rows(
+        cls,
+        snapshot: _SearchSnapshot,
+        queries: NDArray[np.float32],
+        limit: int,
+        candidate_rows: NDArray[np.int64] | None,
+    ) -> list[tuple[NDArray[np.int64], NDArray[np.float32]]]:
+        best_rows = [np.empty(0, dtype=np.int64) for _ in queries]
+        best_scores = [np.empty(0, dtype=np.float32) for _ in queries]
+
+        num_candidates = snapshot.num_rows if candidate_rows is None else len(candidate_rows)
+        for start in range(0, num_candidates, _SEARCH_BLOCK_SIZE):
+            end = min(start + _SEARCH_BLOCK_SIZE, num_candidates)
+            if candidate_rows is None:
+                rows = np.arange(start, end, dtype=np.int64)
+                block = np.asarray(snapshot.vectors[start:end], dtype=np.float32)
+                live = snapshot.live[start:end]
+            else:
+                rows = candidate_rows[start:end]
+                block = np.asarray(snapshot.vectors[rows], dtype=np.float32)
+                live = None
+
+            scores = block @ queries.T
+            if live is not None:
+                scores[~live] = -np.inf
+
+            for i in range(len(queries)):
+                block_rows, block_scores = cls._top_k(rows, scores[:, i], limit)
+                best_rows[i], best_scores[i] = cls._top_k(
+                    np.concatenate([best_rows[i], block_rows]), np.concatenate([best_scores[i], block_scores]), limit
+                )
+
+        results = []
+        for rows, scores in zip(best_rows, best_scores, strict=True):
+            keep = np.isfinite(scores)
+            results.append((rows[keep], scores[keep]))
+
+        return results
+
+    @staticmethod
+    def _top_k(rows: NDArray[np.int64], scores: NDArray[np.float32], k: int) -> tuple[NDArray, NDArray]:
+        if k <= 0:
+            return rows[:0], scores[:0]
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+
+        order = np.argsort(-scores, kind="stable")
+
+        return rows[order], scores[order]
+
+    # --- IVF partitioning. ---
+
+    def _use_ivf(self) -> bool:
+        if self._ivf_num_lists <= 0 or self.num_points < self._ivf_num_lists * _IVF_MIN_POINTS_PER_LIST:
+            return False
+
+        if self._ivf_centroids is None or self.num_points > 2 * self._ivf_trained_size:
+            with self.writing():
+                self._train_ivf()
+
+        return True
+
+    def _train_ivf(self) -> None:
+        """
+        Partitions the vectors into `ivf_num_lists` clusters with spherical k-means over a sample of the points.
+        Searches then only scan the clusters closest to the query. The partitioning is retrained once the
+        collection doubles in size.
+        """
+
+        live_rows = np.flatnonzero(self._live[: self._num_rows])
+        rng = np.random.default_rng(0)
+        num_samples = min(len(live_rows), self._ivf_num_lists * _IVF_TRAINING_POINTS_PER_LIST)
+        samples = np.asarray(
+            self._vectors[np.sort(rng.choice(live_rows, num_samples, replace=False))], dtype=np.float32
+        )
+
+        centroids = samples[rng.choice(len(samples), self._ivf_num_lists, replace=False)]
+        for _ in range(_IVF_TRAINING_ITERATIONS):
+            assignments = np.argmax(samples @ centroids.T, axis=1)
+            for list_id in range(self._ivf_num_lists):
+                members = samples[assignments == list_id]
+                if len(members) > 0:
+                    centroids[list_id] = members.mean(axis=0)
+            centroids /= np.clip(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12, None)
+
+        self._ivf_centroids = centroids
+        self._ivf_trained_size = len(live_rows)
+        self._assign_to_lists(live_rows)
+
+        np.save(self.path / "ivf_centroids.npy", centroids)
+        self.meta["ivf_trained_size"] = self._ivf_trained_size
+        self.save_meta()
+
+        logger.info(
+            f"Trained the IVF partitioning of '{self.name}'.",
+            num_lists=self._ivf_num_lists,
+            num_points=self._ivf_trained_size,
+        )
+
+    def _assign_to_lists(self, rows: NDArray[np.int64]) -> None:
+        if len(self._ivf_assignments) < len(self._live):
+            assignments = np.full(len(self._live), -1, dtype=np.int32)
+            assignments[: len(self._ivf_assignments)] = self._ivf_assignments
+            self._ivf_assignments = assignments
+
+        for start in range(0, len(rows), _SEARCH_BLOCK_SIZE):
+            block_rows = rows[start : start + _SEARCH_BLOCK_SIZE]
+            block = np.asarray(self._vectors[block_rows], dtype=np.float32)
+            self._ivf_assignments[block_rows] = np.argmax(block @ self._ivf_centroids.T, axis=1)
+
+    def _probe(
+        self, snapshot: _SearchSnapshot, query: NDArray[np.float32], candidate_rows: NDArray[np.int64] | None
+    ) -> NDArray[np.int64]:
+        num_probes = min(self._ivf_num_probes, len(snapshot.ivf_centroids))
+        probed_lists = np.argpartition(-(snapshot.ivf_centroids @ query), num_probes - 1)[:num_probes]
+
+        if candidate_rows is None:
+            candidate_rows = np.flatnonzero(snapshot.live)
+
+        return candidate_rows[np.isin(snapshot.ivf_assignments[candidate_rows], probed_lists)]
+
+    # --- Storage. ---
+
+    def _prepare_vectors(self, vectors: Any) -> NDArray[np.float32]:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if vectors.shape[1] != self.meta["vector_size"]:
+            raise ValueError(
+                f"Wrong vector dimension for '{self.name}': expected {self.meta['vector_size']}, got {vectors.shape[1]}."
+            )
+
+        if self.meta["distance"] == Distance.COSINE:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+        return vectors
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+
+        row = self._num_rows
+        self._num_rows += 1
+        if self._num_rows > len(self._live):
+            live = np.zeros(max(2 * len(self._live), 1024), dtype=bool)
+            live[: len(self._live)] = self._live
+            self._live = live
+
+        return row
+
+    def _ensure_capacity(self, num_rows: int) -> None:
+        capacity = len(self._vectors) if self._vectors is not None else 0
+        if num_rows <= capacity:
+            return
+
+        self._open_vectors(max(num_rows, 2 * capacity, 1024))
+
+    def _open_vectors(self, capacity: int) -> None:
+        vectors_path = self.path / "vectors.bin"
+        row_size = self.meta["vector_size"] * np.dtype(self._dtype).itemsize
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        with vectors_path.open("ab") as f:
+            if f.tell() < capacity * row_size:
+                f.truncate(capacity * row_size)
+
+        if capacity > 0:
+            self._vectors = np.memmap(
+                vectors_path, dtype=self._dtype, mode="r+", shape=(capacity, self.meta["vector_size"])
+            )
+
+
+class EmbeddedVectorClient:
+    """
+    An in-process vector database that stands in for `QdrantClient` (for the subset of its API used by the
+    vector documents), so small deployments and the CI can run without a Qdrant server.
+
+    Every collection keeps its vectors in a memory-mapped float32 or float16 matrix searched with NumPy (BLAS)
+    matrix products, and its payloads in a SQLite sidecar, where filters are evaluated and payload indexes are
+    created. With `ivf_num_lists` > 0, large collections are partitioned with k-means, and only the `ivf_num_probes`
+    partitions closest to the query are searched (an approximate search, like the HNSW index of Qdrant).
+
+    Only UUID point ids, a single unnamed vector per point, the Cosine and Dot distances, and filters on scalar
+    payload fields are supported.
+
+    Args:
+        path (str | Path): The directory where the collections are stored.
+        ivf_num_lists (int): The number of IVF partitions of large collections. 0 disables the partitioning.
+        ivf_num_probes (int): The number of partitions searched per query.
+    """
+
+    def __init__(self, path: str | Path, ivf_num_lists: int = 0, ivf_num_probes: int = 8) -> None:
+        self._path = Path(path)
+        self._ivf_num_lists = ivf_num_lists
+        self._ivf_num_probes = ivf_num_probes
+        self._collections: dict[str, _EmbeddedCollection] = {}
+        self._lock = Lock()
+
+        self._path.mkdir(parents=True, exist_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections = {}
+
+    # --- Collections. ---
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return (self._path / collection_name / "meta.json").exists()
+
+    def create_collection(
+        self,
+        collection_name: str,
+        vectors_config: VectorParams | dict,
+        hnsw_config: Any = None,
+        quantization_config: Any = None,
+        on_disk_payload: bool | None = None,
+        **kwargs,
+    ) -> bool:
+        if isinstance(vectors_config, dict) and len(vectors_config) > 0:
+            raise ValueError("The embedded vector database doesn't support named vectors.")
+        if isinstance(vectors_config, VectorParams) and vectors_config.distance not in (Distance.COSINE, Distance.DOT):
+            raise ValueError(f"Unsupported distance for the embedded vector database: {vectors_config.distance}.")
+
+        vector_params = vectors_config if isinstance(vectors_config, VectorParams) else None
+        datatype = (vector_params.datatype if vector_params else None) or Datatype.FLOAT32
+        if datatype not in _DTYPES:
+            raise ValueError(f"Unsupported vector datatype for the embedded vector database: {datatype}.")
+
+        meta = {
+            "vector_size": vector_params.size if vector_params else None,
+            "distance": vector_params.distance.value if vector_params else Distance.COSINE.value,
+            "datatype": Datatype(datatype).value,
+            "on_disk": vector_params.on_disk if vector_params else None,
+            "on_disk_payload": on_disk_payload,
+            "hnsw_config": self._merge_hnsw_config({}, hnsw_config),
+            "quantization_config": self._dump_quantization_config(quantization_config),
+            "payload_schema": {},
+            "capacity": 0,
+        }
+
+        with self._lock:
+            if self.collection_exists(collection_name):
+                return False
+
+            self._collections[collection_name] = _EmbeddedCollection.create(
+                self._path / collection_name,
+                meta,
+                ivf_num_lists=self._ivf_num_lists,
+                ivf_num_probes=self._ivf_num_probes,
+            )
+
+        logger.info(f"Created embedded collection '{collection_name}'.", path=str(self._path / collection_name))
+
+        return True
+
+    def delete_collection(self, collection_name: str, **kwargs) -> bool:
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+
+            if not self.collection_exists(collection_name):
+                return False
+
+            shutil.rmtree(self._path / collection_name)
+
+        return True
+
+    def get_collection(self, collection_name: str) -> CollectionInfo:
+        collection = self._get(collection_name)
+        meta = collection.meta
+
+        if collection.has_vectors:
+            vectors = VectorParams(
+                size=meta["vector_size"],
+                distance=Distance(meta["distance"]),
+                on_disk=meta["on_disk"],
+                datatype=Datatype(meta["datatype"]),
+            )
+        else:
+            vectors = {}
+
+        num_points = collection.num_points
+
+        return CollectionInfo(
+            status=CollectionStatus.GREEN,
+            optimizer_status=OptimizersStatusOneOf.OK,
+            vectors_count=None,
+            indexed_vectors_count=0,
+            points_count=num_points,
+            segments_count=1,
+            payload_schema={
+                field_name: PayloadIndexInfo(data_type=PayloadSchemaType(field_schema), points=num_points)
+                for field_name, field_schema in meta["payload_schema"].items()
+            },
+            config=CollectionConfig(
+                params=CollectionParams(vectors=vectors, on_disk_payload=meta["on_disk_payload"]),
+                hnsw_config=HnswConfig(**meta["hnsw_config"]),
+                wal_config=WalConfig(wal_capacity_mb=32, wal_segments_ahead=0),
+                optimizer_config=OptimizersConfig(
+                    deleted_threshold=0.2,
+                    vacuum_min_vector_number=1000,
+                    default_segment_number=0,
+                    indexing_threshold=20000,
+                    flush_interval_sec=5,
+                    max_optimization_threads=1,
+                ),
+                quantization_config=self._load_quantization_config(meta["quantization_config"]),
+            ),
+        )
+
+    def update_collection(
+        self,
+        collection_name: str,
+        hnsw_config: Any = None,
+        quantization_config: Any = None,
+        vectors_config: dict | None = None,
+        collection_params: Any = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Records the new configuration of the collection. The HNSW and quantization parameters have no effect
+        on the embedded search, but they are stored so the collection reports the configuration it was given.
+        """
+
+        collection = self._get(collection_name)
+        with collection.writing():
+            if hnsw_config is not None:
+                collection.meta["hnsw_config"] = self._merge_hnsw_config(collection.meta["hnsw_config"], hnsw_config)
+            if quantization_config is not None:
+                collection.meta["quantization_config"] = self._dump_quantization_config(quantization_config)
+            for vector_params_diff in (vectors_config or {}).values():
+                if vector_params_diff.on_disk is not None:
+                    collection.meta["on_disk"] = vector_params_diff.on_disk
+            if collection_params is not None and collection_params.on_disk_payload is not None:
+                collection.meta["on_disk_payload"] = collection_params.on_disk_payload
+
+            collection.save_meta()
+
+        return True
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: PayloadSchemaType | str, **kwargs
+    ) -> UpdateResult:
+        self._get(collection_name).create_payload_index(field_name, PayloadSchemaType(field_schema))
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    # --- Points. ---
+
+    def upsert(
+        self, collection_name: str, points: Batch | list[PointStruct], wait: bool = True, **kwargs
+    ) -> UpdateResult:
+        collection = self._get(collection_name)
+
+        if isinstance(points, Batch):
+            ids = [_normalize_id(point_id) for point_id in points.ids]
+            vectors = points.vectors if collection.has_vectors else None
+            payloads = points.payloads or [{} for _ in ids]
+        else:
+            ids = [_normalize_id(point.id) for point in points]
+            vectors = [point.vector for point in points] if collection.has_vectors else None
+            payloads = [point.payload or {} for point in points]
+
+        if ids:
+            collection.upsert(ids, vectors, payloads)
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    def delete(
+        self,
+        collection_name: str,
+        points_selector: PointIdsList | FilterSelector | Filter | list,
+        wait: bool = True,
+        **kwargs,
+    ) -> UpdateResult:
+        if isinstance(points_selector, list):
+            points_selector = PointIdsList(points=points_selector)
+
+        if isinstance(points_selector, PointIdsList):
+            where, params = _condition_to_sql(HasIdCondition(has_id=points_selector.points))
+        else:
+            where, params = _filter_to_sql(
+                points_selector.filter if isinstance(points_selector, FilterSelector) else points_selector
+            )
+
+        self._get(collection_name).delete(where, params)
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    def retrieve(
+        self,
+        collection_name: str,
+        ids: list,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        **kwargs,
+    ) -> list[Record]:
+        collection = self._get(collection_name)
+        where, params = _condition_to_sql(HasIdCondition(has_id=ids))
+
+        return self._to_records(collection, collection.select(where, params), with_payload, with_vectors)
+
+    def count(
+        self, collection_name: str, count_filter: Filter | None = None, exact: bool = True, **kwargs
+    ) -> CountResult:
+        where, params = _filter_to_sql(count_filter)
+
+        return CountResult(count=self._get(collection_name).count(where, params))
+
+    def scroll(
+        self,
+        collection_name: str,
+        scroll_filter: Filter | None = None,
+        limit: int = 10,
+        offset: Any = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        **kwargs,
+    ) -> tuple[list[Record], str | None]:
+        collection = self._get(collection_name)
+
+        where, params = _filter_to_sql(scroll_filter)
+        if offset is not None:
+            where = f"{where} AND id >= ?"
+            params = [*params, _normalize_id(offset)]
+
+        rows = collection.select(where, params, order_by="id", limit=limit + 1)
+        next_offset = rows[limit][0] if len(rows) > limit else None
+
+        return self._to_records(collection, rows[:limit], with_payload, with_vectors), next_offset
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Any,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+        limit: int = 10,
+        offset: int | None = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        **kwargs,
+    ) -> list[ScoredPoint]:
+        request = SearchRequest(
+            vector=np.asarray(query_vector, dtype=np.float32).tolist(),
+            filter=query_filter,
+            params=search_params,
+            limit=limit,
+            offset=offset,
+            with_payload=with_payload,
+            with_vector=with_vectors,
+            score_threshold=score_threshold,
+        )
+
+        return self.search_batch(collection_name, requests=[request])[0]
+
+    def search_batch(self, collection_name: str, requests: list[SearchRequest], **kwargs) -> list[list[ScoredPoint]]:
+        """
+        Runs the requests that share the same filter with a single matrix product per block of the collection.
+        """
+
+        collection = self._get(collection_name)
+        if not collection.has_vectors:
+            raise ValueError(f"The collection '{collection_name}' has no vectors to search.")
+
+        groups: dict[tuple[str, bool], list[int]] = {}
+        for i, request in enumerate(requests):
+            filter_key = request.filter.model_dump_json() if request.filter is not None else ""
+            exact = bool(request.params is not None and request.params.exact)
+            groups.setdefault((filter_key, exact), []).append(i)
+
+        results: list[list[ScoredPoint]] = [[] for _ in requests]
+        for (_, exact), indices in groups.items():
+            query_filter = requests[indices[0]].filter
+            if query_filter is not None:
+                where, params = _filter_to_sql(query_filter)
+                candidate_rows = np.asarray([row for _, row, _ in collection.select(where, params)], dtype=np.int64)
+            else:
+                candidate_rows = None
+
+            limit = max(requests[i].limit + (requests[i].offset or 0) for i in indices)
+            queries = np.asarray([requests[i].vector for i in indices], dtype=np.float32)
+            for i, (rows, scores) in zip(
+                indices, collection.search(queries, limit, candidate_rows, exact), strict=True
+            ):
+                results[i] = self._to_scored_points(collection, rows, scores, requests[i])
+
+        return results
+
+    # --- Helpers. ---
+
+    def _get(self, collection_name: str) -> _EmbeddedCollection:
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                if not self.collection_exists(collection_name):
+                    raise _not_found(collection_name)
+
+                collection = _EmbeddedCollection(
+                    self._path / collection_name,
+                    ivf_num_lists=self._ivf_num_lists,
+                    ivf_num_probes=self._ivf_num_probes,
+                )
+                self._collections[collection_name] = collection
+
+        return collection
+
+    @staticmethod
+    def _to_records(
+        collection: _EmbeddedCollection, rows: list[tuple], with_payload: Any, with_vectors: bool
+    ) -> list[Record]:
+        vectors = (
+            collection.get_vectors([row for _, row, _ in rows]) if with_vectors and collection.has_vectors else None
+        )
+
+        return [
+            Record(
+                id=point_id,
+                payload=_select_payload(json.loads(payload), with_payload),
+                vector=vectors[i].tolist() if vectors is not None else None,
+            )
+            for i, (point_id, _, payload) in enumerate(rows)
+        ]
+
+    @staticmethod
+    def _to_scored_points(
+        collection: _EmbeddedCollection, rows: NDArray[np.int64], scores: NDArray[np.float32], request: SearchRequest
+    ) -> list[ScoredPoint]:
+        offset = request.offset or 0
+        rows, scores = rows[offset : offset + request.limit], scores[offset : offset + request.limit]
+        if request.score_threshold is not None:
+            keep = scores >= request.score_threshold
+            rows, scores = rows[keep], scores[keep]
+        if len(rows) == 0:
+            return []
+
+        placeholders = ", ".join("?" for _ in rows)
+        records = {
+            row: (point_id, payload)
+            for point_id, row, payload in collection.select(f"row IN ({placeholders})", rows.tolist())
+        }
+        vectors = collection.get_vectors(rows.tolist()) if request.with_vector else None
+
+        return [
+            ScoredPoint(
+                id=records[row][0],
+                version=0,
+                score=float(score),
+                payload=_select_payload(json.loads(records[row][1]), request.with_payload),
+                vector=vectors[i].tolist() if vectors is not None else None,
+            )
+            for i, (row, score) in enumerate(zip(rows.tolist(), scores.tolist(), strict=True))
+            if row in records
+        ]
+
+    @staticmethod
+    def _merge_hnsw_config(current: dict, hnsw_config: Any) -> dict:
+        merged = {"m": 16, "ef_construct": 100, "full_scan_threshold": 10000, **current}
+        if hnsw_config is not None:
+            merged.update(hnsw_config.model_dump(exclude_none=True))
+
+        return merged
+
+    @staticmethod
+    def _dump_quantization_config(quantization_config: Any) -> dict | None:
+        if quantization_config is None:
+            return None
+
+        return {"type": type(quantization_config).__name__, "config": quantization_config.model_dump(mode="json")}
+
+    @staticmethod
+    def _load_quantization_config(quantization_config: dict | None) -> Any:
+        if quantization_config is None:
+            return None
+
+        return getattr(qdrant_models, quantization_config["type"])(**quantization_config["config"])
+
+
+class AsyncEmbeddedVectorClient:
+    """
+    Exposes the methods of an `EmbeddedVectorClient` as coroutines, in place of `AsyncQdrantClient`.
+    The searches run in worker threads, so the event loop stays free while NumPy releases the GIL.
+    """
+
+    def __init__(self, client: EmbeddedVectorClient) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        async def _method(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return _method
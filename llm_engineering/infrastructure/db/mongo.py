@@ -1,9 +1,25 @@
+import importlib.util
+from typing import TYPE_CHECKING
+
 from loguru import logger
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 
 from llm_engineering.settings import settings
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+
+def _get_client_kwargs() -> dict:
+    return {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+    }
+
 
 class MongoDatabaseConnector:
     _instance: MongoClient | None = None
@@ -11,15 +27,66 @@ class MongoDatabaseConnector:
     def __new__(cls, *args, **kwargs) -> MongoClient:
         if cls._instance is None:
             try:
-                cls._instance = MongoClient(settings.DATABASE_HOST)
+                cls._instance = MongoClient(settings.DATABASE_HOST, **_get_client_kwargs())
             except ConnectionFailure as e:
                 logger.error(f"Couldn't connect to the database: {e!s}")
 
                 raise
 
-        logger.info(f"Connection to MongoDB with URI successful: {settings.DATABASE_HOST}")
+            logger.info(f"Connection to MongoDB with URI successful: {settings.DATABASE_HOST}")
+
+        return cls._instance
+
+
+class AsyncMongoDatabaseConnector:
+    """
+    The asyncio counterpart of `MongoDatabaseConnector`, used by the async methods of the NoSQL documents.
+    Its connection pool is shared by all the coroutines running on the event loop, instead of one thread per query.
+    """
+
+    _instance: "AsyncIOMotorClient | None" = None
+
+    def __new__(cls, *args, **kwargs) -> "AsyncIOMotorClient":
+        if cls._instance is None:
+            try:
+                from motor.motor_asyncio import AsyncIOMotorClient
+            except ImportError as e:
+                raise ImportError(
+                    "The async MongoDB client requires the 'motor' package. Install the project dependencies with: poetry install"
+                ) from e
+
+            cls._instance = AsyncIOMotorClient(settings.DATABASE_HOST, **_get_client_kwargs())
+
+            logger.info(f"Async connection to MongoDB with URI created: {settings.DATABASE_HOST}")
 
         return cls._instance
 
+    @staticmethod
+    def is_available() -> bool:
+        """Checks whether the 'motor' package is installed, without importing it."""
+
+        return importlib.util.find_spec("motor") is not None
+
+
+class LazyMongoClient:
+    """
+    Opens the MongoDB connection on first use instead of at import time.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(MongoDatabaseConnector(), name)
+
+
+connection: MongoClient = LazyMongoClient()  # type: ignore[assignment]
+
+
+class LazyAsyncMongoClient:
+    """
+    Creates the async MongoDB client on first use instead of at import time.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(AsyncMongoDatabaseConnector(), name)
+
 
-connection = MongoDatabaseConnector()
+async_connection: "AsyncIOMotorClient" = LazyAsyncMongoClient()  # type: ignore[assignment]
@@ -1,30 +1,63 @@
 from loguru import logger
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from llm_engineering.settings import settings
 
+VECTOR_DB_BACKENDS = ("qdrant", "embedded")
+
+
+def _get_client_kwargs() -> tuple[dict, str]:
+    if settings.USE_QDRANT_CLOUD:
+        kwargs = {
+            "url": settings.QDRANT_CLOUD_URL,
+            "api_key": settings.QDRANT_APIKEY,
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+        }
+        uri = settings.QDRANT_CLOUD_URL
+    else:
+        kwargs = {
+            "host": settings.QDRANT_DATABASE_HOST,
+            "port": settings.QDRANT_DATABASE_PORT,
+            "grpc_port": settings.QDRANT_GRPC_PORT,
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+        }
+        uri = f"{settings.QDRANT_DATABASE_HOST}:{settings.QDRANT_DATABASE_PORT}"
+
+    return kwargs, uri
+
+
+def _create_embedded_client():
+    from .embedded import EmbeddedVectorClient
+
+    client = EmbeddedVectorClient(
+        path=settings.EMBEDDED_VECTOR_DB_PATH,
+        ivf_num_lists=settings.EMBEDDED_VECTOR_DB_IVF_NUM_LISTS,
+        ivf_num_probes=settings.EMBEDDED_VECTOR_DB_IVF_NUM_PROBES,
+    )
+
+    logger.info(f"Using the embedded vector database stored at: {settings.EMBEDDED_VECTOR_DB_PATH}")
+
+    return client
+
 
 class QdrantDatabaseConnector:
     _instance: QdrantClient | None = None
 
     def __new__(cls, *args, **kwargs) -> QdrantClient:
         if cls._instance is None:
-            try:
-                if settings.USE_QDRANT_CLOUD:
-                    cls._instance = QdrantClient(
-                        url=settings.QDRANT_CLOUD_URL,
-                        api_key=settings.QDRANT_APIKEY,
-                    )
+            assert (
+                settings.VECTOR_DB_BACKEND in VECTOR_DB_BACKENDS
+            ), f"'VECTOR_DB_BACKEND' should be one of {VECTOR_DB_BACKENDS}. Got {settings.VECTOR_DB_BACKEND}."
 
-                    uri = settings.QDRANT_CLOUD_URL
-                else:
-                    cls._instance = QdrantClient(
-                        host=settings.QDRANT_DATABASE_HOST,
-                        port=settings.QDRANT_DATABASE_PORT,
-                    )
+            if settings.VECTOR_DB_BACKEND == "embedded":
+                cls._instance = _create_embedded_client()
 
-                    uri = f"{settings.QDRANT_DATABASE_HOST}:{settings.QDRANT_DATABASE_PORT}"
+                return cls._instance
+
+            try:
+                client_kwargs, uri = _get_client_kwargs()
+                cls._instance = QdrantClient(**client_kwargs)
 
                 logger.info(f"Connection to Qdrant DB with URI successful: {uri}")
             except UnexpectedResponse:
@@ -40,4 +73,50 @@ class QdrantDatabaseConnector:
         return cls._instance
 
 
-connection = QdrantDatabaseConnector()
+class AsyncQdrantDatabaseConnector:
+    """
+    The asyncio counterpart of `QdrantDatabaseConnector`, used by the async search methods of the vector documents.
+    """
+
+    _instance: AsyncQdrantClient | None = None
+
+    def __new__(cls, *args, **kwargs) -> AsyncQdrantClient:
+        if cls._instance is None:
+            if settings.VECTOR_DB_BACKEND == "embedded":
+                from .embedded import AsyncEmbeddedVectorClient
+
+                # Both connectors share the same embedded client, so they see the same collections.
+                cls._instance = AsyncEmbeddedVectorClient(QdrantDatabaseConnector())
+
+                return cls._instance
+
+            client_kwargs, uri = _get_client_kwargs()
+            cls._instance = AsyncQdrantClient(**client_kwargs)
+
+            logger.info(f"Async connection to Qdrant DB with URI created: {uri}")
+
+        return cls._instance
+
+
+class LazyQdrantClient:
+    """
+    Opens the Qdrant connection on first use instead of at import time.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(QdrantDatabaseConnector(), name)
+
+
+connection: QdrantClient = LazyQdrantClient()  # type: ignore[assignment]
+
+
+class LazyAsyncQdrantClient:
+    """
+    Creates the async Qdrant client on first use instead of at import time.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(AsyncQdrantDatabaseConnector(), name)
+
+
+async_connection: AsyncQdrantClient = LazyAsyncQdrantClient()  # type: ignore[assignment]
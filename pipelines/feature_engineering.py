@@ -4,13 +4,39 @@ from steps import feature_engineering as fe_steps
 
 
 @pipeline
-def feature_engineering(author_full_names: list[str], wait_for: str | list[str] | None = None) -> list[str]:
-    raw_documents = fe_steps.query_data_warehouse(author_full_names, after=wait_for)
+def feature_engineering(
+    author_full_names: list[str],
+    wait_for: str | list[str] | None = None,
+    streaming: bool = False,
+    incremental: bool = False,
+) -> list[str]:
+    if streaming:
+        # Runs query -> clean -> chunk -> embed -> load as concurrent stages with bounded memory usage.
+        last_step = fe_steps.stream_feature_engineering(author_full_names, incremental=incremental, after=wait_for)
+
+        return [last_step.invocation_id]
+
+    # In incremental mode, only the documents that changed since the last run are queried and processed.
+    raw_documents = fe_steps.query_data_warehouse(author_full_names, incremental=incremental, after=wait_for)
+
+    # The modified documents keep most of their chunks, so their unchanged points are skipped instead of rewritten.
+    delta = True if incremental else None
 
     cleaned_documents = fe_steps.clean_documents(raw_documents)
-    last_step_1 = fe_steps.load_to_vector_db(cleaned_documents)
+    last_step_1 = fe_steps.load_to_vector_db(cleaned_documents, delta=delta)
 
     embedded_documents = fe_steps.chunk_and_embed(cleaned_documents)
-    last_step_2 = fe_steps.load_to_vector_db(embedded_documents)
+    last_step_2 = fe_steps.load_to_vector_db(embedded_documents, delta=delta)
+
+    if incremental:
+        # The states are saved only once all the documents are loaded, so a failed run is fully retried.
+        last_step = fe_steps.commit_incremental_ingestion(
+            raw_documents,
+            embedded_documents,
+            loaded_cleaned_documents=last_step_1,
+            loaded_embedded_documents=last_step_2,
+        )
+
+        return [last_step.invocation_id]
 
     return [last_step_1.invocation_id, last_step_2.invocation_id]
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from urllib.parse import urlparse
 
 from loguru import logger
@@ -13,11 +14,12 @@ from llm_engineering.domain.documents import UserDocument
 def crawl_links(user: UserDocument, links: list[str]) -> Annotated[list[str], "crawled_links"]:
     dispatcher = CrawlerDispatcher.build().register_linkedin().register_medium().register_github()
 
-    logger.info(f"Starting to crawl {len(links)} link(s).")
+    new_links = _drop_crawled_links(dispatcher, links)
+    logger.info(f"Starting to crawl {len(new_links)} link(s). Skipped {len(links) - len(new_links)} crawled link(s).")
 
     metadata = {}
     successfull_crawls = 0
-    for link in tqdm(links):
+    for link in tqdm(new_links):
         successfull_crawl, crawled_domain = _crawl_link(dispatcher, link, user)
         successfull_crawls += successfull_crawl
 
@@ -26,11 +28,25 @@ def crawl_links(user: UserDocument, links: list[str]) -> Annotated[list[str], "c
     step_context = get_step_context()
     step_context.add_output_metadata(output_name="crawled_links", metadata=metadata)
 
-    logger.info(f"Successfully crawled {successfull_crawls} / {len(links)} links.")
+    logger.info(f"Successfully crawled {successfull_crawls} / {len(new_links)} links.")
 
     return links
 
 
+def _drop_crawled_links(dispatcher: CrawlerDispatcher, links: list[str]) -> list[str]:
+    """Checks which links are already stored with one query per crawler model, before launching any crawler."""
+
+    links_by_model = defaultdict(list)
+    for link in links:
+        links_by_model[dispatcher.get_crawler_class(link).model].append(link)
+
+    crawled_links = set()
+    for model, model_links in links_by_model.items():
+        crawled_links |= model.find_existing_links(model_links)
+
+    return [link for link in links if link not in crawled_links]
+
+
 def _crawl_link(dispatcher: CrawlerDispatcher, link: str, user: UserDocument) -> tuple[bool, str]:
     crawler = dispatcher.get_crawler(link)
     crawler_domain = urlparse(link).netloc
@@ -0,0 +1,26 @@
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from llm_engineering.application.preprocessing import IncrementalIngestion
+
+
+@step
+def commit_incremental_ingestion(
+    raw_documents: Annotated[list, "raw_documents"],
+    embedded_documents: Annotated[list, "embedded_documents"],
+    loaded_cleaned_documents: bool,
+    loaded_embedded_documents: bool,
+) -> Annotated[dict, "incremental_ingestion_report"]:
+    if not (loaded_cleaned_documents and loaded_embedded_documents):
+        # Saving the states would skip the documents that failed to load on every following run.
+        raise RuntimeError("Some documents failed to load into the vector DB. Not committing the ingestion states.")
+
+    incremental_ingestion = IncrementalIngestion()
+    incremental_ingestion.track_documents(raw_documents)
+    incremental_ingestion.track_chunks(embedded_documents)
+    report = incremental_ingestion.commit()
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="incremental_ingestion_report", metadata=report)
+
+    return report
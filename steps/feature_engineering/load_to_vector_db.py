@@ -1,26 +1,26 @@
 from loguru import logger
 from typing_extensions import Annotated
-from zenml import step
+from zenml import get_step_context, step
 
-from llm_engineering.application import utils
 from llm_engineering.domain.base import VectorBaseDocument
 
 
 @step
 def load_to_vector_db(
     documents: Annotated[list, "documents"],
+    delta: bool | None = None,
 ) -> Annotated[bool, "successful"]:
     logger.info(f"Loading {len(documents)} documents into the vector database.")
 
+    reports = {}
     grouped_documents = VectorBaseDocument.group_by_class(documents)
     for document_class, documents in grouped_documents.items():
         logger.info(f"Loading documents into {document_class.get_collection_name()}")
-        for documents_batch in utils.misc.batch(documents, size=4):
-            try:
-                document_class.bulk_insert(documents_batch)
-            except Exception:
-                logger.error(f"Failed to insert documents into {document_class.get_collection_name()}")
 
-                return False
+        report = document_class.bulk_ingest(documents, delta=delta)
+        reports[report.collection_name] = report.to_dict()
 
-    return True
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="successful", metadata=reports)
+
+    return all(report["num_failed"] == 0 for report in reports.values())
@@ -1,10 +1,12 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Generator
 
 from loguru import logger
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from llm_engineering.application import utils
+from llm_engineering.application.preprocessing import IncrementalIngestion
 from llm_engineering.domain.base.nosql import NoSQLBaseDocument
 from llm_engineering.domain.documents import ArticleDocument, Document, PostDocument, RepositoryDocument, UserDocument
 
@@ -12,7 +14,10 @@ from llm_engineering.domain.documents import ArticleDocument, Document, PostDocu
 @step
 def query_data_warehouse(
     author_full_names: list[str],
+    incremental: bool = False,
 ) -> Annotated[list, "raw_documents"]:
+    incremental_ingestion = IncrementalIngestion() if incremental else None
+
     documents = []
     authors = []
     for author_full_name in author_full_names:
@@ -23,24 +28,30 @@ def query_data_warehouse(
         user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
         authors.append(user)
 
-        results = fetch_all_data(user)
+        results = fetch_all_data(user, incremental_ingestion)
         user_documents = [doc for query_result in results.values() for doc in query_result]
 
         documents.extend(user_documents)
 
+    document_ids = [str(document.id) for document in documents] if incremental_ingestion is not None else None
+    metadata = _get_metadata(authors, document_ids)
+    if incremental_ingestion is not None:
+        metadata["num_unchanged_documents"] = incremental_ingestion.num_unchanged
+        metadata["num_removed_documents"] = incremental_ingestion.num_removed
+
     step_context = get_step_context()
-    step_context.add_output_metadata(output_name="raw_documents", metadata=_get_metadata(documents))
+    step_context.add_output_metadata(output_name="raw_documents", metadata=metadata)
 
     return documents
 
 
-def fetch_all_data(user: UserDocument) -> dict[str, list[NoSQLBaseDocument]]:
-    user_id = str(user.id)
+def fetch_all_data(
+    user: UserDocument, incremental_ingestion: IncrementalIngestion | None = None
+) -> dict[str, list[NoSQLBaseDocument]]:
     with ThreadPoolExecutor() as executor:
         future_to_query = {
-            executor.submit(__fetch_articles, user_id): "articles",
-            executor.submit(__fetch_posts, user_id): "posts",
-            executor.submit(__fetch_repositories, user_id): "repositories",
+            executor.submit(__fetch, document_class, user, incremental_ingestion): document_class.get_collection_name()
+            for document_class in (ArticleDocument, PostDocument, RepositoryDocument)
         }
 
         results = {}
@@ -56,31 +67,46 @@ def fetch_all_data(user: UserDocument) -> dict[str, list[NoSQLBaseDocument]]:
     return results
 
 
-def __fetch_articles(user_id) -> list[NoSQLBaseDocument]:
-    return ArticleDocument.bulk_find(author_id=user_id)
+def iter_documents(
+    document_class: type[Document], user: UserDocument, incremental_ingestion: IncrementalIngestion | None = None
+) -> Generator[Document, None, None]:
+    """Streams the documents of the user from a cursor, keeping only the changed ones in incremental mode."""
+
+    documents = document_class.iter_find(author_id=str(user.id))
+    if incremental_ingestion is not None:
+        documents = incremental_ingestion.select_changed(document_class, user.id, documents)
+
+    yield from documents
 
 
-def __fetch_posts(user_id) -> list[NoSQLBaseDocument]:
-    return PostDocument.bulk_find(author_id=user_id)
+def __fetch(
+    document_class: type[Document], user: UserDocument, incremental_ingestion: IncrementalIngestion | None
+) -> list[NoSQLBaseDocument]:
+    return list(iter_documents(document_class, user, incremental_ingestion))
 
 
-def __fetch_repositories(user_id) -> list[NoSQLBaseDocument]:
-    return RepositoryDocument.bulk_find(author_id=user_id)
+def _get_metadata(authors: list[UserDocument], document_ids: list[str] | None = None) -> dict:
+    """Aggregates the metadata from a projected pass over the authors' documents, restricted to `document_ids` if given."""
 
+    filter_options = {"_id": {"$in": document_ids}} if document_ids is not None else {}
 
-def _get_metadata(documents: list[Document]) -> dict:
     metadata = {
-        "num_documents": len(documents),
+        "num_documents": 0,
     }
-    for document in documents:
-        collection = document.get_collection_name()
-        if collection not in metadata:
-            metadata[collection] = {}
-        if "authors" not in metadata[collection]:
-            metadata[collection]["authors"] = list()
-
-        metadata[collection]["num_documents"] = metadata[collection].get("num_documents", 0) + 1
-        metadata[collection]["authors"].append(document.author_full_name)
+    for author in authors:
+        for document_class in (ArticleDocument, PostDocument, RepositoryDocument):
+            collection = document_class.get_collection_name()
+            for document in document_class.iter_find(
+                projection=["author_full_name"], raw=True, author_id=str(author.id), **filter_options
+            ):
+                if collection not in metadata:
+                    metadata[collection] = {}
+                if "authors" not in metadata[collection]:
+                    metadata[collection]["authors"] = list()
+
+                metadata["num_documents"] += 1
+                metadata[collection]["num_documents"] = metadata[collection].get("num_documents", 0) + 1
+                metadata[collection]["authors"].append(document["author_full_name"])
 
     for value in metadata.values():
         if isinstance(value, dict) and "authors" in value:
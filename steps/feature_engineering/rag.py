@@ -1,7 +1,6 @@
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
-from llm_engineering.application import utils
 from llm_engineering.application.preprocessing import ChunkingDispatcher, EmbeddingDispatcher
 from llm_engineering.domain.chunks import Chunk
 from llm_engineering.domain.embedded_chunks import EmbeddedChunk
@@ -13,14 +12,15 @@ def chunk_and_embed(
 ) -> Annotated[list, "embedded_documents"]:
     metadata = {"chunking": {}, "embedding": {}, "num_documents": len(cleaned_documents)}
 
-    embedded_chunks = []
+    chunks = []
     for document in cleaned_documents:
-        chunks = ChunkingDispatcher.dispatch(document)
-        metadata["chunking"] = _add_chunks_metadata(chunks, metadata["chunking"])
+        document_chunks = ChunkingDispatcher.dispatch(document)
+        metadata["chunking"] = _add_chunks_metadata(document_chunks, metadata["chunking"])
 
-        for batched_chunks in utils.misc.batch(chunks, 10):
-            batched_embedded_chunks = EmbeddingDispatcher.dispatch(batched_chunks)
-            embedded_chunks.extend(batched_embedded_chunks)
+        chunks.extend(document_chunks)
+
+    # Embed the chunks of all documents at once, letting the batch scheduler group them by token length.
+    embedded_chunks = EmbeddingDispatcher.dispatch(chunks)
 
     metadata["embedding"] = _add_embeddings_metadata(embedded_chunks, metadata["embedding"])
     metadata["num_chunks"] = len(embedded_chunks)
@@ -0,0 +1,83 @@
+from functools import partial
+from typing import Generator
+
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from llm_engineering.application import utils
+from llm_engineering.application.preprocessing import (
+    ChunkingDispatcher,
+    CleaningDispatcher,
+    EmbeddingDispatcher,
+    IncrementalIngestion,
+    StreamingPipeline,
+    StreamingStage,
+)
+from llm_engineering.domain.base import NoSQLBaseDocument, VectorBaseDocument
+from llm_engineering.domain.documents import ArticleDocument, PostDocument, RepositoryDocument, UserDocument
+from llm_engineering.settings import settings
+
+from .query_data_warehouse import iter_documents
+
+
+@step
+def stream_feature_engineering(
+    author_full_names: list[str],
+    incremental: bool = False,
+) -> Annotated[dict, "streaming_report"]:
+    incremental_ingestion = IncrementalIngestion() if incremental else None
+    # The modified documents keep most of their chunks, so their unchanged points are skipped instead of rewritten.
+    load_to_vector_db = partial(_load_to_vector_db, delta=True if incremental else None)
+
+    stages = [
+        StreamingStage("clean", _clean),
+        StreamingStage("load_cleaned_documents", load_to_vector_db, batch_size=settings.FE_STREAMING_UPSERT_BATCH_SIZE),
+        StreamingStage("chunk", _chunk),
+        StreamingStage("embed", EmbeddingDispatcher.dispatch, batch_size=settings.FE_STREAMING_EMBEDDING_BATCH_SIZE),
+        StreamingStage("load_embedded_chunks", load_to_vector_db, batch_size=settings.FE_STREAMING_UPSERT_BATCH_SIZE),
+    ]
+    if incremental_ingestion is not None:
+        stages.append(StreamingStage("track_chunks", incremental_ingestion.track_chunks))
+
+    pipeline = StreamingPipeline(stages=stages, queue_size=settings.FE_STREAMING_QUEUE_SIZE)
+    report = pipeline.run(_query_data_warehouse(author_full_names, incremental_ingestion))
+    if incremental_ingestion is not None:
+        report["incremental_ingestion"] = incremental_ingestion.commit()
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="streaming_report", metadata=report)
+
+    return report
+
+
+def _query_data_warehouse(
+    author_full_names: list[str], incremental_ingestion: IncrementalIngestion | None = None
+) -> Generator[NoSQLBaseDocument, None, None]:
+    for author_full_name in author_full_names:
+        logger.info(f"Querying data warehouse for user: {author_full_name}")
+
+        first_name, last_name = utils.split_user_full_name(author_full_name)
+        user = UserDocument.get_or_create(first_name=first_name, last_name=last_name)
+
+        # The documents are streamed from the cursors, so only a few batches of them are held in memory at a time.
+        for document_class in (ArticleDocument, PostDocument, RepositoryDocument):
+            yield from iter_documents(document_class, user, incremental_ingestion)
+
+
+def _clean(documents: list[NoSQLBaseDocument]) -> list[VectorBaseDocument]:
+    return [CleaningDispatcher.dispatch(document) for document in documents]
+
+
+def _chunk(cleaned_documents: list[VectorBaseDocument]) -> list[VectorBaseDocument]:
+    return [chunk for document in cleaned_documents for chunk in ChunkingDispatcher.dispatch(document)]
+
+
+def _load_to_vector_db(documents: list[VectorBaseDocument], delta: bool | None = None) -> list[VectorBaseDocument]:
+    for document_class, class_documents in VectorBaseDocument.group_by_class(documents).items():
+        report = document_class.bulk_ingest(class_documents, delta=delta)
+        if not report.successful:
+            raise RuntimeError(f"Failed to insert {report.num_failed} documents into {report.collection_name}")
+
+    # The documents are passed through, so the cleaned documents can be chunked after being loaded.
+    return documents
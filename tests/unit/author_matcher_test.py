@@ -0,0 +1,56 @@
+import pytest
+
+from llm_engineering.application.rag.author_matcher import AuthorNameMatcher
+from llm_engineering.domain.documents import UserDocument
+
+PAUL = UserDocument(first_name="Paul", last_name="Iusztin")
+MAXIME = UserDocument(first_name="Maxime", last_name="Labonne")
+ANNA = UserDocument(first_name="Anna Maria", last_name="Smith")
+MARIA = UserDocument(first_name="Maria", last_name="Smith")
+JOHN = UserDocument(first_name="John", last_name="Doe")
+JANE = UserDocument(first_name="Jane", last_name="Doe")
+ANNA_POST = UserDocument(first_name="Anna", last_name="Post")
+IAN = UserDocument(first_name="Ian", last_name="Wright")
+
+
+@pytest.fixture
+def matcher() -> AuthorNameMatcher:
+    return AuthorNameMatcher([PAUL, MAXIME, ANNA, MARIA, JOHN, JANE, ANNA_POST, IAN])
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "I am Paul Iusztin. Write an article about the best types of advanced RAG methods.",
+        "My name is iusztin, paul and I want a post about LLMs",
+        "Write like P. Iusztin about vector databases",
+        "Write like P.Iusztin about vector databases",
+        f"Write a post for the user {PAUL.id}",
+    ],
+)
+def test_matches_name_variants(matcher, query) -> None:
+    assert matcher.match(query) == PAUL
+
+
+def test_prefers_the_longest_name(matcher) -> None:
+    assert matcher.match("Anna Maria Smith wants an article about RAG") == ANNA
+    assert matcher.match("Maria Smith wants an article about RAG") == MARIA
+    assert matcher.match("Anna Smith wants an article about RAG") == ANNA
+
+
+def test_matches_whole_words_only(matcher) -> None:
+    assert matcher.match("Write an article about Paul Iusztinson's work") is None
+    assert matcher.match("What are the best types of advanced RAG methods?") is None
+
+
+def test_requires_a_period_after_initials(matcher) -> None:
+    assert matcher.match("Write a post about RAG pipelines") is None
+    assert matcher.match("I wright code every day") is None
+    assert matcher.match("Write like P Iusztin about vector databases") is None
+    assert matcher.match("Write like A. Post about RAG pipelines") == ANNA_POST
+
+
+def test_ignores_ambiguous_mentions(matcher) -> None:
+    assert matcher.match("J. Doe wants an article about RAG") is None
+    assert matcher.match("Jane Doe wants an article about RAG") == JANE
+    assert matcher.match("Paul Iusztin and Maxime Labonne want an article about RAG") is None
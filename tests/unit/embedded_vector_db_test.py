@@ -0,0 +1,175 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    HasIdCondition,
+    MatchAny,
+    MatchValue,
+    PointStruct,
+    SearchParams,
+    SearchRequest,
+    VectorParams,
+)
+
+from llm_engineering.infrastructure.db.embedded import EmbeddedVectorClient
+
+VECTOR_SIZE = 16
+NUM_POINTS = 500
+
+
+def _create_points(seed: int = 0) -> list[PointStruct]:
+    rng = np.random.default_rng(seed)
+
+    return [
+        PointStruct(
+            id=str(uuid.UUID(int=int(rng.integers(2**63)))),
+            vector=rng.normal(size=VECTOR_SIZE).tolist(),
+            payload={"author_id": f"author-{i % 5}", "position": i},
+        )
+        for i in range(NUM_POINTS)
+    ]
+
+
+def _populate(client, points: list[PointStruct]) -> None:
+    client.create_collection("chunks", vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE))
+    client.upsert("chunks", points=points)
+
+
+@pytest.fixture
+def points() -> list[PointStruct]:
+    return _create_points()
+
+
+@pytest.fixture
+def embedded_client(tmp_path, points) -> EmbeddedVectorClient:
+    client = EmbeddedVectorClient(path=tmp_path)
+    _populate(client, points)
+
+    return client
+
+
+@pytest.fixture
+def reference_client(points) -> QdrantClient:
+    client = QdrantClient(":memory:")
+    _populate(client, points)
+
+    return client
+
+
+def test_search_matches_qdrant(embedded_client, reference_client) -> None:
+    query = np.random.default_rng(1).normal(size=VECTOR_SIZE).tolist()
+    query_filter = Filter(must=[FieldCondition(key="author_id", match=MatchAny(any=["author-1", "author-3"]))])
+
+    for kwargs in ({}, {"query_filter": query_filter}):
+        expected = reference_client.search("chunks", query_vector=query, limit=10, **kwargs)
+        found = embedded_client.search("chunks", query_vector=query, limit=10, **kwargs)
+
+        assert [point.id for point in found] == [point.id for point in expected]
+        assert np.allclose([point.score for point in found], [point.score for point in expected], atol=1e-5)
+        assert [point.payload for point in found] == [point.payload for point in expected]
+
+
+def test_search_batch_matches_single_searches(embedded_client) -> None:
+    queries = np.random.default_rng(2).normal(size=(4, VECTOR_SIZE)).tolist()
+    query_filter = Filter(must=[FieldCondition(key="author_id", match=MatchValue(value="author-2"))])
+    requests = [
+        SearchRequest(vector=query, limit=5, filter=query_filter if i % 2 else None) for i, query in enumerate(queries)
+    ]
+
+    batch_results = embedded_client.search_batch("chunks", requests=requests)
+
+    for request, results in zip(requests, batch_results, strict=True):
+        expected = embedded_client.search("chunks", query_vector=request.vector, limit=5, query_filter=request.filter)
+        assert [point.id for point in results] == [point.id for point in expected]
+
+
+def test_search_handles_zero_limit_and_concurrent_queries(embedded_client) -> None:
+    queries = np.random.default_rng(3).normal(size=(8, VECTOR_SIZE)).tolist()
+    expected = [
+        [point.id for point in embedded_client.search("chunks", query_vector=query, limit=5)] for query in queries
+    ]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        found = list(
+            executor.map(
+                lambda query: [point.id for point in embedded_client.search("chunks", query, limit=5)], queries
+            )
+        )
+
+    assert found == expected
+    assert embedded_client.search("chunks", query_vector=queries[0], limit=0) == []
+
+
+def test_scroll_and_delete(embedded_client, reference_client, points) -> None:
+    scrolled_ids = []
+    offset = None
+    while True:
+        records, offset = embedded_client.scroll("chunks", limit=64, offset=offset, with_payload=["position"])
+        scrolled_ids.extend(record.id for record in records)
+        assert all(set(record.payload) == {"position"} for record in records)
+        if offset is None:
+            break
+
+    expected_records, _ = reference_client.scroll("chunks", limit=NUM_POINTS)
+    assert scrolled_ids == [record.id for record in expected_records]
+
+    deleted_ids = [point.id for point in points[:10]]
+    embedded_client.delete("chunks", points_selector=Filter(must=[HasIdCondition(has_id=deleted_ids)]))
+
+    assert embedded_client.count("chunks").count == NUM_POINTS - 10
+    assert embedded_client.retrieve("chunks", ids=deleted_ids) == []
+
+
+def test_collections_persist_across_clients(tmp_path, embedded_client, points) -> None:
+    embedded_client.close()
+
+    client = EmbeddedVectorClient(path=tmp_path)
+    records = client.retrieve("chunks", ids=[points[0].id], with_vectors=True)
+
+    expected_vector = np.asarray(points[0].vector) / np.linalg.norm(points[0].vector)
+    assert np.allclose(records[0].vector, expected_vector, atol=1e-6)
+    assert client.get_collection("chunks").points_count == NUM_POINTS
+
+    with pytest.raises(UnexpectedResponse):
+        client.get_collection("missing")
+
+
+def test_clients_sharing_a_path_see_each_other_writes(tmp_path, embedded_client, points) -> None:
+    other_client = EmbeddedVectorClient(path=tmp_path)
+    new_points = _create_points(seed=1)[:3]
+
+    other_client.upsert("chunks", points=new_points[:1])
+    embedded_client.upsert("chunks", points=new_points[1:2])
+    other_client.upsert("chunks", points=new_points[2:])
+
+    for client in (embedded_client, other_client):
+        assert client.count("chunks").count == NUM_POINTS + 3
+        for point in new_points:
+            hits = client.search("chunks", query_vector=point.vector, limit=1)
+            assert hits[0].id == point.id
+            assert hits[0].payload == point.payload
+
+    other_client.delete("chunks", points_selector=[new_points[0].id])
+    assert embedded_client.retrieve("chunks", ids=[new_points[0].id]) == []
+    assert embedded_client.search("chunks", query_vector=new_points[0].vector, limit=1)[0].id != new_points[0].id
+
+
+def test_ivf_search_approximates_exact_search(tmp_path, points) -> None:
+    client = EmbeddedVectorClient(path=tmp_path, ivf_num_lists=4, ivf_num_probes=2)
+    _populate(client, points)
+
+    queries = np.random.default_rng(3).normal(size=(20, VECTOR_SIZE)).tolist()
+    recalls = []
+    for query in queries:
+        exact = client.search("chunks", query_vector=query, limit=10, search_params=SearchParams(exact=True))
+        approximate = client.search("chunks", query_vector=query, limit=10)
+        recalls.append(len({point.id for point in exact} & {point.id for point in approximate}) / 10)
+
+    assert np.mean(recalls) >= 0.5
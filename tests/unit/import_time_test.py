@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+import time
+
+IMPORT_TIME_BUDGET_SECONDS = 3.0
+HEAVY_MODULES = (
+    "chromedriver_autoinstaller",
+    "datasets",
+    "langchain",
+    "selenium",
+    "sentence_transformers",
+    "torch",
+    "transformers",
+    "zenml",
+)
+
+PROBE = """
+import json
+import sys
+
+import llm_engineering.application.networks
+import llm_engineering.application.preprocessing
+import llm_engineering.domain
+from llm_engineering.infrastructure.db.mongo import MongoDatabaseConnector
+from llm_engineering.infrastructure.db.qdrant import QdrantDatabaseConnector
+from llm_engineering.settings import settings
+
+print(
+    json.dumps(
+        {
+            "loaded_modules": sorted({name.split(".")[0] for name in sys.modules}),
+            "settings_loaded": settings.is_loaded,
+            "mongo_connected": MongoDatabaseConnector._instance is not None,
+            "qdrant_connected": QdrantDatabaseConnector._instance is not None,
+        }
+    )
+)
+"""
+
+
+def test_package_import_has_no_side_effects() -> None:
+    start_time = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+    elapsed_time = time.perf_counter() - start_time
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert not set(HEAVY_MODULES) & set(report["loaded_modules"])
+    assert report["settings_loaded"] is False
+    assert report["mongo_connected"] is False
+    assert report["qdrant_connected"] is False
+    assert elapsed_time < IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from pymongo import errors
+
+from llm_engineering.domain.base.nosql import NoSQLBaseDocument
+from llm_engineering.domain.documents import UserDocument
+
+
+class _FakeAsyncCollection:
+    """Stands in for a Motor collection, holding the documents in memory."""
+
+    def __init__(self) -> None:
+        self.documents: list[dict] = []
+
+    async def find_one(self, filter_options: dict) -> dict | None:
+        for document in self.documents:
+            if all(document.get(key) == value for key, value in filter_options.items()):
+                return dict(document)
+
+        return None
+
+    async def insert_one(self, document: dict) -> None:
+        self.documents.append(document)
+
+
+@pytest.fixture
+def collection(monkeypatch) -> _FakeAsyncCollection:
+    collection = _FakeAsyncCollection()
+
+    async def _aget_collection(cls) -> _FakeAsyncCollection:
+        return collection
+
+    monkeypatch.setattr(NoSQLBaseDocument, "_aget_collection", classmethod(_aget_collection))
+
+    return collection
+
+
+def test_aget_or_create_creates_then_finds_the_document(collection) -> None:
+    created = asyncio.run(UserDocument.aget_or_create(first_name="Paul", last_name="Iusztin"))
+    found = asyncio.run(UserDocument.aget_or_create(first_name="Paul", last_name="Iusztin"))
+
+    assert len(collection.documents) == 1
+    assert collection.documents[0]["_id"] == str(created.id)
+    assert found == created
+
+
+def test_afind(collection) -> None:
+    user = UserDocument(first_name="Maxime", last_name="Labonne")
+    collection.documents.append(user.to_mongo())
+
+    assert asyncio.run(UserDocument.afind(first_name="Maxime")) == user
+    assert asyncio.run(UserDocument.afind(first_name="Paul")) is None
+
+
+def test_afind_returns_none_on_failure(collection, monkeypatch) -> None:
+    async def _find_one(filter_options: dict) -> None:
+        raise errors.OperationFailure("Failed.")
+
+    monkeypatch.setattr(collection, "find_one", _find_one)
+
+    assert asyncio.run(UserDocument.afind(first_name="Paul")) is None
@@ -0,0 +1,75 @@
+import uuid
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from qdrant_client.models import Record
+
+from llm_engineering.domain.base.vector import FINGERPRINT_PAYLOAD_KEY
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+
+
+def _create_record(**payload_overrides) -> Record:
+    payload = {
+        "content": "How does RAG integrate vector databases with LLMs?",
+        "platform": "medium",
+        "document_id": str(uuid.uuid4()),
+        "author_id": str(uuid.uuid4()),
+        "author_full_name": "Paul Iusztin",
+        "link": "https://medium.com/rag",
+        **payload_overrides,
+    }
+
+    return Record(id=str(uuid.uuid4()), payload=payload, vector=np.random.rand(8).tolist())
+
+
+def test_from_records_matches_validation() -> None:
+    records = [_create_record() for _ in range(3)]
+    expected = [EmbeddedArticleChunk(id=record.id, embedding=record.vector, **record.payload) for record in records]
+
+    documents = EmbeddedArticleChunk.from_records(records)
+
+    assert documents == expected
+    for document, expected_document in zip(documents, expected, strict=True):
+        assert document.model_dump(exclude={"embedding"}) == expected_document.model_dump(exclude={"embedding"})
+        assert document.embedding.dtype == np.float32
+        assert np.array_equal(document.embedding, expected_document.embedding)
+
+
+def test_from_records_hydrates_projected_payloads() -> None:
+    author_id = uuid.uuid4()
+    projected_record = Record(id=str(uuid.uuid4()), payload={"author_id": str(author_id)})
+
+    full_document, projected_document = EmbeddedArticleChunk.from_records([_create_record(), projected_record])
+
+    assert full_document.content
+    assert projected_document.author_id == author_id
+    assert projected_document.metadata == {}
+    assert "content" not in projected_document.model_fields_set
+
+
+def test_from_records_rejects_invalid_payloads() -> None:
+    with pytest.raises(ValidationError):
+        EmbeddedArticleChunk.from_records([_create_record(author_id="not-a-uuid")])
+
+
+def test_fingerprint_tracks_payload_and_vector_changes() -> None:
+    document = EmbeddedArticleChunk.from_record(_create_record())
+    point = document.to_point()
+
+    assert point.payload[FINGERPRINT_PAYLOAD_KEY] == document.to_point().payload[FINGERPRINT_PAYLOAD_KEY]
+    assert EmbeddedArticleChunk.from_record(Record(id=point.id, payload=point.payload, vector=point.vector)) == document
+
+    changed_content = document.model_copy(update={"content": "What is a vector database?"})
+    changed_embedding = document.model_copy(update={"embedding": document.embedding + 1.0})
+    assert changed_content.to_point().payload[FINGERPRINT_PAYLOAD_KEY] != point.payload[FINGERPRINT_PAYLOAD_KEY]
+    assert changed_embedding.to_point().payload[FINGERPRINT_PAYLOAD_KEY] != point.payload[FINGERPRINT_PAYLOAD_KEY]
+
+
+def test_from_records_leaves_payloads_untouched() -> None:
+    record = _create_record()
+    payload = dict(record.payload)
+
+    EmbeddedArticleChunk.from_records([record])
+
+    assert record.payload == payload
@@ -0,0 +1,64 @@
+import uuid
+
+import httpx
+import numpy as np
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import Record
+
+from llm_engineering.domain.base import vector
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+from llm_engineering.settings import Settings
+
+
+def _unexpected_response(status_code: int) -> UnexpectedResponse:
+    return UnexpectedResponse(status_code=status_code, reason_phrase="", content=b"", headers=httpx.Headers())
+
+
+def _create_record() -> Record:
+    payload = {
+        "content": "How does RAG integrate vector databases with LLMs?",
+        "platform": "medium",
+        "document_id": str(uuid.uuid4()),
+        "author_id": str(uuid.uuid4()),
+        "author_full_name": "Paul Iusztin",
+        "link": "https://medium.com/rag",
+    }
+
+    return Record(id=str(uuid.uuid4()), payload=payload, vector=np.random.rand(8).tolist())
+
+
+class _FailingConnection:
+    """Returns one page of records, then fails every scroll with the given status code."""
+
+    def __init__(self, status_code: int, num_successful_pages: int) -> None:
+        self._status_code = status_code
+        self._num_successful_pages = num_successful_pages
+
+    def scroll(self, offset=None, **kwargs) -> tuple[list[Record], str | None]:
+        if self._num_successful_pages == 0:
+            raise _unexpected_response(self._status_code)
+        self._num_successful_pages -= 1
+
+        return [_create_record()], str(uuid.UUID(int=2**127 - 1))
+
+
+@pytest.fixture(autouse=True)
+def default_settings(monkeypatch) -> None:
+    # Skips the ZenML secret store, the scans only read the QDRANT_SCROLL_* defaults.
+    monkeypatch.setattr(vector, "settings", Settings())
+
+
+def test_iter_all_of_missing_collection_is_empty(monkeypatch) -> None:
+    monkeypatch.setattr(vector, "connection", _FailingConnection(status_code=404, num_successful_pages=0))
+
+    assert list(EmbeddedArticleChunk.iter_all(parallelism=1)) == []
+    assert list(EmbeddedArticleChunk.iter_all(parallelism=2)) == []
+
+
+@pytest.mark.parametrize("parallelism", [1, 2])
+def test_iter_all_raises_on_failure_after_the_first_page(monkeypatch, parallelism: int) -> None:
+    monkeypatch.setattr(vector, "connection", _FailingConnection(status_code=500, num_successful_pages=1))
+
+    with pytest.raises(UnexpectedResponse):
+        list(EmbeddedArticleChunk.iter_all(parallelism=parallelism))
@@ -0,0 +1,91 @@
+import random
+import re
+import time
+
+import click
+from loguru import logger
+
+from llm_engineering.application.preprocessing.operations import chunk_article
+
+WORDS = ["vector", "database", "LLM", "embedding", "retrieval", "model", "the", "of", "a", "fine-tuning", "RAG"]
+SENTENCE_SUFFIXES = [".", ".", ".", "?", "!", " e.g. this.", " i.e. that.", " Mr. Smith.", " Dr. Who?", " v1.2.3."]
+SEPARATORS = [" ", " ", " ", " ", "  ", "\n", "\n\n", "\t"]
+
+
+def chunk_article_reference(text: str, min_length: int, max_length: int) -> list[str]:
+    """The previous regex-split and concatenation based implementation, kept as the parity reference."""
+
+    sentences = re.split(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s", text)
+
+    extracts = []
+    current_chunk = ""
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        if len(current_chunk) + len(sentence) <= max_length:
+            current_chunk += sentence + " "
+        else:
+            if len(current_chunk) >= min_length:
+                extracts.append(current_chunk.strip())
+            current_chunk = sentence + " "
+
+    if len(current_chunk) >= min_length:
+        extracts.append(current_chunk.strip())
+
+    return extracts
+
+
+def generate_document(num_characters: int, rng: random.Random) -> str:
+    parts = []
+    size = 0
+    while size < num_characters:
+        sentence = " ".join(rng.choices(WORDS, k=rng.randint(1, 40))) + rng.choice(SENTENCE_SUFFIXES)
+        separator = rng.choice(SEPARATORS)
+        parts.append(sentence + separator)
+        size += len(sentence) + len(separator)
+
+    return "".join(parts)[:num_characters]
+
+
+@click.command()
+@click.option("--document-size", default=1_000_000, type=int, help="Number of characters of each synthetic document.")
+@click.option("--num-documents", default=5, type=int, help="Number of synthetic documents to benchmark on.")
+@click.option("--min-length", default=1000, type=int, help="The 'min_length' argument of chunk_article().")
+@click.option("--max-length", default=2000, type=int, help="The 'max_length' argument of chunk_article().")
+@click.option("--num-parity-checks", default=500, type=int, help="Number of small random documents checked for parity.")
+@click.option("--seed", default=42, type=int, help="Seed of the synthetic documents generator.")
+def main(
+    document_size: int, num_documents: int, min_length: int, max_length: int, num_parity_checks: int, seed: int
+) -> None:
+    rng = random.Random(seed)
+
+    logger.info(f"Checking the parity with the reference implementation on {num_parity_checks} random documents.")
+    for _ in range(num_parity_checks):
+        text = generate_document(rng.randint(0, 5000), rng)
+        check_min_length = rng.randint(0, 500)
+        check_max_length = rng.randint(check_min_length, 1500)
+
+        assert chunk_article(text, check_min_length, check_max_length) == chunk_article_reference(
+            text, check_min_length, check_max_length
+        ), "chunk_article() diverges from the reference implementation."
+
+    documents = [generate_document(document_size, rng) for _ in range(num_documents)]
+
+    timings = {}
+    for name, chunk_fn in (("reference", chunk_article_reference), ("chunk_article", chunk_article)):
+        start_time = time.perf_counter()
+        results = [chunk_fn(document, min_length, max_length) for document in documents]
+        timings[name] = (time.perf_counter() - start_time) / num_documents
+
+        logger.info(
+            f"{name}: {timings[name] * 1000:.1f} ms per document.",
+            num_chunks=sum(len(result) for result in results),
+        )
+
+    logger.info(f"Speedup: {timings['reference'] / timings['chunk_article']:.2f}x on {document_size} characters.")
+
+
+if __name__ == "__main__":
+    main()
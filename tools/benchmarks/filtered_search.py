@@ -0,0 +1,140 @@
+import time
+import uuid
+
+import click
+import numpy as np
+from loguru import logger
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PayloadSchemaType,
+    VectorParams,
+)
+
+from llm_engineering.infrastructure.db.qdrant import connection
+
+
+def create_collection(collection_name: str, dimension: int, with_payload_index: bool) -> None:
+    if connection.collection_exists(collection_name):
+        connection.delete_collection(collection_name)
+
+    connection.create_collection(
+        collection_name=collection_name, vectors_config=VectorParams(size=dimension, distance=Distance.COSINE)
+    )
+
+    # Created before uploading, so Qdrant can build the filter-aware HNSW links while indexing the points.
+    if with_payload_index:
+        connection.create_payload_index(
+            collection_name=collection_name, field_name="author_id", field_schema=PayloadSchemaType.KEYWORD
+        )
+
+
+def upload_points(
+    collection_name: str, num_points: int, dimension: int, author_ids: list[str], batch_size: int, seed: int
+) -> None:
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_points, batch_size):
+        size = min(batch_size, num_points - start)
+        vectors = rng.standard_normal((size, dimension), dtype=np.float32)
+        payloads = [{"author_id": author_ids[i]} for i in rng.integers(0, len(author_ids), size=size)]
+
+        connection.upload_collection(
+            collection_name=collection_name,
+            vectors=vectors,
+            payload=payloads,
+            ids=range(start, start + size),
+            batch_size=batch_size,
+            wait=False,
+        )
+
+    wait_until_indexed(collection_name)
+
+
+def wait_until_indexed(collection_name: str, poll_interval: float = 5.0) -> None:
+    while True:
+        collection_info = connection.get_collection(collection_name)
+        if collection_info.status == "green":
+            return
+
+        logger.info(
+            f"Waiting for '{collection_name}' to be indexed.",
+            indexed_vectors_count=collection_info.indexed_vectors_count,
+            points_count=collection_info.points_count,
+        )
+        time.sleep(poll_interval)
+
+
+def measure_search_latency(
+    collection_name: str, num_queries: int, dimension: int, author_ids: list[str], limit: int, seed: int
+) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+
+    latencies = []
+    for _ in range(num_queries):
+        query_filter = Filter(
+            must=[FieldCondition(key="author_id", match=MatchValue(value=str(rng.choice(author_ids))))]
+        )
+        query_vector = rng.standard_normal(dimension, dtype=np.float32).tolist()
+
+        start_time = time.perf_counter()
+        connection.search(
+            collection_name=collection_name, query_vector=query_vector, query_filter=query_filter, limit=limit
+        )
+        latencies.append(time.perf_counter() - start_time)
+
+    return np.array(latencies) * 1000
+
+
+@click.command()
+@click.option("--num-points", default=1_000_000, type=int, help="Number of points of each benchmark collection.")
+@click.option("--dimension", default=384, type=int, help="Dimension of the random vectors.")
+@click.option("--num-authors", default=1000, type=int, help="Number of distinct author_id values.")
+@click.option("--num-queries", default=500, type=int, help="Number of filtered searches per collection.")
+@click.option("--limit", default=3, type=int, help="Number of results of every search.")
+@click.option("--batch-size", default=10_000, type=int, help="Number of points uploaded per batch.")
+@click.option("--seed", default=42, type=int, help="Seed of the random vectors and payloads.")
+@click.option("--keep-collections", is_flag=True, default=False, help="Don't delete the benchmark collections.")
+def main(
+    num_points: int,
+    dimension: int,
+    num_authors: int,
+    num_queries: int,
+    limit: int,
+    batch_size: int,
+    seed: int,
+    keep_collections: bool,
+) -> None:
+    author_ids = [str(uuid.UUID(int=i, version=4)) for i in range(num_authors)]
+
+    results = {}
+    for with_payload_index in (False, True):
+        collection_name = f"benchmark_filtered_search_{'indexed' if with_payload_index else 'not_indexed'}"
+
+        logger.info(f"Uploading {num_points} points into '{collection_name}'.")
+        create_collection(collection_name, dimension, with_payload_index)
+        upload_points(collection_name, num_points, dimension, author_ids, batch_size, seed)
+
+        latencies = measure_search_latency(collection_name, num_queries, dimension, author_ids, limit, seed)
+        results[collection_name] = latencies
+
+        logger.info(
+            f"Filtered search latency on '{collection_name}'.",
+            mean_ms=round(float(latencies.mean()), 2),
+            p50_ms=round(float(np.percentile(latencies, 50)), 2),
+            p95_ms=round(float(np.percentile(latencies, 95)), 2),
+            p99_ms=round(float(np.percentile(latencies, 99)), 2),
+        )
+
+        if not keep_collections:
+            connection.delete_collection(collection_name)
+
+    not_indexed, indexed = results.values()
+    logger.info(
+        f"Speedup of the p50 latency with the payload index: {np.median(not_indexed) / np.median(indexed):.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
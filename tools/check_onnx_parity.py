@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import click
+from loguru import logger
+
+from llm_engineering.application.networks import CrossEncoderModelSingleton, EmbeddingModelSingleton
+
+
+@click.command()
+@click.option(
+    "--data-file",
+    default=Path("data/artifacts/cleaned_documents.json"),
+    type=Path,
+    help="Path to an exported cleaned documents artifact used as parity samples.",
+)
+@click.option(
+    "--num-samples",
+    default=64,
+    type=int,
+    help="Number of documents used for the parity check.",
+)
+@click.option(
+    "--query",
+    default="How does RAG integrate vector databases with LLMs?",
+    help="Query used to rerank the sampled documents.",
+)
+@click.option(
+    "--min-cosine-similarity",
+    default=0.98,
+    type=float,
+    help="Minimum cosine similarity accepted between the PyTorch and ONNX embeddings.",
+)
+@click.option(
+    "--min-rank-agreement",
+    default=0.8,
+    type=float,
+    help="Minimum fraction of identical ranks accepted between the PyTorch and ONNX rerankers.",
+)
+def main(
+    data_file: Path,
+    num_samples: int,
+    query: str,
+    min_cosine_similarity: float,
+    min_rank_agreement: float,
+) -> None:
+    with data_file.open("r") as f:
+        documents = json.load(f)["artifact_data"][:num_samples]
+    texts = [document["content"][:2000] for document in documents]
+
+    logger.info(f"Checking the ONNX backend parity on {len(texts)} samples from {data_file}.")
+
+    cosine_similarity = EmbeddingModelSingleton(backend="onnx").check_backend_parity(texts)
+    logger.info(f"Minimum cosine similarity between the PyTorch and ONNX embeddings: {cosine_similarity:.4f}")
+
+    rank_agreement = CrossEncoderModelSingleton(backend="onnx").check_backend_parity([(query, text) for text in texts])
+    logger.info(f"Rank agreement between the PyTorch and ONNX rerankers: {rank_agreement:.2%}")
+
+    assert cosine_similarity >= min_cosine_similarity, "The ONNX embeddings diverge from the PyTorch model."
+    assert rank_agreement >= min_rank_agreement, "The ONNX reranking diverges from the PyTorch model."
+
+    logger.info("The ONNX backend is within the parity thresholds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import json
+import re
 from pathlib import Path
+from typing import Generator
 
 import click
 from loguru import logger
@@ -7,6 +9,8 @@ from loguru import logger
 from llm_engineering.domain.base.nosql import NoSQLBaseDocument
 from llm_engineering.domain.documents import ArticleDocument, PostDocument, RepositoryDocument, UserDocument
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
 
 @click.command()
 @click.option(
@@ -52,13 +56,21 @@ def __export(data_dir: Path) -> None:
 
 
 def __export_data_category(data_dir: Path, category_class: type[NoSQLBaseDocument]) -> None:
-    data = category_class.bulk_find()
-    serialized_data = [d.to_mongo() for d in data]
     export_file = data_dir / f"{category_class.__name__}.json"
 
-    logger.info(f"Exporting {len(serialized_data)} items of {category_class.__name__} to {export_file}...")
+    logger.info(f"Exporting items of {category_class.__name__} to {export_file}...")
+    # The raw documents are written as they are streamed from the cursor, instead of being loaded and validated at once.
+    num_items = 0
     with export_file.open("w") as f:
-        json.dump(serialized_data, f)
+        f.write("[")
+        for item in category_class.iter_find(raw=True):
+            if num_items > 0:
+                f.write(", ")
+            json.dump(item, f)
+            num_items += 1
+        f.write("]")
+
+    logger.info(f"Exported {num_items} items of {category_class.__name__} to {export_file}.")
 
 
 def __import(data_dir: Path) -> None:
@@ -86,13 +98,57 @@ def __import(data_dir: Path) -> None:
 
 
 def __import_data_category(file: Path, category_class: type[NoSQLBaseDocument]) -> None:
-    with file.open("r") as f:
-        data = json.load(f)
+    logger.info(f"Importing items of {category_class.__name__} from {file}...")
+
+    # The items are upserted by id as they are parsed, so re-importing a dump is idempotent and its size is not
+    # bounded by the available memory.
+    documents = (category_class.from_mongo(item) for item in __iter_json_array(file))
+    report = category_class.bulk_write(documents, upsert_keys=("_id",))
 
-    logger.info(f"Importing {len(data)} items of {category_class.__name__} from {file}...")
-    if len(data) > 0:
-        deserialized_data = [category_class.from_mongo(d) for d in data]
-        category_class.bulk_insert(deserialized_data)
+    logger.info(
+        f"Imported {report.num_documents - report.num_failed} / {report.num_documents} items of "
+        f"{category_class.__name__} from {file}.",
+        num_inserted=report.num_upserted,
+        num_updated=report.num_modified,
+        num_failed=report.num_failed,
+    )
+
+
+def __iter_json_array(file: Path, chunk_size: int = 1 << 20) -> Generator[dict, None, None]:
+    """Parses the items of a JSON array file one by one, reading it in chunks."""
+
+    decoder = json.JSONDecoder()
+    with file.open("r") as f:
+        buffer = f.read(chunk_size).lstrip()
+        assert buffer.startswith("["), f"{file} doesn't contain a JSON array."
+        idx = 1
+
+        read_size = chunk_size
+        while True:
+            idx = _WHITESPACE.match(buffer, idx).end()
+            if buffer.startswith(",", idx):
+                idx = _WHITESPACE.match(buffer, idx + 1).end()
+            if buffer.startswith("]", idx):
+                return
+
+            try:
+                item, idx = decoder.raw_decode(buffer, idx)
+            except json.JSONDecodeError:
+                # The item is cut by the end of the buffer. The reads double while it stays incomplete, so an item
+                # spanning many chunks is re-parsed a logarithmic number of times, in linear time overall.
+                chunk = f.read(read_size)
+                if not chunk:
+                    raise
+
+                # The parsed items are dropped only here, so the buffer is copied once per chunk, not once per item.
+                buffer = buffer[idx:] + chunk
+                idx = 0
+                read_size *= 2
+
+                continue
+
+            read_size = chunk_size
+            yield item
 
 
 if __name__ == "__main__":
@@ -80,6 +80,11 @@ Examples:
     default=False,
     help="Whether to run the FE pipeline.",
 )
+@click.option(
+    "--feature-engineering-config-filename",
+    default="feature_engineering.yaml",
+    help="Filename of the FE config file.",
+)
 @click.option(
     "--run-generate-instruct-datasets",
     is_flag=True,
@@ -117,6 +122,7 @@ def main(
     etl_config_filename: str = "digital_data_etl_paul_iusztin.yaml",
     run_export_artifact_to_json: bool = False,
     run_feature_engineering: bool = False,
+    feature_engineering_config_filename: str = "feature_engineering.yaml",
     run_generate_instruct_datasets: bool = False,
     run_generate_preference_datasets: bool = False,
     run_training: bool = False,
@@ -167,7 +173,8 @@ def main(
 
     if run_feature_engineering:
         run_args_fe = {}
-        pipeline_args["config_path"] = root_dir / "configs" / "feature_engineering.yaml"
+        pipeline_args["config_path"] = root_dir / "configs" / feature_engineering_config_filename
+        assert pipeline_args["config_path"].exists(), f"Config file not found: {pipeline_args['config_path']}"
         pipeline_args["run_name"] = f"feature_engineering_run_{dt.now().strftime('%Y_%m_%d_%H_%M_%S')}"
         feature_engineering.with_options(**pipeline_args)(**run_args_fe)
 